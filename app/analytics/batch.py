@@ -0,0 +1,273 @@
+"""Headless peer-relative analysis for many peer groups at once.
+
+Run from the repository root:
+
+    python -m app.analytics.batch groups.json --horizon 1Y --output report.json
+
+``groups.json`` holds either a list of ``{"name", "tickers"}`` objects or
+a mapping of name to tickers (a ``watchlists.json`` file works as is). The
+same request body is accepted by ``POST /api/batch``. Long horizons are
+read at the weekly or monthly resolution the interactive analysis uses.
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from app.analytics.export import _ChunkSink
+from app.analytics.pipeline import (
+    HORIZON_DAYS,
+    best_worst,
+    build_panels,
+    clean_closes,
+    horizon_window,
+    normalize,
+    resolution_for,
+)
+from app.analytics.records import date_strings, nan_to_none
+from app.data.price_cache import price_cache
+from app.metrics import stage
+from app.workers import get_batch_executor
+
+BATCH_MAX_GROUPS = int(os.environ.get("BATCH_MAX_GROUPS", "5000"))
+BATCH_FORMATS = {
+    "json": "application/json",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+
+def parse_groups(spec) -> list[tuple[str, list[str]]]:
+    """Normalize a batch request into ``(name, tickers)`` pairs.
+
+    Accepts ``{"groups": ...}`` or the groups themselves, given as a list of
+    ``{"name", "tickers"}`` objects or a mapping of name to a ticker list or
+    to ``{"tickers": [...]}``. Tickers are upper-cased and de-duplicated.
+    """
+    if isinstance(spec, dict) and "groups" in spec:
+        spec = spec["groups"]
+    if isinstance(spec, dict):
+        items = [
+            (name, value["tickers"] if isinstance(value, dict) else value)
+            for name, value in spec.items()
+        ]
+    elif isinstance(spec, list):
+        items = [
+            (str(group.get("name", n)), group["tickers"])
+            for n, group in enumerate(spec)
+        ]
+    else:
+        raise ValueError("Expected a list or mapping of peer groups.")
+    if not items:
+        raise ValueError("No peer groups given.")
+    if len(items) > BATCH_MAX_GROUPS:
+        raise ValueError(f"At most {BATCH_MAX_GROUPS} peer groups per batch.")
+    groups = []
+    for name, tickers in items:
+        if not isinstance(tickers, list) or not tickers:
+            raise ValueError(f"Peer group {name!r} has no tickers.")
+        cleaned = [str(t).strip().upper() for t in tickers if str(t).strip()]
+        groups.append((str(name), list(dict.fromkeys(cleaned))))
+    return groups
+
+
+def summarize_group(name: str, closes: pd.DataFrame) -> dict:
+    """Normalized series, best/worst and differentials for one peer group.
+
+    ``closes`` holds the group's columns of the shared download; tickers
+    without any price are reported in ``failed`` and left out.
+    """
+    failed = [str(t) for t in closes.columns if closes[t].isna().all()]
+    closes = closes.drop(columns=failed)
+    result = {"name": name, "tickers": [str(t) for t in closes.columns]}
+    result["failed"] = failed
+    try:
+        if closes.columns.empty:
+            raise ValueError("No data returned from provider.")
+        closes = clean_closes(closes)
+    except ValueError as e:
+        return {**result, "error": str(e)}
+    norm = normalize(closes).to_numpy(dtype=float)
+    b_ticker, b_change, w_ticker, w_change = best_worst(closes)
+    panels = build_panels(norm)
+    return {
+        **result,
+        "error": "",
+        "dates": closes.index.values.astype("datetime64[D]"),
+        "norm": norm,
+        "diff": panels["diff"],
+        "current_diff": panels["current_diff"],
+        "best": (b_ticker, b_change),
+        "worst": (w_ticker, w_change),
+    }
+
+
+def run_batch(
+    groups: list[tuple[str, list[str]]],
+    horizon: str = "1Y",
+    end_date: datetime | None = None,
+) -> list[dict]:
+    """Analyze every peer group from one download of the union of tickers.
+
+    The price cache is asked once for the de-duplicated universe, so each
+    ticker is fetched at most once however many groups share it, and long
+    horizons come straight from the store's weekly or monthly aggregates;
+    the groups are then summarized in parallel on the batch pool, apart
+    from the analytics pool interactive sessions use.
+    """
+    if horizon not in HORIZON_DAYS:
+        raise ValueError(f"Unknown horizon: {horizon}")
+    universe = sorted({t for _, tickers in groups for t in tickers})
+    start_date, end_date = horizon_window(horizon, end_date)
+    with stage("download", horizon, len(universe)) as span:
+        closes = price_cache.get_closes(
+            universe, start_date, end_date, resolution_for(horizon)
+        )
+        span["rows"] = len(closes)
+    closes = closes.reindex(columns=universe)
+    with stage("batch_compute", horizon, len(universe)) as span:
+        names = [name for name, _ in groups]
+        frames = [closes[tickers] for _, tickers in groups]
+        results = list(get_batch_executor().map(summarize_group, names, frames))
+        span["rows"] = len(results)
+    return results
+
+
+def batch_json(results: list[dict], include_series: bool = True) -> list[dict]:
+    """JSON-ready summaries, with per-ticker series when ``include_series``."""
+    payload = []
+    for result in results:
+        tickers = result["tickers"]
+        entry = {
+            "name": result["name"],
+            "tickers": tickers,
+            "failed": result["failed"],
+            "error": result["error"],
+        }
+        if not result["error"]:
+            b_ticker, b_change = result["best"]
+            w_ticker, w_change = result["worst"]
+            entry["best"] = {"ticker": b_ticker, "change": b_change}
+            entry["worst"] = {"ticker": w_ticker, "change": w_change}
+            entry["current_diff"] = dict(
+                zip(tickers, nan_to_none(result["current_diff"]))
+            )
+            if include_series:
+                entry["dates"] = date_strings(result["dates"])
+                entry["normalized"] = dict(zip(tickers, nan_to_none(result["norm"].T)))
+                if result["diff"] is not None:
+                    entry["vs_peers"] = dict(
+                        zip(tickers, nan_to_none(result["diff"].T))
+                    )
+        payload.append(entry)
+    return payload
+
+
+def _list_column(values: list[np.ndarray], value_type):
+    import pyarrow as pa
+
+    offsets = np.concatenate([[0], np.cumsum([len(v) for v in values])])
+    flat = np.concatenate(values) if values else np.zeros(0)
+    return pa.ListArray.from_arrays(
+        pa.array(offsets, pa.int32()), pa.array(flat, value_type, from_pandas=True)
+    )
+
+
+def iter_batch_arrow(
+    results: list[dict], include_series: bool = True
+) -> Iterator[bytes]:
+    """Yield an Arrow IPC stream with one record batch per peer group.
+
+    Each row is one ticker of one group: its total change, current
+    differential, best/worst flags and, with ``include_series``, the
+    group's dates with the ticker's normalized and vs-peers series.
+    """
+    import pyarrow as pa
+
+    fields = [
+        ("group", pa.string()),
+        ("ticker", pa.string()),
+        ("change", pa.float64()),
+        ("current_diff", pa.float64()),
+        ("is_best", pa.bool_()),
+        ("is_worst", pa.bool_()),
+    ]
+    if include_series:
+        fields += [
+            ("dates", pa.list_(pa.date32())),
+            ("normalized", pa.list_(pa.float64())),
+            ("vs_peers", pa.list_(pa.float64())),
+        ]
+    schema = pa.schema(fields)
+    sink = _ChunkSink()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        for result in results:
+            if result["error"]:
+                continue
+            tickers = result["tickers"]
+            n = len(tickers)
+            norm, diff = result["norm"], result["diff"]
+            if diff is None:
+                diff = np.full_like(norm, np.nan)
+            columns = [
+                pa.array([result["name"]] * n),
+                pa.array(tickers),
+                pa.array((norm[-1] - 1.0) * 100),
+                pa.array(result["current_diff"] if n > 1 else [np.nan] * n),
+                pa.array([t == result["best"][0] for t in tickers]),
+                pa.array([t == result["worst"][0] for t in tickers]),
+            ]
+            if include_series:
+                columns += [
+                    _list_column([result["dates"]] * n, pa.date32()),
+                    _list_column(list(norm.T), pa.float64()),
+                    _list_column(list(diff.T), pa.float64()),
+                ]
+            writer.write_batch(pa.record_batch(columns, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("groups", help="JSON file of peer groups")
+    parser.add_argument("--horizon", default="1Y", choices=list(HORIZON_DAYS))
+    parser.add_argument("--as-of", help="end date (YYYY-MM-DD), default today")
+    parser.add_argument("--format", default="json", choices=list(BATCH_FORMATS))
+    parser.add_argument(
+        "--summary-only",
+        action="store_true",
+        help="omit the normalized and vs-peers series",
+    )
+    parser.add_argument("--output", help="output file, default stdout")
+    args = parser.parse_args(argv)
+
+    with open(args.groups) as f:
+        groups = parse_groups(json.load(f))
+    end_date = datetime.fromisoformat(args.as_of) if args.as_of else None
+    results = run_batch(groups, args.horizon, end_date)
+    include_series = not args.summary_only
+    if args.format == "arrow":
+        chunks = iter_batch_arrow(results, include_series)
+    else:
+        chunks = [json.dumps(batch_json(results, include_series)).encode()]
+    with open(
+        args.output or sys.stdout.fileno(), "wb", closefd=bool(args.output)
+    ) as out:
+        for chunk in chunks:
+            out.write(chunk)
+    failed = sum(1 for r in results if r["error"])
+    print(
+        f"{len(results) - failed} of {len(results)} peer groups analyzed",
+        file=sys.stderr,
+    )
+    return 0 if failed < len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+import base64
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+CORRELATION_CACHE_ENTRIES = int(os.environ.get("CORRELATION_CACHE_ENTRIES", "32"))
+
+NEGATIVE_RGB = np.array([239, 68, 68], dtype=float)
+NEUTRAL_RGB = np.array([255, 255, 255], dtype=float)
+POSITIVE_RGB = np.array([139, 92, 246], dtype=float)
+
+
+def standardized_returns(close: np.ndarray) -> np.ndarray:
+    """Daily returns scaled to zero mean and unit variance per column, so
+    correlations are plain dot products divided by ``T - 1``."""
+    close = np.asarray(close, dtype=float)
+    returns = close[1:] / close[:-1] - 1.0
+    returns = returns - returns.mean(axis=0)
+    std = returns.std(axis=0, ddof=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(std > 0, returns / std, np.nan)
+
+
+def correlation_matrix(z: np.ndarray) -> np.ndarray:
+    """Full N x N correlation matrix from standardized returns."""
+    corr = z.T @ z / max(len(z) - 1, 1)
+    np.fill_diagonal(corr, 1.0)
+    return np.clip(corr, -1.0, 1.0)
+
+
+def correlation_row(z: np.ndarray, column: int) -> np.ndarray:
+    """Correlation of one column against every column, in O(N·T)."""
+    row = z[:, column] @ z / max(len(z) - 1, 1)
+    row[column] = 1.0
+    return np.clip(row, -1.0, 1.0)
+
+
+def cluster_order(corr: np.ndarray) -> np.ndarray:
+    """Leaf order of an average-linkage clustering on ``1 - corr``.
+
+    Each merge joins the closest pair of clusters and concatenates their
+    leaf lists, so tickers that move together end up adjacent.
+    """
+    n = len(corr)
+    if n <= 2:
+        return np.arange(n)
+    dist = 1.0 - np.where(np.isnan(corr), 0.0, corr)
+    np.fill_diagonal(dist, np.inf)
+    sizes = np.ones(n)
+    leaves: dict[int, list[int]] = {i: [i] for i in range(n)}
+    for _ in range(n - 1):
+        i, j = divmod(int(np.argmin(dist)), n)
+        merged = (sizes[i] * dist[i] + sizes[j] * dist[j]) / (sizes[i] + sizes[j])
+        dist[i, :] = merged
+        dist[:, i] = merged
+        dist[i, i] = np.inf
+        dist[j, :] = np.inf
+        dist[:, j] = np.inf
+        sizes[i] += sizes[j]
+        leaves[i] = leaves[i] + leaves.pop(j)
+    return np.array(next(iter(leaves.values())), dtype=np.int32)
+
+
+class CorrelationCache:
+    """Correlation matrices keyed by ticker set, horizon and date axis.
+
+    A request that differs from a cached entry by a single added or removed
+    ticker over the same dates is answered by computing (or dropping) that
+    one row and column instead of the whole O(N²·T) product.
+    """
+
+    def __init__(self, max_entries: int = CORRELATION_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[list[str], np.ndarray]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.incremental = 0
+        self.misses = 0
+
+    @staticmethod
+    def _axis_key(horizon: str, dates: np.ndarray) -> tuple:
+        return (horizon, str(dates[0]), str(dates[-1]), len(dates))
+
+    def _neighbor(self, axis: tuple, tickers: set[str]):
+        for (entry_axis, entry_set), entry in reversed(self._entries.items()):
+            if entry_axis == axis and len(entry_set ^ tickers) == 1:
+                return entry
+        return None
+
+    def get(
+        self, tickers: list[str], horizon: str, dates: np.ndarray, close: np.ndarray
+    ) -> np.ndarray:
+        """Correlation matrix for ``close`` with columns in ``tickers`` order."""
+        axis = self._axis_key(horizon, dates)
+        key = (axis, frozenset(tickers))
+        with self._lock:
+            cached = self._entries.get(key)
+            neighbor = None if cached else self._neighbor(axis, set(tickers))
+            if cached:
+                self._entries.move_to_end(key)
+        if cached:
+            self.hits += 1
+            return self._reorder(*cached, tickers)
+        if neighbor is not None:
+            self.incremental += 1
+            corr = self._update(*neighbor, tickers, close)
+        else:
+            self.misses += 1
+            corr = correlation_matrix(standardized_returns(close))
+        with self._lock:
+            self._entries[key] = (list(tickers), corr)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return corr
+
+    @staticmethod
+    def _reorder(
+        cached_tickers: list[str], corr: np.ndarray, tickers: list[str]
+    ) -> np.ndarray:
+        if cached_tickers == list(tickers):
+            return corr
+        position = {t: n for n, t in enumerate(cached_tickers)}
+        idx = np.array([position[t] for t in tickers])
+        return corr[np.ix_(idx, idx)]
+
+    def _update(
+        self,
+        cached_tickers: list[str],
+        cached: np.ndarray,
+        tickers: list[str],
+        close: np.ndarray,
+    ) -> np.ndarray:
+        kept = [t for t in tickers if t in set(cached_tickers)]
+        corr = np.empty((len(tickers), len(tickers)))
+        inner = [tickers.index(t) for t in kept]
+        corr[np.ix_(inner, inner)] = self._reorder(cached_tickers, cached, kept)
+        added = [n for n, t in enumerate(tickers) if t not in set(kept)]
+        if added:
+            z = standardized_returns(close)
+            for n in added:
+                row = correlation_row(z, n)
+                corr[n, :] = row
+                corr[:, n] = row
+        return corr
+
+
+correlation_cache = CorrelationCache()
+
+
+def correlation_summary(
+    tickers: list[str], horizon: str, dates: np.ndarray, close: np.ndarray
+) -> dict:
+    """Cached correlation matrix plus its clustered ticker order."""
+    if len(tickers) < 2:
+        return {"matrix": np.ones((len(tickers), len(tickers))), "order": []}
+    corr = correlation_cache.get(tickers, horizon, dates, close)
+    return {"matrix": corr.astype(np.float32), "order": cluster_order(corr)}
+
+
+def _png_chunk(tag: bytes, data: bytes) -> bytes:
+    body = tag + data
+    return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+
+def heatmap_data_uri(corr: np.ndarray) -> str:
+    """Render a correlation matrix as a one-pixel-per-cell PNG data URI.
+
+    Negative correlations shade to red, positive ones to violet. One image
+    stays cheap to ship and draw for hundreds of tickers, where a grid of
+    N² DOM cells would not.
+    """
+    corr = np.nan_to_num(np.asarray(corr, dtype=float))
+    weight = np.abs(corr)[..., None]
+    target = np.where(corr[..., None] >= 0, POSITIVE_RGB, NEGATIVE_RGB)
+    rgb = (NEUTRAL_RGB + (target - NEUTRAL_RGB) * weight).round().astype(np.uint8)
+    height, width = corr.shape
+    raw = b"".join(b"\x00" + row.tobytes() for row in rgb)
+    png = (
+        b"\x89PNG\r\n\x1a\n"
+        + _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + _png_chunk(b"IDAT", zlib.compress(raw))
+        + _png_chunk(b"IEND", b"")
+    )
+    return "data:image/png;base64," + base64.b64encode(png).decode()
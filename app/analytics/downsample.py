@@ -0,0 +1,70 @@
+import numpy as np
+
+DEFAULT_POINT_BUDGET = 800
+MIN_POINT_BUDGET = 100
+MAX_POINT_BUDGET = 4000
+
+
+def point_budget_for_width(width: int) -> int:
+    """Roughly one point per horizontal pixel, clamped to sane bounds."""
+    return max(MIN_POINT_BUDGET, min(MAX_POINT_BUDGET, int(width)))
+
+
+def minmax_bucket_indices(values: np.ndarray, n_buckets: int) -> np.ndarray:
+    """Row indices of the min and max of every column inside each bucket.
+
+    ``values`` is a T x K matrix. Rows are split into ``n_buckets`` equal
+    runs and, for each column, the position of its minimum and maximum in
+    every run is kept, so peaks and troughs survive downsampling. Returns a
+    (K, 2 * n_buckets) integer array.
+    """
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        values = values[:, None]
+    t, k = values.shape
+    n_buckets = max(1, min(n_buckets, t))
+    length = -(-t // n_buckets)
+    n_buckets = -(-t // length)
+    padded = np.full((n_buckets * length, k), np.nan)
+    padded[:t] = values
+    blocks = padded.reshape(n_buckets, length, k)
+    filled_hi = np.where(np.isnan(blocks), -np.inf, blocks)
+    filled_lo = np.where(np.isnan(blocks), np.inf, blocks)
+    offsets = np.arange(n_buckets)[:, None] * length
+    hi = filled_hi.argmax(axis=1) + offsets
+    lo = filled_lo.argmin(axis=1) + offsets
+    return np.minimum(np.concatenate([lo, hi], axis=0).T, t - 1)
+
+
+def shared_indices(values: np.ndarray, budget: int) -> np.ndarray:
+    """Sorted row indices that keep every column's extremes within budget.
+
+    All columns share one x axis, so the per-column picks are merged. The
+    first and last rows are always kept.
+    """
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        values = values[:, None]
+    t, k = values.shape
+    if t <= budget:
+        return np.arange(t)
+    n_buckets = max(1, budget // (2 * max(k, 1)))
+    picks = minmax_bucket_indices(values, n_buckets).ravel()
+    return np.unique(np.concatenate([picks, [0, t - 1]]))
+
+
+def grouped_indices(
+    values: np.ndarray, group_size: int, budget: int
+) -> list[np.ndarray]:
+    """Per-group shared indices for consecutive column groups, computed in
+    one vectorized pass over the whole matrix."""
+    values = np.asarray(values, dtype=float)
+    t, k = values.shape
+    n_groups = k // group_size
+    if t <= budget:
+        return [np.arange(t)] * n_groups
+    n_buckets = max(1, budget // (2 * group_size))
+    picks = minmax_bucket_indices(values, n_buckets)
+    picks = picks.reshape(n_groups, -1)
+    ends = np.array([0, t - 1])
+    return [np.unique(np.concatenate([row, ends])) for row in picks]
@@ -0,0 +1,152 @@
+import io
+import os
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from app.analytics.relative_strength import leave_one_out_mean
+
+EXPORT_CHUNK_ROWS = int(os.environ.get("EXPORT_CHUNK_ROWS", "2048"))
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+
+class ExportColumns:
+    """Names of the exported daily series and their values a block of rows
+    at a time.
+
+    Closes come first, then the optional normalized and stock-minus-peer
+    columns, each in ticker order. The derived columns are computed per
+    block at daily resolution, since a long-horizon analysis only holds them
+    for its weekly or monthly rows, so no full-length matrix is built.
+    """
+
+    def __init__(self, analysis: dict, normalized: bool = False, diff: bool = False):
+        tickers = analysis["tickers"]
+        self.close = analysis["daily_close"]
+        self.anchor = self.close[0]
+        self.normalized = normalized
+        self.diff = diff and len(tickers) > 1
+        self.names = list(tickers)
+        if self.normalized:
+            self.names += [f"{t} Normalized" for t in tickers]
+        if self.diff:
+            self.names += [f"{t} vs Peers" for t in tickers]
+
+    def block(self, rows: slice) -> np.ndarray:
+        """Every exported column for ``rows``, as a rows x columns matrix."""
+        close = self.close[rows]
+        if not (self.normalized or self.diff):
+            return close
+        norm = close / self.anchor
+        parts = [close]
+        if self.normalized:
+            parts.append(norm)
+        if self.diff:
+            parts.append(norm - leave_one_out_mean(norm))
+        return np.hstack(parts)
+
+
+def _chunks(n_rows: int, chunk_rows: int) -> Iterator[slice]:
+    for lo in range(0, n_rows, chunk_rows):
+        yield slice(lo, min(lo + chunk_rows, n_rows))
+
+
+def iter_csv(
+    analysis: dict,
+    columns: ExportColumns,
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+) -> Iterator[bytes]:
+    """Yield a Date-first CSV a block of rows at a time."""
+    header = pd.DataFrame(columns=["Date", *columns.names])
+    yield header.to_csv(index=False).encode()
+    dates = analysis["daily_dates"]
+    for rows in _chunks(len(dates), chunk_rows):
+        block = pd.DataFrame(
+            columns.block(rows), index=np.datetime_as_string(dates[rows])
+        )
+        yield block.to_csv(header=False).encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands back whatever was written since last drain."""
+
+    def __init__(self):
+        self._parts: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def _record_batches(analysis: dict, columns: ExportColumns, chunk_rows: int):
+    import pyarrow as pa
+
+    schema = pa.schema(
+        [("Date", pa.date32()), *((name, pa.float64()) for name in columns.names)]
+    )
+    dates = analysis["daily_dates"]
+    batches = (
+        pa.record_batch(
+            [pa.array(dates[rows]), *(pa.array(v) for v in columns.block(rows).T)],
+            schema=schema,
+        )
+        for rows in _chunks(len(dates), chunk_rows)
+    )
+    return schema, batches
+
+
+def iter_parquet(
+    analysis: dict,
+    columns: ExportColumns,
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+) -> Iterator[bytes]:
+    """Yield a Parquet file one row group at a time."""
+    import pyarrow.parquet as pq
+
+    schema, batches = _record_batches(analysis, columns, chunk_rows)
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+            yield sink.drain()
+    yield sink.drain()
+
+
+def iter_arrow(
+    analysis: dict,
+    columns: ExportColumns,
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+) -> Iterator[bytes]:
+    """Yield an Arrow IPC stream one record batch at a time."""
+    import pyarrow as pa
+
+    schema, batches = _record_batches(analysis, columns, chunk_rows)
+    sink = _ChunkSink()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+            yield sink.drain()
+    yield sink.drain()
+
+
+EXPORT_WRITERS = {"csv": iter_csv, "parquet": iter_parquet, "arrow": iter_arrow}
@@ -0,0 +1,210 @@
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from app.analytics.records import PANEL_KEYS, quantize, table_sort_orders
+from app.analytics.relative_strength import gradient_offsets, leave_one_out_mean
+from app.data.price_store import period_of
+
+LIVE_PUSH_INTERVAL = float(os.environ.get("LIVE_PUSH_SECONDS", "1"))
+LIVE_FIELDS = (
+    "current_diff",
+    "gradient_offset",
+    "best_ticker",
+    "best_change",
+    "worst_ticker",
+    "worst_change",
+)
+
+
+class LiveBook:
+    """Intraday copy of an analysis whose last bar follows live quotes.
+
+    Construction copies the arrays once; the last row stays the analysis'
+    last bar until a quote from a later trading day rolls it forward,
+    appending a bar when that day starts a new period. Otherwise a quote
+    only overwrites its ticker's last close and normalized value, and
+    ``refresh`` rebuilds the last row's leave-one-out peer averages,
+    differentials, gradient offsets and best/worst from a single row sum. Earlier rows are never read again,
+    so every update is O(N) whatever the length of the history.
+    """
+
+    def __init__(self, analysis: dict):
+        self.base = analysis
+        self.tickers = analysis["tickers"]
+        self.columns = {ticker: n for n, ticker in enumerate(self.tickers)}
+        self.resolution = analysis["resolution"]
+        self.shared = analysis["daily_close"] is analysis["close"]
+        self.dates = analysis["dates"].copy()
+        self.close = analysis["close"].copy()
+        self.norm = analysis["norm"].copy()
+        self.diff = None if analysis["diff"] is None else analysis["diff"].copy()
+        self.daily_dates = self.dates if self.shared else analysis["daily_dates"].copy()
+        self.daily_close = self.close if self.shared else analysis["daily_close"].copy()
+        self.anchor = self.close[0].copy()
+        self.appended = False
+        self.day = self.dates[-1]
+        self._rebase()
+
+    def _roll(self, day: np.datetime64) -> None:
+        """Make the last row ``day``'s bar: relabel it if it is in the same
+        period, otherwise append a copy of it. O(T·N), once a day."""
+        if day > self.day:
+            last, new = (int(d.astype(np.int64)) for d in (self.dates[-1], day))
+            if period_of(last, self.resolution) == period_of(new, self.resolution):
+                self.dates[-1] = day
+            else:
+                self.appended = True
+                self.dates = np.append(self.dates, day)
+                self.close = np.vstack([self.close, self.close[-1:]])
+                self.norm = np.vstack([self.norm, self.norm[-1:]])
+                if self.diff is not None:
+                    self.diff = np.vstack([self.diff, self.diff[-1:]])
+            if self.shared:
+                self.daily_dates, self.daily_close = self.dates, self.close
+            elif self.daily_dates[-1] < day:
+                self.daily_dates = np.append(self.daily_dates, day)
+                self.daily_close = np.vstack([self.daily_close, self.daily_close[-1:]])
+            self.day = day
+        self._rebase()
+
+    def _rebase(self) -> None:
+        """Recompute the differential extrema of every row before the last,
+        then refresh the last row."""
+        if self.diff is not None:
+            history = self.diff[:-1]
+            self.diff_max = np.nanmax(history, axis=0, initial=-np.inf)
+            self.diff_min = np.nanmin(history, axis=0, initial=np.inf)
+        self.refresh()
+
+    def apply(self, quotes: dict[str, tuple[float, float]]) -> None:
+        """Set the last close of every quoted ticker from ``(price, unix
+        time)``, starting a new bar if the quotes are from a later trading
+        day. Weekend timestamps update the last bar instead."""
+        if not quotes:
+            return
+        latest = max(at for _, at in quotes.values())
+        day = np.datetime64(datetime.fromtimestamp(latest).date(), "D")
+        if day > self.day and np.is_busday(day):
+            self._roll(day)
+        for ticker, (price, _) in quotes.items():
+            n = self.columns.get(ticker)
+            if n is None or not price > 0:
+                continue
+            self.close[-1, n] = price
+            if not self.shared:
+                self.daily_close[-1, n] = price
+            self.norm[-1, n] = price / self.anchor[n]
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Recompute the last row's derived values in O(N)."""
+        last = self.norm[-1]
+        changes = (last - 1.0) * 100
+        best, worst = int(np.argmax(changes)), int(np.argmin(changes))
+        self.best = (self.tickers[best], float(changes[best]))
+        self.worst = (self.tickers[worst], float(changes[worst]))
+        if self.diff is None:
+            self.current_diff = np.zeros(0)
+            self.gradient_offset = np.zeros(0)
+            return
+        self.diff[-1] = last - leave_one_out_mean(last[None, :])[0]
+        self.current_diff = self.diff[-1].copy()
+        self.gradient_offset = gradient_offsets(
+            np.vstack(
+                [
+                    np.fmax(self.diff_max, self.current_diff),
+                    np.fmin(self.diff_min, self.current_diff),
+                ]
+            )
+        )
+
+    def bar(self) -> dict:
+        """The small per-update payload: today's row and its headline fields."""
+        return {
+            "tickers": self.tickers,
+            "day": int(self.day.astype(np.int64)),
+            "appended": self.appended,
+            "norm": self.norm[-1].copy(),
+            "current_diff": self.current_diff,
+            "gradient_offset": self.gradient_offset,
+            "best_ticker": self.best[0],
+            "best_change": self.best[1],
+            "worst_ticker": self.worst[0],
+            "worst_change": self.worst[1],
+        }
+
+    def analysis(self) -> dict:
+        """A full analysis including the live bar, to keep when live mode
+        stops. Risk and correlation stay as of the last full analysis."""
+        chart_rows = self.base["chart_rows"]
+        if self.appended:
+            chart_rows = np.append(chart_rows, np.int32(len(self.dates) - 1))
+        closes = self.base["closes"].copy()
+        closes.loc[pd.Timestamp(self.day), self.tickers] = self.daily_close[-1]
+        return {
+            **self.base,
+            "dates": self.dates,
+            "close": self.close,
+            "norm": self.norm,
+            "diff": self.diff,
+            "daily_dates": self.daily_dates,
+            "daily_close": self.daily_close,
+            "chart_rows": chart_rows.astype(np.int32),
+            "table_sort_orders": table_sort_orders(
+                self.daily_close, self.tickers if self.resolution == "D" else []
+            ),
+            "current_diff": self.current_diff,
+            "gradient_offset": self.gradient_offset,
+            "best_ticker": self.best[0],
+            "best_change": self.best[1],
+            "worst_ticker": self.worst[0],
+            "worst_change": self.worst[1],
+            "closes": closes.sort_index(),
+        }
+
+
+def overlay(analysis: dict, bar: dict | None, generation: int) -> dict:
+    """The analysis with the live bar's headline fields, while the bar still
+    belongs to the analysis being shown."""
+    if bar is None or bar["generation"] != generation:
+        return analysis
+    return {**analysis, **{field: bar[field] for field in LIVE_FIELDS}}
+
+
+def chart_bar(bar: dict | None, generation: int) -> dict:
+    """Today's normalized values for the client to merge into the chart."""
+    if bar is None or bar["generation"] != generation:
+        return {}
+    return {
+        "t": bar["day"],
+        "a": bar["appended"],
+        "s": dict(zip(bar["tickers"], quantize(bar["norm"]))),
+    }
+
+
+def panel_bars(
+    bar: dict | None, generation: int, tickers: list[str], start: int, count: int
+) -> dict:
+    """Today's Stock/Peer/Diff point and headline for ``count`` panels from
+    ``start``, in the panel order of ``tickers``; hidden panels get nothing."""
+    if bar is None or bar["generation"] != generation or not len(bar["current_diff"]):
+        return {}
+    columns = {ticker: n for n, ticker in enumerate(bar["tickers"])}
+    shown = [ticker for ticker in tickers if ticker in columns][start : start + count]
+    bars = {}
+    for ticker in shown:
+        n = columns[ticker]
+        stock, diff = bar["norm"][n], bar["current_diff"][n]
+        values = quantize(np.array([stock, stock - diff, diff]))
+        bars[ticker] = {
+            "t": bar["day"],
+            "a": bar["appended"],
+            "s": dict(zip(PANEL_KEYS, values)),
+            "current_diff": float(diff),
+            "current_diff_fmt": f"{diff:+.2%}",
+            "gradient_offset": float(bar["gradient_offset"][n]),
+        }
+    return bars
@@ -0,0 +1,250 @@
+import hashlib
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from app.analytics.correlation import correlation_summary
+from app.analytics.downsample import shared_indices
+from app.analytics.records import table_sort_orders
+from app.analytics.relative_strength import relative_strength
+from app.analytics.risk import PERIODS_PER_YEAR, RISK_WINDOW, TRADING_DAYS, risk_summary
+from app.data.price_cache import price_cache
+from app.data.price_store import period_rows
+from app.data.result_store import content_key
+from app.metrics import stage
+
+HORIZON_DAYS = {
+    "1M": 30,
+    "3M": 90,
+    "6M": 180,
+    "1Y": 365,
+    "5Y": 365 * 5,
+    "10Y": 365 * 10,
+    "20Y": 365 * 20,
+}
+PREFETCH_HORIZON = os.environ.get("PREFETCH_HORIZON", "")
+HORIZON_RESOLUTION = {"5Y": "W", "10Y": "W", "20Y": "M"}
+AUTO_RESOLUTION = os.environ.get("AUTO_RESOLUTION", "1") == "1"
+
+
+def horizon_window(
+    horizon: str, end_date: datetime | None = None
+) -> tuple[datetime, datetime]:
+    """Return the (start, end) download window for a horizon label."""
+    end_date = end_date or datetime.now()
+    return end_date - timedelta(days=HORIZON_DAYS.get(horizon, 365)), end_date
+
+
+def widest_horizon(*horizons: str) -> str:
+    """Return the longest of the given horizon labels, ignoring blanks."""
+    known = [h for h in horizons if h in HORIZON_DAYS]
+    return max(known, key=HORIZON_DAYS.__getitem__) if known else "1Y"
+
+
+def covers_horizon(wide: str, horizon: str) -> bool:
+    """Whether data fetched for ``wide`` contains the whole ``horizon``."""
+    return HORIZON_DAYS.get(horizon, 365) <= HORIZON_DAYS.get(wide, 365)
+
+
+def resolution_for(horizon: str) -> str:
+    """Bar size the horizon is analyzed at: weekly or monthly for the long
+    ones, whose charts cannot show daily detail anyway, else daily."""
+    if not AUTO_RESOLUTION:
+        return "D"
+    return HORIZON_RESOLUTION.get(horizon, "D")
+
+
+def slice_horizon(
+    closes: pd.DataFrame, horizon: str, end_date: datetime | None = None
+) -> pd.DataFrame:
+    """Return the suffix of a wider close matrix that falls in the horizon."""
+    start_date, _ = horizon_window(horizon, end_date)
+    return closes[closes.index >= pd.Timestamp(start_date.date())]
+
+
+def clean_closes(close_data: pd.DataFrame) -> pd.DataFrame:
+    """Forward-fill gaps and drop rows where any ticker has no price yet."""
+    close_data = close_data.ffill().dropna()
+    if close_data.empty:
+        raise ValueError("No valid price data found after processing.")
+    return close_data
+
+
+def normalize(close_data: pd.DataFrame) -> pd.DataFrame:
+    """Rebase every series to 1.0 on the first row."""
+    return close_data / close_data.iloc[0]
+
+
+def best_worst(close_data: pd.DataFrame) -> tuple[str, float, str, float]:
+    """Return the best and worst total % change over the window."""
+    if close_data.empty:
+        return "", 0.0, "", 0.0
+    pct_changes = (close_data.iloc[-1] / close_data.iloc[0] - 1.0) * 100
+    return (
+        str(pct_changes.idxmax()),
+        float(pct_changes.max()),
+        str(pct_changes.idxmin()),
+        float(pct_changes.min()),
+    )
+
+
+def build_panels(norm: np.ndarray) -> dict:
+    """Differentials and gradient offsets for every ticker.
+
+    Peer averages are not stored; they are ``norm - diff``. Per-panel
+    downsampling and records are left to ``views.panel_views`` so they are
+    only built for panels that are actually shown.
+    """
+    if norm.shape[1] < 2:
+        return {
+            "diff": None,
+            "current_diff": np.zeros(0),
+            "gradient_offset": np.zeros(0),
+        }
+    strength = relative_strength(norm)
+    return {
+        "diff": strength["diff"],
+        "current_diff": strength["current_diff"],
+        "gradient_offset": strength["offsets"],
+    }
+
+
+def analyze_closes(
+    close_data: pd.DataFrame,
+    point_budget: int,
+    horizon: str = "",
+    resolution: str = "D",
+) -> dict:
+    """Turn a raw close matrix into the compact arrays the UI is built from.
+
+    Every matrix is a plain T x N float array aligned with ``dates`` and
+    ``tickers``; frontend records are derived from them on demand. At a
+    weekly or monthly ``resolution`` the chart, panels, risk and
+    correlation work on the ``period_rows`` of the cleaned matrix, while
+    the table and export keep ``daily_dates`` and ``daily_close`` and
+    ticker sort orders are left to ``views.table_page``. Each stage is
+    timed under ``horizon`` for the metrics endpoint.
+    """
+    n = len(close_data.columns)
+    with stage("cleaning", horizon, n) as span:
+        close_data = clean_closes(close_data)
+        span["rows"] = len(close_data)
+    tickers = [str(c) for c in close_data.columns]
+    daily_dates = close_data.index.values.astype("datetime64[D]")
+    daily_close = close_data.to_numpy(dtype=float)
+    dates, close = daily_dates, daily_close
+    if resolution != "D":
+        with stage("resample", horizon, n) as span:
+            rows = period_rows(daily_dates, resolution)
+            dates, close = daily_dates[rows], daily_close[rows]
+            span["rows"] = len(rows)
+    with stage("normalization", horizon, n):
+        norm = close / close[0]
+    with stage("best_worst", horizon, n):
+        b_ticker, b_change, w_ticker, w_change = best_worst(close_data)
+    with stage("sort_index", horizon, n):
+        chart_rows = shared_indices(norm, point_budget).astype(np.int32)
+        sort_orders = table_sort_orders(
+            daily_close, tickers if resolution == "D" else []
+        )
+    with stage("panel_build", horizon, n):
+        panels = build_panels(norm)
+    periods_per_year = PERIODS_PER_YEAR[resolution]
+    with stage("risk", horizon, n):
+        # The daily window's span of time, but at least 12 rows: at monthly
+        # resolution it would otherwise be three returns.
+        window = max(12, round(RISK_WINDOW * periods_per_year / TRADING_DAYS))
+        risk = risk_summary(close, dates, window, periods_per_year)
+    with stage("correlation", horizon, n):
+        correlation = correlation_summary(tickers, horizon, dates, close)
+    return {
+        "tickers": tickers,
+        "resolution": resolution,
+        "dates": dates,
+        "close": close,
+        "norm": norm,
+        "daily_dates": daily_dates,
+        "daily_close": daily_close,
+        "chart_rows": chart_rows,
+        "table_sort_orders": sort_orders,
+        "best_ticker": b_ticker,
+        "best_change": b_change,
+        "worst_ticker": w_ticker,
+        "worst_change": w_change,
+        "point_budget": point_budget,
+        "risk": risk,
+        "correlation": correlation,
+        **panels,
+    }
+
+
+def analyze_window(
+    closes: pd.DataFrame,
+    closes_horizon: str,
+    horizon: str,
+    point_budget: int,
+    end_date: datetime | None = None,
+) -> dict:
+    """Analyze the ``horizon`` suffix of a possibly wider close matrix.
+
+    The uncleaned daily matrix is kept as ``closes`` (spanning
+    ``closes_horizon``) so a session can switch to any shorter horizon, or
+    add and drop a ticker, without downloading the others again. The
+    analysis runs at ``resolution_for(horizon)``.
+    """
+    result = analyze_closes(
+        slice_horizon(closes, horizon, end_date),
+        point_budget,
+        horizon,
+        resolution_for(horizon),
+    )
+    result["closes"] = closes
+    result["closes_horizon"] = closes_horizon
+    return result
+
+
+def analysis_key(
+    tickers: list[str], horizon: str, as_of: str, point_budget: int
+) -> tuple:
+    """Result cache key shared by sessions and the pre-warming scheduler."""
+    return (tuple(sorted(tickers)), horizon, as_of, point_budget)
+
+
+def result_key(analysis: dict, horizon: str) -> str:
+    """Address of an analysis in the shared result store: its tickers,
+    horizon and view parameters plus a digest of the close matrix it was
+    computed from, which changes whenever the data does."""
+    closes = analysis["closes"]
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update("\0".join(map(str, closes.columns)).encode())
+    digest.update(closes.index.values.astype("datetime64[D]").tobytes())
+    digest.update(np.ascontiguousarray(closes.to_numpy(dtype=float)).tobytes())
+    return content_key(
+        analysis["tickers"],
+        horizon,
+        analysis["closes_horizon"],
+        analysis["resolution"],
+        analysis["point_budget"],
+        str(analysis["daily_dates"][0]),
+        digest.hexdigest(),
+    )
+
+
+def run_analysis(
+    tickers: list[str],
+    horizon: str,
+    point_budget: int,
+    end_date: datetime | None = None,
+    fetch_horizon: str = "",
+) -> dict:
+    """Load closes for the wider of the two horizons and analyze ``horizon``."""
+    fetch_horizon = widest_horizon(horizon, fetch_horizon)
+    start_date, end_date = horizon_window(fetch_horizon, end_date)
+    with stage("download", horizon, len(tickers)) as span:
+        close_data = price_cache.get_closes(tickers, start_date, end_date)
+        span["rows"] = len(close_data)
+    if close_data.empty:
+        raise ValueError("No data returned from provider.")
+    return analyze_window(close_data, fetch_horizon, horizon, point_budget, end_date)
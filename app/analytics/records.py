@@ -0,0 +1,82 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+PANEL_KEYS = ("Stock", "Peer", "Diff")
+WIRE_DECIMALS = int(os.environ.get("WIRE_DECIMALS", "4"))
+
+
+def nan_to_none(values: np.ndarray) -> list:
+    """Convert a float array to nested Python lists with NaN as None."""
+    values = np.asarray(values, dtype=float)
+    obj = values.astype(object)
+    obj[np.isnan(values)] = None
+    return obj.tolist()
+
+
+def date_strings(dates: np.ndarray | pd.Index) -> list[str]:
+    """Format a date axis once so every payload can share it."""
+    if isinstance(dates, pd.Index):
+        return pd.DatetimeIndex(dates).strftime("%Y-%m-%d").tolist()
+    return np.datetime_as_string(np.asarray(dates, dtype="datetime64[D]")).tolist()
+
+
+def epoch_days(dates: np.ndarray) -> list[int]:
+    """Days since 1970-01-01 for a date axis; the client formats them."""
+    return np.asarray(dates, dtype="datetime64[D]").astype(np.int64).tolist()
+
+
+def quantize(values: np.ndarray, decimals: int = WIRE_DECIMALS) -> list:
+    """Round a float array to ``decimals`` places for the wire, NaN as None."""
+    return nan_to_none(np.round(np.asarray(values, dtype=float), decimals))
+
+
+def matrix_columns(
+    dates: np.ndarray, keys: list[str], values: np.ndarray
+) -> dict[str, list | dict[str, list]]:
+    """Columnar payload for a T x N matrix.
+
+    ``t`` is the date axis as epoch days and ``s`` holds one quantized
+    array per key, so neither key names nor date strings repeat per row.
+    """
+    return {
+        "t": epoch_days(dates),
+        "s": {key: quantize(values[:, n]) for n, key in enumerate(keys)},
+    }
+
+
+def panel_columns(
+    rows: np.ndarray, stock: np.ndarray, peer_avg: np.ndarray, diff: np.ndarray
+) -> dict[str, list | dict[str, list]]:
+    """One ticker's Stock/Peer/Diff arrays at the given rows.
+
+    ``i`` holds each point's position in the shared date axis, which is
+    shipped once instead of being repeated inside every panel.
+    """
+    rows = np.asarray(rows)
+    series = (stock, peer_avg, diff)
+    return {
+        "i": rows.tolist(),
+        "s": {key: quantize(values[rows]) for key, values in zip(PANEL_KEYS, series)},
+    }
+
+
+def table_sort_orders(
+    values: np.ndarray, keys: list[str]
+) -> dict[str, dict[str, np.ndarray]]:
+    """Precompute ascending and descending row orders for every table column.
+
+    Missing values sort lowest, and ties keep their original row order in
+    both directions, matching a stable Python sort.
+    """
+    values = np.asarray(values, dtype=float)
+    positions = np.arange(len(values), dtype=np.int32)
+    orders = {"Date": {"asc": positions, "desc": positions[::-1].copy()}}
+    filled = np.where(np.isnan(values), -np.inf, values)
+    for n, key in enumerate(keys):
+        orders[key] = {
+            "asc": np.argsort(filled[:, n], kind="stable").astype(np.int32),
+            "desc": np.argsort(-filled[:, n], kind="stable").astype(np.int32),
+        }
+    return orders
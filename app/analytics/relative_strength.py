@@ -0,0 +1,44 @@
+import numpy as np
+
+
+def leave_one_out_mean(normalized: np.ndarray) -> np.ndarray:
+    """Average of every other column for each column, in O(N·T).
+
+    The peer average of a ticker is the row sum minus its own value divided
+    by the number of remaining peers, so all averages come from one sum.
+    """
+    values = np.asarray(normalized, dtype=float)
+    n = values.shape[1]
+    if n < 2:
+        return np.full_like(values, np.nan)
+    row_sum = values.sum(axis=1, keepdims=True)
+    return (row_sum - values) / (n - 1)
+
+
+def gradient_offsets(diff: np.ndarray) -> np.ndarray:
+    """Vertical split point of the green/red gradient for each differential."""
+    diff = np.asarray(diff, dtype=float)
+    valid = ~np.isnan(diff)
+    mx = np.where(valid, diff, -np.inf).max(axis=0, initial=-np.inf)
+    mn = np.where(valid, diff, np.inf).min(axis=0, initial=np.inf)
+    empty = ~valid.any(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(
+            empty | (mx == mn),
+            0.5,
+            np.where(mx <= 0, 0.0, np.where(mn >= 0, 1.0, mx / (mx - mn))),
+        )
+
+
+def relative_strength(normalized: np.ndarray) -> dict[str, np.ndarray]:
+    """Compute peer averages, stock-minus-peer differentials and gradient
+    offsets for every ticker as whole-matrix operations."""
+    normalized = np.asarray(normalized, dtype=float)
+    peer_avg = leave_one_out_mean(normalized)
+    diff = normalized - peer_avg
+    return {
+        "peer_avg": peer_avg,
+        "diff": diff,
+        "offsets": gradient_offsets(diff),
+        "current_diff": diff[-1] if len(diff) else np.full(diff.shape[1], np.nan),
+    }
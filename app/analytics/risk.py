@@ -0,0 +1,100 @@
+import os
+
+import numpy as np
+
+from app.analytics.relative_strength import leave_one_out_mean
+
+RISK_WINDOW = int(os.environ.get("RISK_WINDOW", "63"))
+RISK_FREE_RATE = float(os.environ.get("RISK_FREE_RATE", "0.0"))
+TRADING_DAYS = 252
+PERIODS_PER_YEAR = {"D": TRADING_DAYS, "W": 52, "M": 12}
+
+RISK_METRICS = ("cagr", "volatility", "sharpe", "max_drawdown", "beta", "correlation")
+
+
+def daily_returns(close: np.ndarray) -> np.ndarray:
+    """Simple returns between consecutive rows of a T x N close matrix."""
+    close = np.asarray(close, dtype=float)
+    return close[1:] / close[:-1] - 1.0
+
+
+def _window_sums(values: np.ndarray, window: int) -> np.ndarray:
+    """Sum of each trailing ``window`` of rows, for every full window."""
+    csum = np.cumsum(values, axis=0)
+    csum = np.concatenate([np.zeros((1, *values.shape[1:])), csum])
+    return csum[window:] - csum[:-window]
+
+
+def rolling_risk(
+    returns: np.ndarray,
+    peer_returns: np.ndarray,
+    window: int,
+    periods_per_year: int = TRADING_DAYS,
+) -> dict[str, np.ndarray]:
+    """Rolling annualized volatility, beta and correlation to the peers.
+
+    Every statistic comes from windowed sums of r, p, r², p² and r·p, so
+    the whole (T - window + 1) x N result costs a handful of cumulative
+    sums instead of a Python loop over tickers or windows.
+    """
+    r, p = returns, peer_returns
+    sr, sp = _window_sums(r, window), _window_sums(p, window)
+    srr, spp = _window_sums(r * r, window), _window_sums(p * p, window)
+    srp = _window_sums(r * p, window)
+    var_r = np.maximum(srr - sr * sr / window, 0.0) / (window - 1)
+    var_p = np.maximum(spp - sp * sp / window, 0.0) / (window - 1)
+    cov = (srp - sr * sp / window) / (window - 1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        beta = np.where(var_p > 0, cov / var_p, np.nan)
+        correlation = np.where(
+            (var_r > 0) & (var_p > 0), cov / np.sqrt(var_r * var_p), np.nan
+        )
+    return {
+        "volatility": np.sqrt(var_r * periods_per_year),
+        "beta": beta,
+        "correlation": np.clip(correlation, -1.0, 1.0),
+    }
+
+
+def max_drawdown(close: np.ndarray) -> np.ndarray:
+    """Deepest peak-to-trough fall of every column, as a negative fraction."""
+    close = np.asarray(close, dtype=float)
+    return (close / np.maximum.accumulate(close, axis=0) - 1.0).min(axis=0)
+
+
+def risk_summary(
+    close: np.ndarray,
+    dates: np.ndarray,
+    window: int = RISK_WINDOW,
+    periods_per_year: int = TRADING_DAYS,
+) -> dict[str, np.ndarray]:
+    """Per-ticker risk and return metrics for a cleaned close matrix.
+
+    Volatility, beta and correlation are the latest values of their
+    ``window``-row rolling series (the whole period when it is shorter);
+    CAGR, Sharpe and max drawdown cover the whole period. Beta and
+    correlation are measured against the leave-one-out peer average.
+    Rows are annualized at ``periods_per_year``, so weekly or monthly
+    closes work as well as daily ones.
+    """
+    close = np.asarray(close, dtype=float)
+    t, n = close.shape
+    if t < 3:
+        return {metric: np.full(n, np.nan) for metric in RISK_METRICS}
+    returns = daily_returns(close)
+    window = max(2, min(window, len(returns)))
+    tail = returns[-window:]
+    latest = rolling_risk(tail, leave_one_out_mean(tail), window, periods_per_year)
+    years = (dates[-1] - dates[0]).astype(int) / 365.25
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cagr = (close[-1] / close[0]) ** (1.0 / years) - 1.0
+        excess = returns.mean(axis=0) - RISK_FREE_RATE / periods_per_year
+        sharpe = excess / returns.std(axis=0, ddof=1) * np.sqrt(periods_per_year)
+    return {
+        "cagr": np.where(np.isfinite(cagr), cagr, np.nan),
+        "volatility": latest["volatility"][-1],
+        "sharpe": np.where(np.isfinite(sharpe), sharpe, np.nan),
+        "max_drawdown": max_drawdown(close),
+        "beta": latest["beta"][-1],
+        "correlation": latest["correlation"][-1],
+    }
@@ -0,0 +1,176 @@
+import numpy as np
+
+from app.analytics.correlation import heatmap_data_uri
+from app.analytics.downsample import grouped_indices
+from app.analytics.records import matrix_columns, panel_columns, table_sort_orders
+from app.analytics.risk import RISK_METRICS
+
+RESOLUTION_LABELS = {"D": "Daily", "W": "Weekly", "M": "Monthly"}
+
+
+def table_orders(analysis: dict, column: str) -> dict | None:
+    """Ascending and descending row orders for one table column.
+
+    Uses the precomputed orders when the analysis has them, otherwise sorts
+    just that column; callers memoize the result per analysis.
+    """
+    orders = analysis["table_sort_orders"].get(column)
+    if orders is None and column in analysis["tickers"]:
+        n = analysis["tickers"].index(column)
+        orders = table_sort_orders(analysis["daily_close"][:, [n]], [column])[column]
+    return orders
+
+
+def table_page(
+    analysis: dict, orders: dict | None, ascending: bool, page: int, per_page: int
+) -> dict:
+    """Daily columns for one table page in the given sort ``orders``."""
+    if orders is None:
+        return {"t": [], "s": {}}
+    order = orders["asc" if ascending else "desc"]
+    start = (page - 1) * per_page
+    rows = order[start : start + per_page]
+    return matrix_columns(
+        analysis["daily_dates"][rows],
+        analysis["tickers"],
+        analysis["daily_close"][rows],
+    )
+
+
+def chart_series(analysis: dict) -> dict:
+    """Downsampled normalized series for the performance chart."""
+    rows = analysis["chart_rows"]
+    return matrix_columns(
+        analysis["dates"][rows], analysis["tickers"], analysis["norm"][rows]
+    )
+
+
+def panel_summaries(
+    analysis: dict, tickers: list[str], palette: list[str]
+) -> list[dict]:
+    """Headline numbers for every ticker's panel, in the given order."""
+    if analysis["diff"] is None:
+        return []
+    columns = {ticker: n for n, ticker in enumerate(analysis["tickers"])}
+    summaries = []
+    for i, ticker in enumerate(tickers):
+        n = columns.get(ticker)
+        if n is None:
+            continue
+        current_diff = float(analysis["current_diff"][n])
+        summaries.append(
+            {
+                "ticker": ticker,
+                "color": palette[i % len(palette)],
+                "current_diff": current_diff,
+                "current_diff_fmt": f"{current_diff:+.2%}",
+                "gradient_offset": float(analysis["gradient_offset"][n]),
+            }
+        )
+    return summaries
+
+
+def panel_data(analysis: dict, ticker: str) -> dict:
+    """Downsampled Stock/Peer/Diff columns for one ticker's panel."""
+    n = analysis["tickers"].index(ticker)
+    stock = analysis["norm"][:, n]
+    diff = analysis["diff"][:, n]
+    peer_avg = stock - diff
+    rows = grouped_indices(
+        np.stack([stock, peer_avg, diff], axis=-1),
+        3,
+        analysis["point_budget"] // 2,
+    )[0]
+    return panel_columns(rows.astype(np.int32), stock, peer_avg, diff)
+
+
+def panel_views(
+    analysis: dict,
+    tickers: list[str],
+    palette: list[str],
+    start: int = 0,
+    count: int | None = None,
+) -> list[dict]:
+    """Full panels for ``count`` tickers from ``start``; only these are
+    downsampled and converted to wire columns."""
+    summaries = panel_summaries(analysis, tickers, palette)
+    end = len(summaries) if count is None else start + count
+    return [
+        {**summary, "data": panel_data(analysis, summary["ticker"])}
+        for summary in summaries[start:end]
+    ]
+
+
+RISK_FORMATS = {
+    "cagr": "{:+.1%}",
+    "volatility": "{:.1%}",
+    "sharpe": "{:.2f}",
+    "max_drawdown": "{:.1%}",
+    "beta": "{:.2f}",
+    "correlation": "{:.2f}",
+}
+
+
+def _format_metric(metric: str, value: float) -> str:
+    return "—" if np.isnan(value) else RISK_FORMATS[metric].format(value)
+
+
+def risk_rows(analysis: dict, column: str, ascending: bool) -> list[dict]:
+    """Risk ranking table rows sorted by one metric, missing values last."""
+    risk = analysis["risk"]
+    tickers = analysis["tickers"]
+    if column in RISK_METRICS:
+        values = risk[column]
+        key = np.where(np.isnan(values), np.inf, values if ascending else -values)
+        order = np.argsort(key, kind="stable")
+    else:
+        order = np.argsort(tickers, kind="stable")
+        if not ascending:
+            order = order[::-1]
+    return [
+        {
+            "ticker": tickers[n],
+            **{m: _format_metric(m, float(risk[m][n])) for m in RISK_METRICS},
+        }
+        for n in order.tolist()
+    ]
+
+
+def risk_highlights(analysis: dict) -> list[dict]:
+    """Leaders for the risk summary cards."""
+    risk = analysis["risk"]
+    picks = [
+        ("Best Sharpe", "sharpe", np.nanargmax),
+        ("Highest CAGR", "cagr", np.nanargmax),
+        ("Lowest Volatility", "volatility", np.nanargmin),
+        ("Shallowest Drawdown", "max_drawdown", np.nanargmax),
+    ]
+    cards = []
+    for title, metric, pick in picks:
+        values = risk[metric]
+        if np.isnan(values).all():
+            continue
+        n = int(pick(values))
+        cards.append(
+            {
+                "title": title,
+                "ticker": analysis["tickers"][n],
+                "value": _format_metric(metric, float(values[n])),
+            }
+        )
+    return cards
+
+
+def correlation_view(analysis: dict) -> dict:
+    """Clustered correlation heatmap image, its ticker order and caption."""
+    correlation = analysis["correlation"]
+    order = correlation["order"]
+    if len(order) < 2:
+        return {"image": "", "tickers": [], "caption": ""}
+    matrix = correlation["matrix"][np.ix_(order, order)]
+    label = RESOLUTION_LABELS[analysis["resolution"]]
+    return {
+        "image": heatmap_data_uri(matrix),
+        "tickers": [analysis["tickers"][n] for n in order],
+        "caption": f"{label} return correlation, clustered so co-moving peers sit together",
+    }
@@ -0,0 +1,118 @@
+import asyncio
+import hmac
+import os
+from datetime import datetime
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import (
+    JSONResponse,
+    PlainTextResponse,
+    Response,
+    StreamingResponse,
+)
+from starlette.routing import Route
+
+from app.analytics.batch import (
+    BATCH_FORMATS,
+    batch_json,
+    iter_batch_arrow,
+    parse_groups,
+    run_batch,
+)
+from app.analytics.export import EXPORT_FORMATS, EXPORT_WRITERS, ExportColumns
+from app.data.result_store import result_store
+from app.metrics import METRICS_PATH, render_metrics
+
+EXPORT_PATH = "/export/{key}"
+BATCH_PATH = "/api/batch"
+BATCH_API_TOKEN = os.environ.get("BATCH_API_TOKEN", "")
+
+
+async def metrics(request: Request) -> Response:
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+async def export(request: Request) -> Response:
+    """Stream the session's price matrix as CSV, Parquet or Arrow IPC.
+
+    The path carries the analysis's result-store key, so any backend worker
+    that can resolve it serves the download; with several workers, point
+    ``RESULT_STORE_PATH`` at a directory they share. Rows are written a
+    chunk at a time from the backend arrays, so memory stays flat however
+    long the history or wide the universe.
+    """
+    analysis = result_store.get(request.path_params["key"])
+    if analysis is None:
+        return PlainTextResponse("Export link expired.", status_code=404)
+    fmt = request.query_params.get("format", "csv")
+    if fmt not in EXPORT_FORMATS:
+        return PlainTextResponse(f"Unknown format: {fmt}", status_code=400)
+    columns = ExportColumns(
+        analysis,
+        normalized=request.query_params.get("normalized") == "1",
+        diff=request.query_params.get("diff") == "1",
+    )
+    media_type, extension = EXPORT_FORMATS[fmt]
+    return StreamingResponse(
+        EXPORT_WRITERS[fmt](analysis, columns),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="stock_peer_analysis.{extension}"'
+            )
+        },
+    )
+
+
+async def batch(request: Request) -> Response:
+    """Analyze many peer groups in one call for reports and scripts.
+
+    The JSON body carries ``groups`` (see ``parse_groups``) and optionally
+    ``horizon``, ``as_of``, ``format`` (``json`` or ``arrow``) and
+    ``series`` (false for summaries only). The work runs off the event
+    loop on its own pool, so interactive sessions are not stalled by a
+    large batch.
+
+    Callers authenticate with ``Authorization: Bearer <BATCH_API_TOKEN>``;
+    the endpoint is disabled while no token is configured.
+    """
+    if not BATCH_API_TOKEN:
+        return PlainTextResponse("Batch API is disabled.", status_code=404)
+    supplied = request.headers.get("authorization", "")
+    if not hmac.compare_digest(supplied.encode(), f"Bearer {BATCH_API_TOKEN}".encode()):
+        return PlainTextResponse("Unauthorized.", status_code=401)
+    try:
+        body = await request.json()
+        groups = parse_groups(body)
+        horizon = body.get("horizon", "1Y")
+        as_of = body.get("as_of")
+        end_date = datetime.fromisoformat(as_of) if as_of else None
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        return PlainTextResponse(f"Invalid batch request: {e}", status_code=400)
+    fmt = body.get("format", request.query_params.get("format", "json"))
+    if fmt not in BATCH_FORMATS:
+        return PlainTextResponse(f"Unknown format: {fmt}", status_code=400)
+    include_series = bool(body.get("series", True))
+    try:
+        results = await asyncio.to_thread(run_batch, groups, horizon, end_date)
+    except ValueError as e:
+        return PlainTextResponse(str(e), status_code=400)
+    if fmt == "arrow":
+        return StreamingResponse(
+            iter_batch_arrow(results, include_series), media_type=BATCH_FORMATS[fmt]
+        )
+    return JSONResponse(
+        {"horizon": horizon, "groups": batch_json(results, include_series)}
+    )
+
+
+def backend_api() -> Starlette:
+    """Extra HTTP routes mounted in front of the Reflex backend."""
+    return Starlette(
+        routes=[
+            Route(METRICS_PATH, metrics),
+            Route(EXPORT_PATH, export),
+            Route(BATCH_PATH, batch, methods=["POST"]),
+        ]
+    )
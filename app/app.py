@@ -2,8 +2,17 @@ import reflex as rx
 from app.components.config_panel import config_panel
 from app.components.performance_chart import performance_chart
 from app.components.summary_stats import summary_stats
+from app.components.risk_summary import risk_summary
 from app.components.relative_strength import relative_strength_grid
+from app.components.correlation_heatmap import correlation_heatmap
 from app.components.data_table import data_table
+from app.components.watchlist_status import watchlist_status
+from app.states.stock_state import StockState
+from app.states.watchlist_state import WatchlistState
+from app.api import backend_api
+from app.metrics import instrument_state_updates
+from app.prewarm import run_prewarm_scheduler
+from app.workers import monitor_loop_lag
 
 
 def index() -> rx.Component:
@@ -12,10 +21,16 @@ def index() -> rx.Component:
             rx.el.main(
                 config_panel(),
                 summary_stats(),
+                risk_summary(),
                 performance_chart(),
+                correlation_heatmap(),
                 relative_strength_grid(),
                 data_table(),
                 class_name="container mx-auto px-4 py-12 flex flex-col items-center justify-start min-h-screen",
+                on_mount=rx.call_script(
+                    "Math.min(document.documentElement.clientWidth, 1024)",
+                    callback=StockState.set_chart_width,
+                ),
             ),
             class_name="min-h-screen bg-gray-50 font-['Inter']",
         ),
@@ -28,5 +43,15 @@ app = rx.App(
     stylesheets=[
         "https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap"
     ],
+    api_transformer=backend_api(),
+)
+app.register_lifespan_task(monitor_loop_lag)
+app.register_lifespan_task(instrument_state_updates, rx_app=app)
+app.register_lifespan_task(run_prewarm_scheduler)
+app.add_page(index, route="/", on_load=StockState.restore_analysis)
+app.add_page(
+    watchlist_status,
+    route="/watchlists",
+    title="Watchlist Pre-warming",
+    on_load=WatchlistState.load_status,
 )
-app.add_page(index, route="/")
\ No newline at end of file
@@ -0,0 +1,49 @@
+import reflex as rx
+from reflex.vars.base import VarData
+
+
+def columnar_rows(columns: rx.Var, axis: rx.Var | None = None) -> rx.Var:
+    """Expand a columnar payload into the row objects recharts and tables read.
+
+    ``columns`` carries epoch days in ``t`` (or, with a shared ``axis``,
+    positions into it in ``i``) and one array per series in ``s``. Rows are
+    rebuilt on the client, so key names and date strings never cross the
+    websocket once per point.
+    """
+    if axis is None:
+        positions, day = "c.t", "d"
+        var_data = columns._get_all_var_data()
+    else:
+        positions, day = "c.i", f"{axis!s}[d]"
+        var_data = VarData.merge(columns._get_all_var_data(), axis._get_all_var_data())
+    return rx.Var(
+        _js_expr=(
+            f"((c) => ({positions} ?? []).map((d, k) => Object.fromEntries(["
+            f'["Date", new Date({day} * 864e5).toISOString().slice(0, 10)], '
+            "...Object.entries(c.s ?? {}).map(([key, v]) => [key, v[k]])])))"
+            f"({columns!s})"
+        ),
+        _var_type=list[dict],
+        _var_data=var_data,
+    )
+
+
+def with_live_bar(rows: rx.Var, bar: rx.Var) -> rx.Var:
+    """Merge a live bar into expanded rows on the client.
+
+    ``bar`` holds an epoch day in ``t``, per-series values in ``s`` and, in
+    ``a``, whether it is a new row or replaces the last one. Only this one
+    row crosses the websocket on each live update; the rest of the series
+    is the payload already on the client.
+    """
+    return rx.Var(
+        _js_expr=(
+            "((r, b) => { if (!b || b.t == null || !r.length) return r; "
+            "const row = {...(b.a ? {} : r[r.length - 1]), ...b.s, "
+            "Date: new Date(b.t * 864e5).toISOString().slice(0, 10)}; "
+            "return b.a ? [...r, row] : [...r.slice(0, -1), row]; })"
+            f"({rows!s}, {bar!s})"
+        ),
+        _var_type=list[dict],
+        _var_data=VarData.merge(rows._get_all_var_data(), bar._get_all_var_data()),
+    )
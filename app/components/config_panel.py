@@ -14,6 +14,14 @@ def ticker_chip(ticker: str) -> rx.Component:
     )
 
 
+def failed_ticker_chip(failure: dict[str, str]) -> rx.Component:
+    return rx.el.span(
+        failure["ticker"],
+        rx.el.span(": " + failure["reason"], class_name="font-normal text-amber-600"),
+        class_name="text-xs font-semibold text-amber-800 bg-white border border-amber-200 rounded-full px-2.5 py-1",
+    )
+
+
 def horizon_button(horizon: str) -> rx.Component:
     is_selected = StockState.time_horizon == horizon
     return rx.el.button(
@@ -114,5 +122,22 @@ def config_panel() -> rx.Component:
                 class_name="mt-4 p-4 bg-red-50 border border-red-100 rounded-xl flex items-center animate-fade-in",
             ),
         ),
+        rx.cond(
+            StockState.failed_tickers.length() > 0,
+            rx.el.div(
+                rx.icon("triangle-alert", size=20, class_name="text-amber-500 mr-2"),
+                rx.el.div(
+                    rx.el.p(
+                        "Some tickers could not be loaded and were skipped:",
+                        class_name="text-amber-800 text-sm font-medium",
+                    ),
+                    rx.el.div(
+                        rx.foreach(StockState.failed_tickers, failed_ticker_chip),
+                        class_name="flex flex-wrap gap-2 mt-2",
+                    ),
+                ),
+                class_name="mt-4 p-4 bg-amber-50 border border-amber-100 rounded-xl flex items-start animate-fade-in",
+            ),
+        ),
         class_name="bg-white p-6 rounded-2xl shadow-sm border border-gray-200 w-full max-w-5xl mx-auto",
-    )
\ No newline at end of file
+    )
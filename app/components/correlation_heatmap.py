@@ -0,0 +1,59 @@
+import reflex as rx
+from app.states.stock_state import StockState
+
+
+def cluster_label(ticker: str, index: int) -> rx.Component:
+    return rx.el.div(
+        rx.el.span(index + 1, class_name="text-gray-400 w-6 text-right"),
+        rx.el.span(ticker, class_name="font-semibold text-gray-700"),
+        class_name="flex items-center gap-2 text-xs font-mono",
+    )
+
+
+def correlation_legend() -> rx.Component:
+    return rx.el.div(
+        rx.el.span("-1", class_name="text-xs text-gray-500"),
+        rx.el.div(
+            class_name="h-2 w-40 rounded-full bg-gradient-to-r from-red-500 via-white to-violet-500 border border-gray-200"
+        ),
+        rx.el.span("+1", class_name="text-xs text-gray-500"),
+        class_name="flex items-center gap-2",
+    )
+
+
+def correlation_heatmap() -> rx.Component:
+    heatmap = StockState.correlation_heatmap
+    return rx.cond(
+        heatmap["image"].to(str) != "",
+        rx.el.div(
+            rx.el.div(
+                rx.el.div(
+                    rx.el.h2(
+                        "Peer Correlation",
+                        class_name="text-lg font-bold text-gray-900",
+                    ),
+                    rx.el.p(
+                        heatmap["caption"].to(str),
+                        class_name="text-xs font-medium text-gray-500 mt-0.5",
+                    ),
+                    class_name="flex flex-col",
+                ),
+                correlation_legend(),
+                class_name="flex flex-col md:flex-row justify-between items-start md:items-center mb-6 gap-4",
+            ),
+            rx.el.div(
+                rx.el.img(
+                    src=heatmap["image"].to(str),
+                    alt="Peer correlation heatmap",
+                    class_name="w-full max-w-[420px] aspect-square rounded-lg border border-gray-200",
+                    style={"imageRendering": "pixelated"},
+                ),
+                rx.el.div(
+                    rx.foreach(heatmap["tickers"].to(list[str]), cluster_label),
+                    class_name="flex flex-col flex-wrap gap-x-6 gap-y-1 max-h-[420px] overflow-auto",
+                ),
+                class_name="flex flex-col md:flex-row gap-6",
+            ),
+            class_name="bg-white p-6 md:p-8 rounded-2xl shadow-sm border border-gray-200 w-full max-w-5xl mx-auto mt-6 animate-fade-in",
+        ),
+    )
@@ -1,4 +1,5 @@
 import reflex as rx
+from app.components.columnar import columnar_rows
 from app.states.stock_state import StockState
 
 
@@ -26,6 +27,54 @@ def table_header_cell(col: str) -> rx.Component:
     )
 
 
+def export_option(label: str, is_active: rx.Var, on_click) -> rx.Component:
+    return rx.el.button(
+        label,
+        on_click=on_click,
+        class_name=rx.cond(
+            is_active,
+            "px-2 py-1 text-xs font-medium rounded-md bg-violet-600 text-white shadow-sm transition-all",
+            "px-2 py-1 text-xs font-medium rounded-md bg-white text-gray-600 border border-gray-200 hover:bg-gray-50 transition-all",
+        ),
+    )
+
+
+def export_controls() -> rx.Component:
+    return rx.el.div(
+        export_option(
+            "CSV",
+            StockState.export_format == "csv",
+            lambda: StockState.set_export_format("csv"),
+        ),
+        export_option(
+            "Parquet",
+            StockState.export_format == "parquet",
+            lambda: StockState.set_export_format("parquet"),
+        ),
+        export_option(
+            "Arrow",
+            StockState.export_format == "arrow",
+            lambda: StockState.set_export_format("arrow"),
+        ),
+        rx.el.span(class_name="w-px h-5 bg-gray-200 mx-1"),
+        export_option(
+            "Normalized",
+            StockState.export_normalized,
+            StockState.toggle_export_normalized,
+        ),
+        export_option(
+            "vs Peers", StockState.export_diff, StockState.toggle_export_diff
+        ),
+        rx.el.button(
+            rx.icon("download", size=16),
+            "Export",
+            on_click=StockState.download_export,
+            class_name="flex items-center gap-2 px-3 py-1.5 text-sm font-medium text-gray-700 bg-white border border-gray-300 rounded-lg hover:bg-gray-50 transition-colors shadow-sm",
+        ),
+        class_name="flex items-center gap-1.5",
+    )
+
+
 def table_row(row: dict) -> rx.Component:
     return rx.el.tr(
         rx.foreach(
@@ -58,12 +107,7 @@ def data_table() -> rx.Component:
                         "Raw Market Data", class_name="text-xl font-bold text-gray-900"
                     ),
                     rx.el.div(
-                        rx.el.button(
-                            rx.icon("download", size=16),
-                            "Export CSV",
-                            on_click=StockState.download_csv,
-                            class_name="flex items-center gap-2 px-3 py-1.5 text-sm font-medium text-gray-700 bg-white border border-gray-300 rounded-lg hover:bg-gray-50 transition-colors shadow-sm",
-                        ),
+                        export_controls(),
                         rx.el.button(
                             rx.cond(
                                 StockState.is_fullscreen,
@@ -87,7 +131,10 @@ def data_table() -> rx.Component:
                             )
                         ),
                         rx.el.tbody(
-                            rx.foreach(StockState.paginated_table_data, table_row),
+                            rx.foreach(
+                                columnar_rows(StockState.paginated_table_data),
+                                table_row,
+                            ),
                             class_name="bg-white divide-y divide-gray-100",
                         ),
                         class_name="min-w-full divide-y divide-gray-200",
@@ -134,4 +181,4 @@ def data_table() -> rx.Component:
                 "w-full max-w-5xl mx-auto mt-8 mb-12 animate-fade-in bg-white p-6 rounded-2xl border border-gray-200 shadow-sm",
             ),
         ),
-    )
\ No newline at end of file
+    )
@@ -1,4 +1,5 @@
 import reflex as rx
+from app.components.columnar import columnar_rows, with_live_bar
 from app.states.stock_state import StockState
 
 
@@ -48,6 +49,22 @@ def chart_legend_item(item: dict[str, str]) -> rx.Component:
     )
 
 
+def live_toggle() -> rx.Component:
+    return rx.el.div(
+        rx.el.button(
+            "Live",
+            on_click=StockState.toggle_live,
+            class_name=rx.cond(
+                StockState.live,
+                "px-2.5 py-1 text-xs font-semibold rounded-full bg-emerald-600 text-white shadow-sm transition-all",
+                "px-2.5 py-1 text-xs font-semibold rounded-full bg-white text-gray-600 border border-gray-200 hover:bg-gray-50 transition-all",
+            ),
+        ),
+        rx.el.span(StockState.live_status, class_name="text-xs text-gray-500"),
+        class_name="flex items-center gap-2 mt-2",
+    )
+
+
 def performance_chart() -> rx.Component:
     return rx.cond(
         StockState.has_data,
@@ -62,6 +79,7 @@ def performance_chart() -> rx.Component:
                         "Normalized returns (Base = 1.0)",
                         class_name="text-xs font-medium text-gray-500 mt-0.5",
                     ),
+                    live_toggle(),
                     class_name="flex flex-col",
                 ),
                 rx.el.div(
@@ -94,7 +112,10 @@ def performance_chart() -> rx.Component:
                         width=40,
                     ),
                     rx.foreach(StockState.ticker_metadata, render_line),
-                    data=StockState.normalized_data,
+                    data=with_live_bar(
+                        columnar_rows(StockState.normalized_data),
+                        StockState.live_chart_bar,
+                    ),
                     width="100%",
                     height="100%",
                     margin={"top": 5, "right": 5, "bottom": 5, "left": -10},
@@ -103,4 +124,4 @@ def performance_chart() -> rx.Component:
             ),
             class_name="bg-white p-6 md:p-8 rounded-2xl shadow-sm border border-gray-200 w-full max-w-5xl mx-auto mt-6 animate-fade-in",
         ),
-    )
\ No newline at end of file
+    )
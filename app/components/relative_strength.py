@@ -1,5 +1,6 @@
 import reflex as rx
-from app.states.stock_state import StockState
+from app.components.columnar import columnar_rows, with_live_bar
+from app.states.stock_state import PANEL_WINDOW, StockState
 
 
 def define_gradient(ticker: str, offset: float) -> rx.Component:
@@ -110,9 +111,10 @@ def differential_area_chart(
     )
 
 
-def analysis_panel(
-    panel: dict[str, str | float | list[dict[str, str | float | None]]],
-) -> rx.Component:
+def analysis_panel(panel: dict[str, str | float | dict[str, list]]) -> rx.Component:
+    live = StockState.live_panel_bars[panel["ticker"].to(str)]
+    current_diff = rx.cond(live, live["current_diff"], panel["current_diff"])
+    rows = with_live_bar(columnar_rows(panel["data"], StockState.panel_dates), live)
     return rx.el.div(
         rx.el.div(
             rx.el.div(
@@ -121,9 +123,11 @@ def analysis_panel(
                     class_name="text-lg font-bold text-gray-900",
                 ),
                 rx.el.span(
-                    panel["current_diff_fmt"].to(str),
+                    rx.cond(
+                        live, live["current_diff_fmt"], panel["current_diff_fmt"]
+                    ).to(str),
                     class_name=rx.cond(
-                        panel["current_diff"].to(float) >= 0,
+                        current_diff.to(float) >= 0,
                         "text-xs font-bold px-2 py-1 rounded-full bg-emerald-100 text-emerald-700",
                         "text-xs font-bold px-2 py-1 rounded-full bg-red-100 text-red-700",
                     ),
@@ -136,7 +140,10 @@ def analysis_panel(
                         "Stock vs Peer Avg",
                         class_name="text-[10px] uppercase font-bold text-gray-400 mb-2 tracking-wider",
                     ),
-                    stock_vs_peer_chart(panel["data"].to(list), panel["color"].to(str)),
+                    stock_vs_peer_chart(
+                        rows,
+                        panel["color"].to(str),
+                    ),
                     class_name="w-full h-[180px]",
                 ),
                 rx.el.div(
@@ -145,9 +152,11 @@ def analysis_panel(
                         class_name="text-[10px] uppercase font-bold text-gray-400 mb-2 tracking-wider",
                     ),
                     differential_area_chart(
-                        panel["data"].to(list),
+                        rows,
                         panel["ticker"].to(str),
-                        panel["gradient_offset"].to(float),
+                        rx.cond(
+                            live, live["gradient_offset"], panel["gradient_offset"]
+                        ).to(float),
                     ),
                     class_name="w-full h-[180px]",
                 ),
@@ -159,13 +168,64 @@ def analysis_panel(
     )
 
 
+def panel_chip(summary: dict) -> rx.Component:
+    return rx.el.button(
+        rx.el.span(summary["ticker"].to(str), class_name="font-semibold"),
+        rx.el.span(
+            summary["current_diff_fmt"].to(str),
+            class_name=rx.cond(
+                summary["current_diff"].to(float) >= 0,
+                "text-emerald-600",
+                "text-red-600",
+            ),
+        ),
+        on_click=StockState.focus_panel(summary["ticker"].to(str)),
+        class_name=rx.cond(
+            summary["visible"].to(bool),
+            "flex items-center gap-1.5 px-2.5 py-1 text-xs rounded-lg bg-violet-50 border border-violet-300 transition-colors",
+            "flex items-center gap-1.5 px-2.5 py-1 text-xs rounded-lg bg-white border border-gray-200 hover:border-gray-300 transition-colors",
+        ),
+        style={"borderLeft": "3px solid " + summary["color"].to(str)},
+    )
+
+
+def panel_pager() -> rx.Component:
+    return rx.el.div(
+        rx.el.button(
+            rx.icon("chevron-left", size=16),
+            on_click=StockState.shift_panels(-1),
+            disabled=StockState.panel_start == 0,
+            class_name="p-1.5 text-gray-500 hover:text-gray-900 hover:bg-gray-100 rounded-lg transition-colors disabled:opacity-30",
+        ),
+        rx.el.span(StockState.panel_range_label, class_name="text-sm text-gray-500"),
+        rx.el.button(
+            rx.icon("chevron-right", size=16),
+            on_click=StockState.shift_panels(1),
+            disabled=StockState.panel_start + PANEL_WINDOW >= StockState.panel_count,
+            class_name="p-1.5 text-gray-500 hover:text-gray-900 hover:bg-gray-100 rounded-lg transition-colors disabled:opacity-30",
+        ),
+        class_name="flex items-center gap-2",
+    )
+
+
 def relative_strength_grid() -> rx.Component:
     return rx.cond(
         StockState.has_data,
         rx.el.div(
-            rx.el.h2(
-                "Deep Dive: Relative Strength",
-                class_name="text-xl font-bold text-gray-900 mb-4 px-1",
+            rx.el.div(
+                rx.el.h2(
+                    "Deep Dive: Relative Strength",
+                    class_name="text-xl font-bold text-gray-900",
+                ),
+                rx.cond(StockState.panel_count > PANEL_WINDOW, panel_pager()),
+                class_name="flex justify-between items-center mb-4 px-1",
+            ),
+            rx.cond(
+                StockState.panel_count > PANEL_WINDOW,
+                rx.el.div(
+                    rx.foreach(StockState.panel_summaries, panel_chip),
+                    class_name="flex flex-wrap gap-2 mb-4 max-h-32 overflow-y-auto",
+                ),
             ),
             rx.el.div(
                 rx.foreach(StockState.relative_strength_panels, analysis_panel),
@@ -173,4 +233,4 @@ def relative_strength_grid() -> rx.Component:
             ),
             class_name="w-full max-w-5xl mx-auto mt-8 animate-fade-in pb-12",
         ),
-    )
\ No newline at end of file
+    )
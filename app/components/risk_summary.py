@@ -0,0 +1,107 @@
+import reflex as rx
+from app.states.stock_state import StockState
+
+RISK_COLUMNS = [
+    ("ticker", "Ticker"),
+    ("cagr", "CAGR"),
+    ("volatility", "Volatility"),
+    ("sharpe", "Sharpe"),
+    ("max_drawdown", "Max Drawdown"),
+    ("beta", "Beta vs Peers"),
+    ("correlation", "Corr. vs Peers"),
+]
+
+
+def risk_card(card: dict) -> rx.Component:
+    return rx.el.div(
+        rx.el.p(
+            card["title"].to(str),
+            class_name="text-xs font-semibold text-gray-500 uppercase tracking-wider mb-3",
+        ),
+        rx.el.div(
+            rx.el.h3(
+                card["ticker"].to(str),
+                class_name="text-xl font-bold text-gray-900 leading-tight",
+            ),
+            rx.el.span(
+                card["value"].to(str),
+                class_name="text-xs font-bold px-2 py-1 rounded-full bg-violet-50 text-violet-700",
+            ),
+            class_name="flex items-center gap-3",
+        ),
+        class_name="bg-white p-4 rounded-2xl border border-gray-200 shadow-sm flex-1 min-w-[180px]",
+    )
+
+
+def risk_header_cell(key: str, label: str) -> rx.Component:
+    return rx.el.th(
+        rx.el.div(
+            rx.el.span(label),
+            rx.cond(
+                StockState.risk_sort_column == key,
+                rx.icon(
+                    rx.cond(StockState.risk_sort_asc, "arrow-up", "arrow-down"),
+                    size=14,
+                    class_name="text-violet-600",
+                ),
+            ),
+            class_name="flex items-center gap-2 cursor-pointer",
+        ),
+        on_click=StockState.sort_risk_table(key),
+        class_name="px-4 py-3 text-left text-xs font-bold text-gray-500 uppercase tracking-wider select-none hover:bg-gray-50 transition-colors",
+    )
+
+
+def risk_row(row: dict) -> rx.Component:
+    return rx.el.tr(
+        *[
+            rx.el.td(
+                row[key].to(str),
+                class_name=(
+                    "px-4 py-2 whitespace-nowrap text-sm font-semibold text-gray-900"
+                    if key == "ticker"
+                    else "px-4 py-2 whitespace-nowrap text-sm text-gray-600 font-mono"
+                ),
+            )
+            for key, _ in RISK_COLUMNS
+        ],
+        class_name="hover:bg-gray-50 transition-colors",
+    )
+
+
+def risk_summary() -> rx.Component:
+    return rx.cond(
+        StockState.has_data,
+        rx.el.div(
+            rx.el.div(
+                rx.foreach(StockState.risk_cards, risk_card),
+                class_name="flex flex-col md:flex-row gap-4",
+            ),
+            rx.el.div(
+                rx.el.h2(
+                    "Risk Ranking", class_name="text-lg font-bold text-gray-900 mb-4"
+                ),
+                rx.el.div(
+                    rx.el.table(
+                        rx.el.thead(
+                            rx.el.tr(
+                                *[
+                                    risk_header_cell(key, label)
+                                    for key, label in RISK_COLUMNS
+                                ],
+                                class_name="bg-gray-50 border-b border-gray-200",
+                            )
+                        ),
+                        rx.el.tbody(
+                            rx.foreach(StockState.risk_table_data, risk_row),
+                            class_name="bg-white divide-y divide-gray-100",
+                        ),
+                        class_name="min-w-full divide-y divide-gray-200",
+                    ),
+                    class_name="overflow-auto max-h-96 border border-gray-200 rounded-xl",
+                ),
+                class_name="bg-white p-6 rounded-2xl border border-gray-200 shadow-sm",
+            ),
+            class_name="flex flex-col gap-4 w-full max-w-5xl mx-auto mt-4 animate-fade-in",
+        ),
+    )
@@ -0,0 +1,117 @@
+import reflex as rx
+from app.states.watchlist_state import WatchlistState
+
+STATUS_COLUMNS = [
+    ("name", "Watchlist"),
+    ("tickers", "Tickers"),
+    ("horizons", "Horizons"),
+    ("state", "Status"),
+    ("refreshed", "Last Refresh"),
+    ("duration", "Duration (s)"),
+    ("next_run", "Next Run"),
+]
+
+
+def status_badge(state: rx.Var) -> rx.Component:
+    return rx.el.span(
+        state,
+        class_name=rx.match(
+            state,
+            (
+                "ok",
+                "text-xs font-bold px-2 py-1 rounded-full bg-emerald-100 text-emerald-700",
+            ),
+            (
+                "failed",
+                "text-xs font-bold px-2 py-1 rounded-full bg-red-100 text-red-700",
+            ),
+            (
+                "running",
+                "text-xs font-bold px-2 py-1 rounded-full bg-violet-100 text-violet-700",
+            ),
+            "text-xs font-bold px-2 py-1 rounded-full bg-gray-100 text-gray-600",
+        ),
+    )
+
+
+def status_row(row: dict) -> rx.Component:
+    return rx.el.tr(
+        *[
+            rx.el.td(
+                (
+                    status_badge(row[key].to(str))
+                    if key == "state"
+                    else row[key].to(str)
+                ),
+                class_name="px-4 py-3 whitespace-nowrap text-sm text-gray-700",
+            )
+            for key, _ in STATUS_COLUMNS
+        ],
+        rx.el.td(
+            rx.el.button(
+                rx.icon("refresh-cw", size=14),
+                "Refresh",
+                on_click=WatchlistState.refresh_watchlist(row["name"].to(str)),
+                disabled=row["state"].to(str) == "running",
+                class_name="flex items-center gap-1.5 px-2.5 py-1 text-xs font-medium text-gray-700 bg-white border border-gray-300 rounded-lg hover:bg-gray-50 transition-colors disabled:opacity-40",
+            ),
+            class_name="px-4 py-3",
+        ),
+        rx.el.td(
+            row["error"].to(str),
+            class_name="px-4 py-3 text-xs text-red-600 max-w-xs truncate",
+        ),
+        class_name="hover:bg-gray-50 transition-colors",
+    )
+
+
+def watchlist_status() -> rx.Component:
+    return rx.el.div(
+        rx.el.main(
+            rx.el.div(
+                rx.el.h1(
+                    "Watchlist Pre-warming",
+                    class_name="text-2xl font-bold text-gray-900",
+                ),
+                rx.el.a(
+                    "Back to analysis",
+                    href="/",
+                    class_name="text-sm font-medium text-violet-600 hover:text-violet-700",
+                ),
+                class_name="flex justify-between items-center mb-6",
+            ),
+            rx.cond(
+                WatchlistState.rows.length() > 0,
+                rx.el.div(
+                    rx.el.table(
+                        rx.el.thead(
+                            rx.el.tr(
+                                *[
+                                    rx.el.th(
+                                        label,
+                                        class_name="px-4 py-3 text-left text-xs font-bold text-gray-500 uppercase tracking-wider",
+                                    )
+                                    for _, label in STATUS_COLUMNS
+                                ],
+                                rx.el.th(),
+                                rx.el.th(),
+                                class_name="bg-gray-50 border-b border-gray-200",
+                            )
+                        ),
+                        rx.el.tbody(
+                            rx.foreach(WatchlistState.rows, status_row),
+                            class_name="bg-white divide-y divide-gray-100",
+                        ),
+                        class_name="min-w-full divide-y divide-gray-200",
+                    ),
+                    class_name="overflow-x-auto border border-gray-200 rounded-xl shadow-sm bg-white",
+                ),
+                rx.el.p(
+                    "No watchlists registered. Add them to watchlists.json (see watchlists.example.json).",
+                    class_name="text-sm text-gray-500",
+                ),
+            ),
+            class_name="container mx-auto px-4 py-12 max-w-5xl",
+        ),
+        class_name="min-h-screen bg-gray-50 font-['Inter'] antialiased",
+    )
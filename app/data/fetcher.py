@@ -0,0 +1,76 @@
+import asyncio
+import os
+from datetime import datetime
+from typing import AsyncIterator
+
+import pandas as pd
+
+from app.data.price_cache import price_cache
+
+FETCH_MODE = os.environ.get("FETCH_MODE", "stream")
+FETCH_CONCURRENCY = int(os.environ.get("FETCH_CONCURRENCY", "8"))
+FETCH_TIMEOUT_SECONDS = float(os.environ.get("FETCH_TIMEOUT_SECONDS", "20"))
+
+
+async def fetch_ticker_closes(
+    ticker: str, start: datetime, end: datetime, timeout: float
+) -> pd.Series:
+    """Load one ticker's closes through the price cache with a timeout."""
+    frame = await asyncio.wait_for(
+        asyncio.to_thread(price_cache.get_closes, [ticker], start, end), timeout
+    )
+    series = frame[ticker].dropna() if ticker in frame else pd.Series(dtype=float)
+    if series.empty:
+        raise ValueError("no data returned")
+    return series
+
+
+def _download(ticker: str, start: datetime, end: datetime) -> None:
+    price_cache.download_missing([ticker], start, end)
+    if not price_cache.has_bars(ticker, start.date()):
+        raise ValueError("no data returned")
+
+
+async def read_closes(
+    tickers: list[str], start: datetime, end: datetime
+) -> pd.DataFrame:
+    """Read the cached close matrix of ``tickers`` in one block."""
+    return await asyncio.to_thread(price_cache.read, tickers, start.date(), end.date())
+
+
+async def stream_closes(
+    tickers: list[str],
+    start: datetime,
+    end: datetime,
+    concurrency: int = FETCH_CONCURRENCY,
+    timeout: float = FETCH_TIMEOUT_SECONDS,
+) -> AsyncIterator[tuple[str, str]]:
+    """Yield (ticker, error) for each ticker as soon as it is in the cache.
+
+    At most ``concurrency`` downloads run at once and each one is abandoned
+    after ``timeout`` seconds. A failed ticker yields a short reason instead
+    of failing the whole batch. Closes are not read per ticker: callers read
+    the matrix of the tickers that landed with ``read_closes``, a single
+    copy out of the price store instead of one frame per ticker to join.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch_one(ticker: str) -> tuple[str, str]:
+        async with semaphore:
+            try:
+                await asyncio.wait_for(
+                    asyncio.to_thread(_download, ticker, start, end), timeout
+                )
+            except asyncio.TimeoutError:
+                return ticker, f"timed out after {timeout:g}s"
+            except Exception as e:
+                return ticker, str(e) or type(e).__name__
+        return ticker, ""
+
+    tasks = [asyncio.ensure_future(fetch_one(ticker)) for ticker in tickers]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,373 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from app.data.price_store import (
+    STORE_PATH,
+    MmapPriceStore,
+    epoch_day,
+    iso_day,
+    period_rows,
+)
+from app.data.providers import PriceProvider, get_provider
+
+CACHE_PATH = os.environ.get("PRICE_CACHE_PATH", ".cache/prices.sqlite3")
+CACHE_MAX_AGE_DAYS = int(os.environ.get("PRICE_CACHE_MAX_AGE_DAYS", "30"))
+CACHE_MAX_ROWS = int(os.environ.get("PRICE_CACHE_MAX_ROWS", "2000000"))
+CACHE_EVICT_SECONDS = float(os.environ.get("PRICE_CACHE_EVICT_SECONDS", "600"))
+PRICE_STORE = os.environ.get("PRICE_STORE", "mmap")
+
+
+class PriceCache:
+    """Per-ticker close price store that only downloads missing date ranges.
+
+    Each ticker records the date range that has been requested from the
+    provider. Reads that fall inside that range are served from disk; a
+    later end date only downloads the tail since the last cached bar and an
+    earlier start date only downloads the missing head.
+    """
+
+    def __init__(
+        self,
+        path: str = CACHE_PATH,
+        max_age_days: int = CACHE_MAX_AGE_DAYS,
+        max_rows: int = CACHE_MAX_ROWS,
+        provider: PriceProvider | None = None,
+    ):
+        self.provider = provider or get_provider()
+        self.path = path
+        self.max_age_days = max_age_days
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._initialized = False
+        self._next_evict = 0.0
+
+    @contextmanager
+    def _connect(self):
+        conn = self._open()
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _open(self) -> sqlite3.Connection:
+        if not self._initialized:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS prices ("
+                "ticker TEXT NOT NULL, date TEXT NOT NULL, close REAL, "
+                "PRIMARY KEY (ticker, date)) WITHOUT ROWID"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS coverage ("
+                "ticker TEXT PRIMARY KEY, covered_from TEXT NOT NULL, "
+                "covered_to TEXT NOT NULL, last_bar TEXT, last_access REAL NOT NULL)"
+            )
+            conn.commit()
+            self._initialized = True
+        return conn
+
+    def coverage(self, tickers: list[str]) -> dict[str, tuple[str, str, str | None]]:
+        """Return (covered_from, covered_to, last_bar) for each cached ticker."""
+        if not tickers:
+            return {}
+        placeholders = ",".join("?" * len(tickers))
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT ticker, covered_from, covered_to, last_bar FROM coverage "
+                f"WHERE ticker IN ({placeholders})",
+                tickers,
+            ).fetchall()
+        return {ticker: (lo, hi, last) for ticker, lo, hi, last in rows}
+
+    def read(
+        self, tickers: list[str], start: date, end: date, resolution: str = "D"
+    ) -> pd.DataFrame:
+        """Read cached closes for the window as a wide frame in ticker order.
+
+        At a weekly or monthly ``resolution`` only the rows ``period_rows``
+        keeps are returned, gaps carried forward from the daily bars.
+        """
+        placeholders = ",".join("?" * len(tickers))
+        with self._connect() as conn:
+            long_df = pd.read_sql_query(
+                "SELECT ticker, date, close FROM prices "
+                f"WHERE ticker IN ({placeholders}) AND date >= ? AND date <= ?",
+                conn,
+                params=[*tickers, start.isoformat(), end.isoformat()],
+            )
+            conn.execute(
+                f"UPDATE coverage SET last_access = ? WHERE ticker IN ({placeholders})",
+                [time.time(), *tickers],
+            )
+        if long_df.empty:
+            frame = pd.DataFrame(columns=tickers, dtype=float)
+            frame.index = pd.DatetimeIndex([], name="Date")
+            return frame
+        frame = long_df.pivot(index="date", columns="ticker", values="close")
+        frame.index = pd.DatetimeIndex(pd.to_datetime(frame.index), name="Date")
+        frame.columns.name = None
+        frame = frame.reindex(columns=tickers)
+        if resolution != "D":
+            frame = frame.ffill().iloc[period_rows(frame.index.values, resolution)]
+        return frame
+
+    def write(self, frame: pd.DataFrame, covered: dict[str, tuple[date, date]]) -> None:
+        """Upsert downloaded closes and extend each ticker's covered range."""
+        now = time.time()
+        dates = pd.DatetimeIndex(frame.index).strftime("%Y-%m-%d")
+        with self._lock, self._connect() as conn:
+            for ticker, (lo, hi) in covered.items():
+                if ticker not in frame.columns:
+                    continue
+                series = frame[ticker]
+                mask = series.notna().to_numpy()
+                existing = conn.execute(
+                    "SELECT covered_from, covered_to, last_bar FROM coverage "
+                    "WHERE ticker = ?",
+                    (ticker,),
+                ).fetchone()
+                if not mask.any() and not existing:
+                    continue
+                rows = [
+                    (ticker, d, float(v))
+                    for d, v in zip(dates[mask], series.to_numpy()[mask])
+                ]
+                conn.executemany(
+                    "INSERT OR REPLACE INTO prices (ticker, date, close) "
+                    "VALUES (?, ?, ?)",
+                    rows,
+                )
+                covered_from, covered_to = lo.isoformat(), hi.isoformat()
+                last_bar = rows[-1][1] if rows else None
+                if existing:
+                    covered_from = min(covered_from, existing[0])
+                    covered_to = max(covered_to, existing[1])
+                    last_bar = max(filter(None, (last_bar, existing[2])), default=None)
+                conn.execute(
+                    "INSERT OR REPLACE INTO coverage "
+                    "(ticker, covered_from, covered_to, last_bar, last_access) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (ticker, covered_from, covered_to, last_bar, now),
+                )
+        self.maybe_evict()
+
+    def maybe_evict(self) -> None:
+        """Run ``evict`` at most once per ``CACHE_EVICT_SECONDS``.
+
+        Eviction scans every ticker, so running it after each write made a
+        wide streamed fetch quadratic; the row limit is a soft bound that
+        may be exceeded until the next pass.
+        """
+        now = time.monotonic()
+        if now < self._next_evict:
+            return
+        self._next_evict = now + CACHE_EVICT_SECONDS
+        self.evict()
+
+    def evict(self) -> None:
+        """Drop tickers not read within max_age_days, then the least recently
+        used tickers until the store is back under max_rows."""
+        cutoff = time.time() - self.max_age_days * 86400
+        with self._lock, self._connect() as conn:
+            stale = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT ticker FROM coverage WHERE last_access < ?", (cutoff,)
+                )
+            ]
+            for ticker in stale:
+                self._delete(conn, ticker)
+            total = conn.execute("SELECT COUNT(*) FROM prices").fetchone()[0]
+            if total <= self.max_rows:
+                return
+            by_access = conn.execute(
+                "SELECT c.ticker, COUNT(p.date) FROM coverage c "
+                "LEFT JOIN prices p ON p.ticker = c.ticker "
+                "GROUP BY c.ticker ORDER BY c.last_access ASC"
+            ).fetchall()
+            for ticker, count in by_access:
+                if total <= self.max_rows:
+                    break
+                self._delete(conn, ticker)
+                total -= count
+
+    @staticmethod
+    def _delete(conn: sqlite3.Connection, ticker: str) -> None:
+        conn.execute("DELETE FROM prices WHERE ticker = ?", (ticker,))
+        conn.execute("DELETE FROM coverage WHERE ticker = ?", (ticker,))
+
+    def missing_ranges(
+        self, tickers: list[str], start: date, end: date
+    ) -> dict[tuple[date, date], list[str]]:
+        """Group tickers by the date range that still has to be downloaded."""
+        known = self.coverage(tickers)
+        ranges: dict[tuple[date, date], list[str]] = {}
+        for ticker in tickers:
+            if ticker not in known:
+                ranges.setdefault((start, end), []).append(ticker)
+                continue
+            covered_from, covered_to, last_bar = known[ticker]
+            if date.fromisoformat(covered_from) > start:
+                head_end = date.fromisoformat(covered_from) + timedelta(days=1)
+                ranges.setdefault((start, head_end), []).append(ticker)
+            if date.fromisoformat(covered_to) < end:
+                tail_start = date.fromisoformat(last_bar or covered_to)
+                ranges.setdefault((tail_start, end), []).append(ticker)
+        return ranges
+
+    def get_closes(
+        self,
+        tickers: list[str],
+        start: datetime | date,
+        end: datetime | date,
+        resolution: str = "D",
+    ) -> pd.DataFrame:
+        """Return closes for the window, downloading only what is not cached.
+
+        ``resolution`` (``"D"``, ``"W"`` or ``"M"``) selects daily bars or
+        the last bar of every week or month.
+        """
+        self.download_missing(tickers, start, end)
+        start_day = start.date() if isinstance(start, datetime) else start
+        end_day = end.date() if isinstance(end, datetime) else end
+        return self.read(tickers, start_day, end_day, resolution)
+
+    def download_missing(
+        self, tickers: list[str], start: datetime | date, end: datetime | date
+    ) -> None:
+        """Download and store whatever the cache lacks for the window.
+
+        Today's bar is still moving until the session closes, so on trading
+        days coverage is only recorded up to yesterday: later requests
+        download again from the last cached bar and revise it.
+        """
+        start_day = start.date() if isinstance(start, datetime) else start
+        end_day = end.date() if isinstance(end, datetime) else end
+        today = date.today()
+        settled = today - timedelta(days=1) if np.is_busday(today) else today
+        for (lo, hi), group in self.missing_ranges(tickers, start_day, end_day).items():
+            fetch_end = end if hi == end_day else hi
+            fetched = self.provider.download(group, lo, fetch_end)
+            if fetched.empty:
+                continue
+            self.write(fetched, {ticker: (lo, min(hi, settled)) for ticker in group})
+
+    def has_bars(self, ticker: str, start: date) -> bool:
+        """Whether the cache holds a bar for ``ticker`` on or after ``start``."""
+        last_bar = self.coverage([ticker]).get(ticker, (None, None, None))[2]
+        return last_bar is not None and last_bar >= start.isoformat()
+
+
+class MmapPriceCache(PriceCache):
+    """``PriceCache`` whose bars live in a shared ``MmapPriceStore``.
+
+    Coverage is kept in each ticker's header, so the download planning in
+    ``missing_ranges`` and ``get_closes`` is unchanged.
+    """
+
+    def __init__(
+        self,
+        path: str = STORE_PATH,
+        max_age_days: int = CACHE_MAX_AGE_DAYS,
+        max_rows: int = CACHE_MAX_ROWS,
+        provider: PriceProvider | None = None,
+    ):
+        super().__init__(path, max_age_days, max_rows, provider)
+        self._store: MmapPriceStore | None = None
+
+    @property
+    def store(self) -> MmapPriceStore:
+        if self._store is None or self._store.path != self.path:
+            self._store = MmapPriceStore(self.path)
+        return self._store
+
+    def coverage(self, tickers: list[str]) -> dict[str, tuple[str, str, str | None]]:
+        known = {}
+        for ticker in tickers:
+            header = self.store.header(ticker)
+            if header is None:
+                continue
+            first, length, covered_from, covered_to = (int(v) for v in header)
+            last_bar = iso_day(first + length - 1) if length else None
+            known[ticker] = (iso_day(covered_from), iso_day(covered_to), last_bar)
+        return known
+
+    def read(
+        self, tickers: list[str], start: date, end: date, resolution: str = "D"
+    ) -> pd.DataFrame:
+        """Assemble the wide frame from mapped columns with a single copy,
+        dropping days on which none of the tickers traded. Weekly and monthly
+        reads come from the store's precomputed aggregates.
+
+        The copy is unavoidable: the files are indexed by calendar day, so
+        dropping weekends and holidays and laying the tickers out as one
+        2-D block both need new memory. It is made once per read, straight
+        from the mapped pages, and the analysis built from it is shared
+        between sessions through the result store.
+        """
+        self.store.touch(tickers)
+        if resolution != "D":
+            days, matrix = self.store.resampled(
+                tickers, epoch_day(start), epoch_day(end) + 1, resolution
+            )
+            index = pd.DatetimeIndex(
+                days.astype("datetime64[D]").astype("datetime64[ns]"), name="Date"
+            )
+            return pd.DataFrame(matrix, index=index, columns=list(tickers), copy=False)
+        dates, columns = self.store.columns(
+            tickers, epoch_day(start), epoch_day(end) + 1
+        )
+        traded = np.zeros(len(dates), dtype=bool)
+        for column in columns:
+            traded |= ~np.isnan(column)
+        matrix = np.empty((int(traded.sum()), len(tickers)))
+        for n, column in enumerate(columns):
+            matrix[:, n] = column[traded]
+        index = pd.DatetimeIndex(dates[traded].astype("datetime64[ns]"), name="Date")
+        return pd.DataFrame(matrix, index=index, columns=list(tickers), copy=False)
+
+    def write(self, frame: pd.DataFrame, covered: dict[str, tuple[date, date]]) -> None:
+        days = (
+            pd.DatetimeIndex(frame.index)
+            .values.astype("datetime64[D]")
+            .astype(np.int64)
+        )
+        with self.store._write_lock():
+            for ticker, (lo, hi) in covered.items():
+                if ticker not in frame.columns:
+                    continue
+                values = frame[ticker].to_numpy(dtype=float)
+                mask = ~np.isnan(values)
+                self.store.append(
+                    ticker, days[mask], values[mask], epoch_day(lo), epoch_day(hi)
+                )
+        self.maybe_evict()
+
+    def evict(self) -> None:
+        self.store.evict(self.max_age_days, self.max_rows)
+
+
+def get_price_cache(name: str = PRICE_STORE) -> PriceCache:
+    """Return the price cache backed by the store selected by name
+    (``PRICE_STORE``): shared memory-mapped files or a SQLite database."""
+    if name == "mmap":
+        return MmapPriceCache()
+    if name == "sqlite":
+        return PriceCache()
+    raise ValueError(f"Unknown price store: {name}")
+
+
+price_cache = get_price_cache()
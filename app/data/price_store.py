@@ -0,0 +1,425 @@
+import fcntl
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from urllib.parse import quote
+
+import numpy as np
+
+STORE_PATH = os.environ.get("PRICE_STORE_PATH", ".cache/prices")
+HEADER = 4
+HEADER_BYTES = HEADER * 8
+INDEX_GROWTH_DAYS = 366
+SERIES_SUFFIX = ".f64"
+AGGREGATE_SUFFIXES = {"W": ".w64", "M": ".m64"}
+AGGREGATE_HEADER = 2
+AGGREGATE_HEADER_BYTES = AGGREGATE_HEADER * 8
+
+
+def epoch_day(value: date | datetime) -> int:
+    """Days since 1970-01-01, the position of ``value`` on the date index."""
+    day = value.date() if isinstance(value, datetime) else value
+    return int(np.datetime64(day, "D").astype(np.int64))
+
+
+def iso_day(day: int) -> str:
+    """ISO date of an epoch day."""
+    return str(np.datetime64(day, "D"))
+
+
+def period_of(days, resolution: str) -> np.ndarray:
+    """Week (Monday-based) or month number of epoch days; days for ``"D"``."""
+    days = np.asarray(days, dtype=np.int64)
+    if resolution == "W":
+        return (days + 3) // 7
+    if resolution == "M":
+        return days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+    return days
+
+
+def period_start(period: int, resolution: str) -> int:
+    """First epoch day of a period number."""
+    if resolution == "W":
+        return period * 7 - 3
+    if resolution == "M":
+        return int(np.datetime64(period, "M").astype("datetime64[D]").astype(np.int64))
+    return period
+
+
+def period_rows(days: np.ndarray, resolution: str) -> np.ndarray:
+    """Rows of a daily axis kept at ``resolution``: the first row, which
+    anchors normalization, and the last row of every week or month."""
+    n = len(days)
+    if resolution == "D" or n < 2:
+        return np.arange(n)
+    periods = period_of(days.astype("datetime64[D]").astype(np.int64), resolution)
+    last = np.flatnonzero(periods[1:] != periods[:-1])
+    return np.unique(np.concatenate([[0], last, [n - 1]]))
+
+
+def period_closes(
+    days: np.ndarray, values: np.ndarray, resolution: str
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Period number, day and close of the last bar in every period that
+    has one, from ascending days and their (possibly NaN) closes."""
+    traded = ~np.isnan(values)
+    days, values = days[traded], values[traded]
+    periods = period_of(days, resolution)
+    last = np.flatnonzero(np.append(periods[1:] != periods[:-1], True))
+    if not len(days):
+        last = last[:0]
+    return periods[last], days[last], values[last]
+
+
+class MmapPriceStore:
+    """Append-only, memory-mapped close prices shared by every worker.
+
+    The store is a directory with one shared date index and one float64
+    file per ticker. Position ``i`` of every file is calendar day
+    ``first + i`` since the epoch, so any ticker's window is a slice of
+    its file and windows of different tickers line up without a join.
+    Reads are ``np.memmap`` views, so workers on one host share the same
+    page-cache pages instead of each holding their own copies.
+
+    A ticker file is a header of ``first``, ``length``, ``covered_from``
+    and ``covered_to`` (int64) followed by ``length`` floats (NaN where
+    there is no bar). Appends write the new floats past the committed end
+    before bumping ``length``, so a reader never maps uncommitted data.
+    Anything that is not a pure append (an earlier start, a revised bar)
+    writes a new file and ``os.replace``s it, so readers keep the old
+    consistent file until they map again.
+
+    Each ticker also has a weekly and a monthly file: a header of
+    ``first`` period and ``length`` followed by one ``(day, close)`` pair
+    per period for its last bar (NaN when it has none). Every append
+    recomputes them from the first period it touched onwards and swaps
+    them in atomically, so long horizons read a few hundred rows instead
+    of every day.
+    """
+
+    def __init__(self, path: str = STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._maps: dict[str, tuple[tuple[int, int], np.ndarray]] = {}
+
+    def _series_path(self, ticker: str, suffix: str = SERIES_SUFFIX) -> str:
+        return os.path.join(self.path, quote(ticker, safe="") + suffix)
+
+    @contextmanager
+    def _write_lock(self):
+        """Serialize writers across threads and worker processes."""
+        os.makedirs(self.path, exist_ok=True)
+        with self._lock, open(os.path.join(self.path, ".lock"), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _map(self, path: str, offset: int, count: int, dtype) -> np.ndarray:
+        """Read-only view of ``count`` items, reusing the map while the file
+        (inode) and committed length are unchanged."""
+        if count <= 0:
+            return np.empty(0, dtype=dtype)
+        with open(path, "rb") as f:
+            key = (os.fstat(f.fileno()).st_ino, count)
+            cached = self._maps.get(path)
+            if cached and cached[0] == key:
+                return cached[1]
+            view = np.memmap(f, dtype=dtype, mode="r", offset=offset, shape=(count,))
+        self._maps[path] = (key, view)
+        return view
+
+    def dates(self, stop: int) -> np.ndarray:
+        """The shared date index from the epoch up to (not including) ``stop``."""
+        path = os.path.join(self.path, "dates.d64")
+        size = os.path.getsize(path) // 8 if os.path.exists(path) else 0
+        if size < stop:
+            with self._write_lock():
+                size = os.path.getsize(path) // 8 if os.path.exists(path) else 0
+                if size < stop:
+                    size = stop + INDEX_GROWTH_DAYS
+                    self._replace(path, np.arange(size).astype("datetime64[D]"))
+        return self._map(path, 0, size, "datetime64[D]")[:stop]
+
+    def header(self, ticker: str) -> np.ndarray | None:
+        """``[first, length, covered_from, covered_to]`` or None if absent."""
+        try:
+            with open(self._series_path(ticker), "rb") as f:
+                header = np.frombuffer(f.read(HEADER_BYTES), dtype=np.int64)
+        except FileNotFoundError:
+            return None
+        return header if len(header) == HEADER else None
+
+    def series(self, ticker: str) -> tuple[int, np.ndarray] | None:
+        """``(first, values)`` for a ticker, ``values`` being a read-only view."""
+        path = self._series_path(ticker)
+        try:
+            with open(path, "rb") as f:
+                header = np.frombuffer(f.read(HEADER_BYTES), dtype=np.int64)
+                if len(header) < HEADER:
+                    return None
+                first, length = int(header[0]), int(header[1])
+                key = (os.fstat(f.fileno()).st_ino, length)
+                cached = self._maps.get(path)
+                if cached and cached[0] == key:
+                    return first, cached[1]
+                if length == 0:
+                    return first, np.empty(0)
+                view = np.memmap(
+                    f, dtype=np.float64, mode="r", offset=HEADER_BYTES, shape=(length,)
+                )
+        except FileNotFoundError:
+            return None
+        self._maps[path] = (key, view)
+        return first, view
+
+    def aggregate(self, ticker: str, resolution: str) -> tuple[int, np.ndarray] | None:
+        """``(first period, rows)`` of a ticker's weekly or monthly file,
+        ``rows`` being a read-only ``length x 2`` view of (day, close)."""
+        path = self._series_path(ticker, AGGREGATE_SUFFIXES[resolution])
+        try:
+            with open(path, "rb") as f:
+                header = np.frombuffer(f.read(AGGREGATE_HEADER_BYTES), dtype=np.int64)
+                if len(header) < AGGREGATE_HEADER:
+                    return None
+                first, length = int(header[0]), int(header[1])
+                key = (os.fstat(f.fileno()).st_ino, length)
+                cached = self._maps.get(path)
+                if cached and cached[0] == key:
+                    return first, cached[1]
+                if length == 0:
+                    return first, np.empty((0, 2))
+                view = np.memmap(
+                    f,
+                    dtype=np.float64,
+                    mode="r",
+                    offset=AGGREGATE_HEADER_BYTES,
+                    shape=(length, 2),
+                )
+        except FileNotFoundError:
+            return None
+        self._maps[path] = (key, view)
+        return first, view
+
+    def _build_aggregates(
+        self, ticker: str, resolution: str
+    ) -> tuple[int, np.ndarray] | None:
+        """Create the aggregate files of a series written before they existed."""
+        with self._write_lock():
+            found = self.series(ticker)
+            if found is None or not len(found[1]):
+                return None
+            first, values = found
+            self._update_aggregates(ticker, first, np.asarray(values), first)
+        return self.aggregate(ticker, resolution)
+
+    def columns(
+        self, tickers: list[str], start: int, stop: int
+    ) -> tuple[np.ndarray, list[np.ndarray]]:
+        """Date index and one column per ticker for days ``[start, stop)``.
+
+        A column is a zero-copy view when the ticker's file covers the whole
+        window, and a NaN-padded copy of the overlap otherwise.
+        """
+        dates = self.dates(stop)[start:stop]
+        columns = []
+        for ticker in tickers:
+            found = self.series(ticker)
+            if found is None:
+                columns.append(np.full(stop - start, np.nan))
+                continue
+            first, values = found
+            lo, hi = start - first, stop - first
+            if lo >= 0 and hi <= len(values):
+                columns.append(values[lo:hi])
+                continue
+            column = np.full(stop - start, np.nan)
+            src_lo, src_hi = max(lo, 0), min(hi, len(values))
+            if src_lo < src_hi:
+                column[src_lo - lo : src_hi - lo] = values[src_lo:src_hi]
+            columns.append(column)
+        return dates, columns
+
+    def resampled(
+        self, tickers: list[str], start: int, stop: int, resolution: str
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Epoch days and a closes matrix for days ``[start, stop)`` at a
+        weekly or monthly resolution.
+
+        Rows are the window's first trading day followed by the last
+        trading day of every period, each ticker holding its last close of
+        that period (NaN if it has none) -- the same rows ``period_rows``
+        keeps from the daily matrix. Whole periods come from the aggregate
+        files; the two partial periods at the edges of the window are read
+        from the daily files.
+        """
+        lo, hi = int(period_of(start, resolution)), int(period_of(stop - 1, resolution))
+        days = np.full((hi - lo + 1, len(tickers)), np.nan)
+        matrix = np.full((hi - lo + 1, len(tickers)), np.nan)
+        for j, ticker in enumerate(tickers):
+            found = self.aggregate(ticker, resolution)
+            if found is None:
+                found = self._build_aggregates(ticker, resolution)
+            if found is None:
+                continue
+            first, rows = found
+            src_lo, src_hi = max(lo + 1, first), min(hi, first + len(rows))
+            if src_lo < src_hi:
+                days[src_lo - lo : src_hi - lo, j] = rows[
+                    src_lo - first : src_hi - first, 0
+                ]
+                matrix[src_lo - lo : src_hi - lo, j] = rows[
+                    src_lo - first : src_hi - first, 1
+                ]
+        edges = {lo: (start, min(period_start(lo + 1, resolution), stop))}
+        edges[hi] = (max(period_start(hi, resolution), start), stop)
+        for period, (edge_start, edge_stop) in edges.items():
+            edge_days, columns = self.columns(tickers, edge_start, edge_stop)
+            block = np.column_stack(columns)
+            for j in range(len(tickers)):
+                rows = np.flatnonzero(~np.isnan(block[:, j]))
+                if len(rows):
+                    days[period - lo, j] = edge_days[rows[-1]].astype(np.int64)
+                    matrix[period - lo, j] = block[rows[-1], j]
+        labels = np.max(np.nan_to_num(days, nan=-1), axis=1).astype(np.int64)
+        traded = np.flatnonzero(labels >= 0)
+        if not len(traded):
+            return labels[:0], matrix[:0]
+        period = lo + int(traded[0])
+        edge_start = max(period_start(period, resolution), start)
+        edge_days, columns = self.columns(tickers, edge_start, int(labels[traded[0]]))
+        block = np.column_stack(columns)
+        first_row = np.flatnonzero(~np.isnan(block).all(axis=1))[:1]
+        labels, matrix = labels[traded], matrix[traded]
+        if len(first_row):
+            anchor = edge_days[first_row].astype(np.int64)
+            labels = np.concatenate([anchor, labels])
+            matrix = np.vstack([block[first_row], matrix])
+        return labels, matrix
+
+    def append(
+        self,
+        ticker: str,
+        days: np.ndarray,
+        values: np.ndarray,
+        covered_from: int,
+        covered_to: int,
+    ) -> None:
+        """Merge bars into a ticker's file; call with the write lock held."""
+        path = self._series_path(ticker)
+        header = self.header(ticker)
+        found = self.series(ticker) if header is not None else None
+        if found is None:
+            if not len(days):
+                return
+            first, old = int(days.min()), np.empty(0)
+        else:
+            first, old = found
+            covered_from = min(covered_from, int(header[2]))
+            covered_to = max(covered_to, int(header[3]))
+        lo, hi = first, first + len(old)
+        if len(days):
+            lo, hi = min(lo, int(days.min())), max(hi, int(days.max()) + 1)
+        merged = np.full(hi - lo, np.nan)
+        merged[first - lo : first - lo + len(old)] = old
+        merged[days - lo] = values
+        new_header = np.array([lo, len(merged), covered_from, covered_to], np.int64)
+        if (
+            found is not None
+            and lo == first
+            and np.array_equal(merged[: len(old)], old, equal_nan=True)
+        ):
+            with open(path, "r+b") as f:
+                f.seek(HEADER_BYTES + len(old) * 8)
+                f.write(merged[len(old) :].tobytes())
+                f.flush()
+                f.seek(0)
+                f.write(new_header.tobytes())
+        else:
+            self._replace(path, new_header, merged)
+        if len(days):
+            self._update_aggregates(ticker, lo, merged, int(days.min()))
+
+    def _update_aggregates(
+        self, ticker: str, first: int, values: np.ndarray, since: int
+    ) -> None:
+        """Rewrite the weekly and monthly files, keeping the rows of periods
+        before the one containing ``since`` and recomputing the rest from the
+        daily ``values`` (starting at day ``first``). Call with the write
+        lock held."""
+        days = np.arange(first, first + len(values))
+        for resolution, suffix in AGGREGATE_SUFFIXES.items():
+            lo = int(period_of(first, resolution))
+            hi = int(period_of(first + len(values) - 1, resolution))
+            rows = np.full((hi - lo + 1, 2), np.nan)
+            keep = 0
+            found = self.aggregate(ticker, resolution)
+            if found is not None and found[0] == lo:
+                keep = int(period_of(since, resolution)) - lo
+                keep = max(0, min(keep, len(found[1]), len(rows)))
+                rows[:keep] = found[1][:keep]
+            skip = max(0, period_start(lo + keep, resolution) - first)
+            periods, last_days, closes = period_closes(
+                days[skip:], values[skip:], resolution
+            )
+            rows[periods - lo, 0] = last_days
+            rows[periods - lo, 1] = closes
+            self._replace(
+                self._series_path(ticker, suffix),
+                np.array([lo, len(rows)], np.int64),
+                rows,
+            )
+
+    @staticmethod
+    def _replace(path: str, *parts: np.ndarray) -> None:
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            for part in parts:
+                f.write(part.tobytes())
+        os.replace(tmp, path)
+
+    def touch(self, tickers: list[str]) -> None:
+        """Mark tickers as recently read for age- and size-based eviction."""
+        for ticker in tickers:
+            try:
+                os.utime(self._series_path(ticker))
+            except FileNotFoundError:
+                pass
+
+    def evict(self, max_age_days: int, max_rows: int) -> None:
+        """Delete series not read within ``max_age_days``, then the least
+        recently read until the store holds at most ``max_rows`` floats.
+        Readers that still map a deleted file keep their view."""
+        if not os.path.isdir(self.path):
+            return
+        cutoff = time.time() - max_age_days * 86400
+        with self._write_lock():
+            entries = []
+            for name in os.listdir(self.path):
+                if not name.endswith(SERIES_SUFFIX):
+                    continue
+                path = os.path.join(self.path, name)
+                stat = os.stat(path)
+                if stat.st_mtime < cutoff:
+                    self._remove(path)
+                    continue
+                entries.append((stat.st_mtime, path, stat.st_size // 8 - HEADER))
+            total = sum(rows for _, _, rows in entries)
+            for _, path, rows in sorted(entries):
+                if total <= max_rows:
+                    break
+                self._remove(path)
+                total -= rows
+
+    def _remove(self, path: str) -> None:
+        """Delete a series file together with its aggregates."""
+        stem = path[: -len(SERIES_SUFFIX)]
+        for name in (path, *(stem + s for s in AGGREGATE_SUFFIXES.values())):
+            try:
+                os.remove(name)
+            except FileNotFoundError:
+                pass
+            self._maps.pop(name, None)
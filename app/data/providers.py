@@ -0,0 +1,117 @@
+import os
+import zlib
+from datetime import date, datetime
+from typing import Protocol
+
+import numpy as np
+import pandas as pd
+
+PRICE_PROVIDER = os.environ.get("PRICE_PROVIDER", "yfinance")
+
+
+class PriceProvider(Protocol):
+    """Source of daily adjusted close prices."""
+
+    name: str
+
+    def download(
+        self, tickers: list[str], start: datetime | date, end: datetime | date
+    ) -> pd.DataFrame:
+        """Return closes as a wide frame indexed by a naive ``Date`` index,
+        one column per ticker. ``end`` is exclusive, like ``yf.download``."""
+        ...
+
+
+class YFinanceProvider:
+    """Live prices from Yahoo Finance."""
+
+    name = "yfinance"
+
+    def download(
+        self, tickers: list[str], start: datetime | date, end: datetime | date
+    ) -> pd.DataFrame:
+        """Download adjusted close prices as a wide frame indexed by Date.
+
+        Single tickers go through ``Ticker.history``, which, unlike
+        ``yf.download``, keeps no module-level state and is safe to call
+        from several threads at once.
+        """
+        import yfinance as yf
+
+        if len(tickers) == 1:
+            history = yf.Ticker(tickers[0]).history(
+                start=start, end=end, auto_adjust=True
+            )
+            if history is None or history.empty:
+                return pd.DataFrame(columns=tickers)
+            close_data = history[["Close"]].rename(columns={"Close": tickers[0]})
+            close_data.index = pd.DatetimeIndex(close_data.index).tz_localize(None)
+            close_data.index.name = "Date"
+            return close_data
+        df = yf.download(
+            tickers=tickers,
+            start=start,
+            end=end,
+            auto_adjust=True,
+            progress=False,
+        )
+        if df is None or df.empty:
+            return pd.DataFrame(columns=tickers)
+        close_data = df["Close"] if "Close" in df else df
+        if isinstance(close_data, pd.Series):
+            close_data = close_data.to_frame(name=tickers[0])
+        close_data.index = pd.DatetimeIndex(close_data.index).tz_localize(None)
+        close_data.index.name = "Date"
+        return close_data
+
+
+class SyntheticProvider:
+    """Deterministic offline random-walk prices for tests and benchmarks.
+
+    Each ticker's path is seeded from its symbol and anchored at a fixed
+    epoch, so any window of the same ticker returns the same values no
+    matter how it was requested. Tickers starting with ``INVALID`` return
+    no data, to exercise failure handling.
+    """
+
+    name = "synthetic"
+    epoch = pd.Timestamp("1990-01-01")
+
+    def __init__(self, daily_vol: float = 0.02, drift: float = 0.0003):
+        self.daily_vol = daily_vol
+        self.drift = drift
+
+    def _path(self, ticker: str, days: pd.DatetimeIndex) -> np.ndarray:
+        rng = np.random.default_rng(zlib.crc32(ticker.encode()))
+        offsets = np.asarray((days - self.epoch).days, dtype=np.int64)
+        n = int(offsets.max()) + 1 if len(offsets) else 0
+        # Drawn before the steps: their count depends on the window end, and
+        # anything drawn after them would too.
+        start_price = 20 + rng.random() * 480
+        steps = rng.normal(self.drift, self.daily_vol, n)
+        return start_price * np.exp(np.cumsum(steps)[offsets])
+
+    def download(
+        self, tickers: list[str], start: datetime | date, end: datetime | date
+    ) -> pd.DataFrame:
+        start_ts = max(pd.Timestamp(start).normalize(), self.epoch)
+        end_ts = pd.Timestamp(end)
+        days = pd.bdate_range(start_ts, end_ts, inclusive="left", name="Date")
+        days = days[days < end_ts]
+        columns = {
+            ticker: self._path(ticker, days)
+            for ticker in tickers
+            if not ticker.startswith("INVALID")
+        }
+        if not columns or days.empty:
+            return pd.DataFrame(columns=tickers)
+        return pd.DataFrame(columns, index=days)
+
+
+def get_provider(name: str = PRICE_PROVIDER) -> PriceProvider:
+    """Return the provider selected by name (``PRICE_PROVIDER``)."""
+    if name == "synthetic":
+        return SyntheticProvider()
+    if name == "yfinance":
+        return YFinanceProvider()
+    raise ValueError(f"Unknown price provider: {name}")
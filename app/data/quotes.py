@@ -0,0 +1,201 @@
+import asyncio
+import csv
+import os
+import time
+import zlib
+from contextlib import aclosing, suppress
+from datetime import datetime
+from typing import AsyncIterator, Protocol
+
+import numpy as np
+
+from app.data.providers import PRICE_PROVIDER
+
+QUOTE_STREAM = os.environ.get(
+    "QUOTE_STREAM", "simulated" if PRICE_PROVIDER == "synthetic" else "yfinance"
+)
+QUOTE_REPLAY_PATH = os.environ.get("QUOTE_REPLAY_PATH", "quotes.csv")
+QUOTE_REPLAY_SPEED = float(os.environ.get("QUOTE_REPLAY_SPEED", "1"))
+QUOTE_SIM_RATE = float(os.environ.get("QUOTE_SIM_RATE", "4"))
+QUOTE_SIM_VOL = float(os.environ.get("QUOTE_SIM_VOL", "0.0005"))
+
+Quote = tuple[str, float, float]
+
+
+class QuoteStream(Protocol):
+    """Source of intraday last-trade prices as ``(ticker, price, unix time)``."""
+
+    name: str
+
+    def subscribe(
+        self, tickers: list[str], reference: dict[str, float]
+    ) -> AsyncIterator[Quote]:
+        """Yield quotes for ``tickers`` until closed. ``reference`` holds each
+        ticker's last known close for streams that make prices up."""
+        ...
+
+
+class YFinanceQuoteStream:
+    """Live quotes from the Yahoo Finance streaming websocket."""
+
+    name = "yfinance"
+
+    async def subscribe(
+        self, tickers: list[str], reference: dict[str, float]
+    ) -> AsyncIterator[Quote]:
+        import yfinance as yf
+
+        queue: asyncio.Queue[Quote] = asyncio.Queue()
+        wanted = set(tickers)
+
+        def on_message(message: dict) -> None:
+            if message.get("id") in wanted and message.get("price"):
+                at = float(message.get("time") or time.time() * 1000) / 1000
+                queue.put_nowait((message["id"], float(message["price"]), at))
+
+        socket = yf.AsyncWebSocket(verbose=False)
+        await socket.subscribe(tickers)
+        listener = asyncio.create_task(socket.listen(on_message))
+        try:
+            while True:
+                getter = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait(
+                    {getter, listener}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if getter not in done:
+                    getter.cancel()
+                    listener.result()
+                    return
+                yield getter.result()
+        finally:
+            listener.cancel()
+            with suppress(asyncio.CancelledError, Exception):
+                await listener
+            await socket.close()
+
+
+class SimulatedQuoteStream:
+    """Deterministic random-walk quotes around each ticker's last close.
+
+    Every ticker ticks ``rate`` times a second on average, so the live view
+    and its throttling can be exercised offline at any universe size.
+    """
+
+    name = "simulated"
+
+    def __init__(
+        self,
+        rate: float = QUOTE_SIM_RATE,
+        volatility: float = QUOTE_SIM_VOL,
+        interval: float = 0.05,
+    ):
+        self.rate = rate
+        self.volatility = volatility
+        self.interval = interval
+
+    async def subscribe(
+        self, tickers: list[str], reference: dict[str, float]
+    ) -> AsyncIterator[Quote]:
+        tickers = [t for t in tickers if t in reference]
+        if not tickers:
+            return
+        rng = np.random.default_rng(zlib.crc32(",".join(tickers).encode()))
+        prices = np.array([reference[t] for t in tickers], dtype=float)
+        while True:
+            await asyncio.sleep(self.interval)
+            count = rng.poisson(self.rate * len(tickers) * self.interval)
+            picks = rng.integers(0, len(tickers), count)
+            steps = rng.normal(0.0, self.volatility, count)
+            now = time.time()
+            for j, step in zip(picks.tolist(), steps.tolist()):
+                prices[j] *= np.exp(step)
+                yield tickers[j], float(prices[j]), now
+
+
+class ReplayQuoteStream:
+    """Replay recorded quotes from a ``time,ticker,price`` CSV.
+
+    ``time`` is a Unix timestamp or ISO datetime. Gaps between quotes are
+    kept (divided by ``speed``) and quotes are re-stamped with the current
+    time, so a recorded session plays back as today's bar.
+    """
+
+    name = "replay"
+
+    def __init__(
+        self, path: str = QUOTE_REPLAY_PATH, speed: float = QUOTE_REPLAY_SPEED
+    ):
+        self.path = path
+        self.speed = speed
+
+    def _read(self, tickers: set[str]) -> list[Quote]:
+        quotes = []
+        with open(self.path, newline="") as f:
+            for row in csv.DictReader(f):
+                ticker = row["ticker"].strip().upper()
+                if ticker not in tickers:
+                    continue
+                try:
+                    at = float(row["time"])
+                except ValueError:
+                    at = datetime.fromisoformat(row["time"]).timestamp()
+                quotes.append((ticker, float(row["price"]), at))
+        return sorted(quotes, key=lambda quote: quote[2])
+
+    async def subscribe(
+        self, tickers: list[str], reference: dict[str, float]
+    ) -> AsyncIterator[Quote]:
+        quotes = await asyncio.to_thread(self._read, set(tickers))
+        if not quotes:
+            return
+        started, first = time.monotonic(), quotes[0][2]
+        for ticker, price, at in quotes:
+            delay = (at - first) / self.speed - (time.monotonic() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield ticker, price, time.time()
+
+
+def get_quote_stream(name: str = QUOTE_STREAM) -> QuoteStream:
+    """Return the quote stream selected by name (``QUOTE_STREAM``)."""
+    if name == "yfinance":
+        return YFinanceQuoteStream()
+    if name == "simulated":
+        return SimulatedQuoteStream()
+    if name == "replay":
+        return ReplayQuoteStream()
+    raise ValueError(f"Unknown quote stream: {name}")
+
+
+async def coalesce_quotes(
+    quotes: AsyncIterator[Quote], interval: float
+) -> AsyncIterator[dict[str, tuple[float, float]]]:
+    """Batch a quote stream into the latest ``(price, time)`` per ticker,
+    once per ``interval`` (an empty batch when nothing ticked).
+
+    A ticker that ticks many times between batches costs one entry, so the
+    consumer's work and pushes are bounded by the interval rather than the
+    tick rate, and a quiet stream still wakes the consumer up regularly.
+    """
+    pending: dict[str, tuple[float, float]] = {}
+
+    async def pump() -> None:
+        async with aclosing(quotes) as stream:
+            async for ticker, price, at in stream:
+                pending[ticker] = (price, at)
+
+    task = asyncio.create_task(pump())
+    try:
+        while True:
+            await asyncio.wait({task}, timeout=interval)
+            batch = dict(pending)
+            pending.clear()
+            if batch or not task.done():
+                yield batch
+            if task.done():
+                task.result()
+                return
+    finally:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
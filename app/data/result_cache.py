@@ -0,0 +1,142 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+RESULT_CACHE_MAX_ENTRIES = int(os.environ.get("RESULT_CACHE_MAX_ENTRIES", "64"))
+RESULT_CACHE_TTL_SECONDS = float(os.environ.get("RESULT_CACHE_TTL_SECONDS", "900"))
+RESULT_CACHE_MAX_PINNED = int(os.environ.get("RESULT_CACHE_MAX_PINNED", "256"))
+
+
+class ResultCache:
+    """Process-wide TTL + LRU cache with single-flight computation.
+
+    Concurrent callers asking for the same key while it is being computed
+    await the one in-flight task instead of starting their own. Failures are
+    propagated to every waiter and never cached. ``hits`` and ``misses``
+    count every lookup; ``coalesced`` counts the misses that joined an
+    in-flight computation instead of starting one.
+
+    Pinned entries, such as pre-warmed results, are kept apart with their
+    own ``max_pinned`` capacity, so ordinary traffic never evicts them;
+    they still expire with their TTL.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = RESULT_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = RESULT_CACHE_TTL_SECONDS,
+        max_pinned: int = RESULT_CACHE_MAX_PINNED,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_pinned = max_pinned
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._pinned: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self._waiters: dict[Hashable, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return a fresh cached value, or None."""
+        for entries in (self._pinned, self._entries):
+            entry = entries.get(key)
+            if entry is None:
+                continue
+            if entry[0] < time.monotonic():
+                del entries[key]
+                self.evictions += 1
+                continue
+            self.hits += 1
+            entries.move_to_end(key)
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def put(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl_seconds: float | None = None,
+        pinned: bool = False,
+    ) -> None:
+        """Store a value, optionally with a longer or shorter TTL than usual,
+        and ``pinned`` to keep it out of reach of ordinary traffic."""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        entries, limit = (
+            (self._pinned, self.max_pinned)
+            if pinned
+            else (self._entries, self.max_entries)
+        )
+        (self._entries if pinned else self._pinned).pop(key, None)
+        entries[key] = (time.monotonic() + ttl, value)
+        entries.move_to_end(key)
+        while len(entries) > limit:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]],
+        keep: Callable[[Any], bool] | None = None,
+    ) -> Any:
+        """Return the cached value for key, computing it at most once.
+
+        The computation runs as its own task, so a caller that is cancelled
+        while waiting does not cancel it for the other waiters. When the last
+        waiter is cancelled nobody needs the result, and it is cancelled too.
+        A result for which ``keep`` returns False is handed to the waiters
+        but not cached.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(compute())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done, keep))
+        else:
+            self.coalesced += 1
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[key] == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+
+    def _finish(
+        self,
+        key: Hashable,
+        task: asyncio.Future,
+        keep: Callable[[Any], bool] | None = None,
+    ) -> None:
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        if keep is None or keep(task.result()):
+            self.put(key, task.result())
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "pinned": len(self._pinned),
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+        }
+
+
+analysis_cache = ResultCache()
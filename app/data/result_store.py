@@ -0,0 +1,189 @@
+import hashlib
+import json
+import os
+import pickle
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import suppress
+from typing import Any, Callable, Hashable
+
+import numpy as np
+import pandas as pd
+
+RESULT_STORE_PATH = os.environ.get("RESULT_STORE_PATH", "")
+RESULT_STORE_MAX_ENTRIES = int(os.environ.get("RESULT_STORE_MAX_ENTRIES", "64"))
+RESULT_STORE_MAX_BYTES = int(os.environ.get("RESULT_STORE_MAX_BYTES", str(2 << 30)))
+RESULT_STORE_MAX_MEMORY_BYTES = int(
+    os.environ.get("RESULT_STORE_MAX_MEMORY_BYTES", str(1 << 30))
+)
+RESULT_STORE_MAX_VIEWS = 32
+
+
+def content_key(*parts: Any) -> str:
+    """Hex digest of JSON-serializable parts, used as a store address."""
+    encoded = json.dumps(parts, separators=(",", ":"), default=str).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def nbytes(value: Any, seen: set[int] | None = None) -> int:
+    """Approximate memory held by a result: its arrays and frames, counting
+    arrays shared between keys once."""
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(np.sum(value.memory_usage(index=True)))
+    if isinstance(value, dict):
+        return sum(nbytes(v, seen) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(nbytes(v, seen) for v in value)
+    return sys.getsizeof(value)
+
+
+class ResultStore:
+    """Content-addressed store of computed results shared by every session.
+
+    Sessions hold a key instead of the result, so any number of them looking
+    at the same data share one copy. Entries live in an in-memory LRU bounded
+    by ``max_entries`` and ``max_memory_bytes``; with a ``path`` they are also
+    written there once, so other workers and restarted processes resolve the
+    same keys, and the directory is trimmed oldest first to ``max_bytes``.
+    Views derived from an entry are memoized next to it and dropped with it.
+    ``get`` returns None once a key is gone, and callers must rebuild it.
+    """
+
+    def __init__(
+        self,
+        path: str = RESULT_STORE_PATH,
+        max_entries: int = RESULT_STORE_MAX_ENTRIES,
+        max_bytes: int = RESULT_STORE_MAX_BYTES,
+        max_memory_bytes: int = RESULT_STORE_MAX_MEMORY_BYTES,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_memory_bytes = max_memory_bytes
+        self.memory_bytes = 0
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+        self._sizes: dict[str, int] = {}
+        self._views: dict[str, OrderedDict[Hashable, Any]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.evictions = 0
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], f"{key}.pkl")
+
+    def _remember(self, key: str, value: Any) -> None:
+        """Keep ``value`` in memory, evicting the least recently used entries
+        beyond the limits. The newest entry is kept even if it alone is over
+        ``max_memory_bytes``."""
+        size = nbytes(value)
+        with self._lock:
+            self.memory_bytes += size - self._sizes.get(key, 0)
+            self._entries[key] = value
+            self._sizes[key] = size
+            self._entries.move_to_end(key)
+            while len(self._entries) > 1 and (
+                len(self._entries) > self.max_entries
+                or self.memory_bytes > self.max_memory_bytes
+            ):
+                evicted, _ = self._entries.popitem(last=False)
+                self.memory_bytes -= self._sizes.pop(evicted)
+                self._views.pop(evicted, None)
+                self.evictions += 1
+
+    def get(self, key: str) -> Any | None:
+        """Return the entry stored at ``key``, loading it from disk if needed."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+        if not self.path:
+            self.misses += 1
+            return None
+        path = self._file(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            self.misses += 1
+            return None
+        with suppress(FileNotFoundError):
+            os.utime(path)
+        self.loads += 1
+        self._remember(key, value)
+        return value
+
+    def put(self, key: str, value: Any) -> str:
+        """Store ``value`` at ``key`` and return the key."""
+        self._remember(key, value)
+        if self.path and not os.path.exists(self._file(key)):
+            directory = os.path.dirname(self._file(key))
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._file(key))
+            self._trim()
+        return key
+
+    def view(self, key: str, name: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return a view of the entry at ``key``, computing it once per process.
+
+        Every session asking for the same ``name`` gets the same object, so
+        large frontend payloads are not held once per session either.
+        """
+        with self._lock:
+            views = self._views.get(key)
+            if views is not None and name in views:
+                views.move_to_end(name)
+                return views[name]
+        value = compute()
+        with self._lock:
+            if key in self._entries:
+                views = self._views.setdefault(key, OrderedDict())
+                views[name] = value
+                while len(views) > RESULT_STORE_MAX_VIEWS:
+                    views.popitem(last=False)
+        return value
+
+    def _trim(self) -> None:
+        """Delete the least recently used files beyond ``max_bytes``."""
+        files = []
+        for root, _, names in os.walk(self.path):
+            for name in names:
+                if not name.endswith(".pkl"):
+                    continue
+                path = os.path.join(root, name)
+                with suppress(FileNotFoundError):
+                    stat = os.stat(path)
+                    files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            with suppress(FileNotFoundError):
+                os.remove(path)
+            total -= size
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.memory_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "loads": self.loads,
+            "evictions": self.evictions,
+        }
+
+
+result_store = ResultStore()
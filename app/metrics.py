@@ -0,0 +1,233 @@
+import bisect
+import json
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+METRICS_PATH = os.environ.get("METRICS_PATH", "/metrics")
+METRICS_STATE_SAMPLE_RATE = float(os.environ.get("METRICS_STATE_SAMPLE_RATE", "1.0"))
+
+SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+BYTES_BUCKETS = tuple(1024 * 4**k for k in range(10))
+UNIVERSE_BUCKETS = (5, 10, 20, 50, 100, 200, 500)
+
+logger = logging.getLogger("app.metrics")
+
+
+def universe_label(n_tickers: int) -> str:
+    """Bucket a universe size so label cardinality stays bounded."""
+    for bound in UNIVERSE_BUCKETS:
+        if n_tickers <= bound:
+            return f"le{bound}"
+    return f"gt{UNIVERSE_BUCKETS[-1]}"
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    body = ",".join(
+        '{}="{}"'.format(k, str(v).replace("\\", r"\\").replace('"', r"\""))
+        for k, v in labels.items()
+    )
+    return "{" + body + "}"
+
+
+class Histogram:
+    """Thread-safe cumulative histogram in the Prometheus data model."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: tuple[float, ...],
+        labelnames: tuple[str, ...] = (),
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        self.labelnames = labelnames
+        self._series: dict[tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0, 0.0]
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += 1
+            series[2] += value
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            snapshot = {k: (list(c), n, s) for k, (c, n, s) in self._series.items()}
+        for key, (counts, count, total) in sorted(snapshot.items()):
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = _format_labels({**labels, "le": f"{bound:g}"})
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            le = _format_labels({**labels, "le": "+Inf"})
+            lines.append(f"{self.name}_bucket{le} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {total:.6g}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+stage_seconds = Histogram(
+    "stock_stage_seconds",
+    "Wall time of one analytics stage.",
+    SECONDS_BUCKETS,
+    ("stage", "horizon", "universe"),
+)
+stage_rows = Histogram(
+    "stock_stage_rows",
+    "Rows (trading days) processed by one analytics stage.",
+    tuple(4**k for k in range(1, 8)),
+    ("stage", "horizon", "universe"),
+)
+state_update_bytes = Histogram(
+    "stock_state_update_bytes",
+    "Serialized size of one state delta pushed to the browser.",
+    BYTES_BUCKETS,
+)
+state_var_bytes = Histogram(
+    "stock_state_var_bytes",
+    "Serialized size of one var inside a state delta.",
+    BYTES_BUCKETS,
+    ("var",),
+)
+
+
+def log_event(event: str, **fields) -> None:
+    """Write one structured (JSON) log line on the ``app.metrics`` logger."""
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps({"event": event, **fields}, default=str))
+
+
+def record_stage(
+    name: str, seconds: float, horizon: str = "", tickers: int = 0, **fields
+) -> None:
+    """Record one stage timing as a histogram sample and a log line."""
+    labels = {"stage": name, "horizon": horizon, "universe": universe_label(tickers)}
+    stage_seconds.observe(seconds, **labels)
+    if "rows" in fields:
+        stage_rows.observe(fields["rows"], **labels)
+    log_event(
+        "stage",
+        stage=name,
+        horizon=horizon,
+        tickers=tickers,
+        duration_ms=round(seconds * 1000, 3),
+        **fields,
+    )
+
+
+@contextmanager
+def stage(name: str, horizon: str = "", tickers: int = 0) -> Iterator[dict]:
+    """Time the enclosed block with ``record_stage``.
+
+    The yielded dict takes extra log fields; a ``rows`` entry is also
+    recorded in the rows histogram.
+    """
+    fields: dict = {}
+    started = time.perf_counter()
+    try:
+        yield fields
+    finally:
+        record_stage(name, time.perf_counter() - started, horizon, tickers, **fields)
+
+
+def observe_delta(delta: dict) -> None:
+    """Record the serialized size of every var in a state delta."""
+    from reflex.utils.format import json_dumps
+
+    total = 0
+    sizes = {}
+    for substate, values in delta.items():
+        for var, value in values.items():
+            size = len(json_dumps(value))
+            name = var.rsplit("_rx_state_", 1)[0]
+            state_var_bytes.observe(size, var=name)
+            sizes[name] = size
+            total += size
+    state_update_bytes.observe(total)
+    log_event("state_update", bytes=total, vars=sizes)
+
+
+def instrument_event_namespace(namespace) -> None:
+    """Measure every delta the Reflex event namespace emits to a client.
+
+    ``METRICS_STATE_SAMPLE_RATE`` bounds the cost, since measuring means
+    serializing each var a second time.
+    """
+    if getattr(namespace, "_metrics_instrumented", False):
+        return
+    emit_update = namespace.emit_update
+
+    async def measured_emit_update(update, token):
+        if update.delta and random.random() < METRICS_STATE_SAMPLE_RATE:
+            try:
+                observe_delta(update.delta)
+            except Exception:
+                logger.exception("Failed to measure state update")
+        return await emit_update(update, token)
+
+    namespace.emit_update = measured_emit_update
+    namespace._metrics_instrumented = True
+
+
+async def instrument_state_updates(rx_app):
+    """Lifespan task that hooks delta measurement into the running app."""
+    if rx_app.event_namespace is not None:
+        instrument_event_namespace(rx_app.event_namespace)
+
+
+def render_metrics() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    from app.data.result_cache import analysis_cache
+    from app.data.result_store import result_store
+    from app.workers import analysis_runs, loop_lag
+
+    lines = []
+    for histogram in (stage_seconds, stage_rows, state_update_bytes, state_var_bytes):
+        lines.extend(histogram.render())
+    lag = loop_lag.stats()
+    lines.append("# HELP stock_loop_lag_ms Event loop lag over the recent window.")
+    lines.append("# TYPE stock_loop_lag_ms gauge")
+    for stat in ("mean_ms", "p99_ms", "max_ms"):
+        stat_label = _format_labels({"stat": stat[:-3]})
+        lines.append(f"stock_loop_lag_ms{stat_label} {lag[stat]:.3f}")
+    cache = analysis_cache.stats()
+    for counter in ("hits", "misses", "coalesced", "evictions"):
+        name = f"stock_result_cache_{counter}_total"
+        lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name} {cache[counter]}")
+    lines.append("# TYPE stock_result_cache_pinned gauge")
+    lines.append(f"stock_result_cache_pinned {cache['pinned']}")
+    store = result_store.stats()
+    lines.append("# TYPE stock_result_store_entries gauge")
+    lines.append(f"stock_result_store_entries {store['entries']}")
+    lines.append("# TYPE stock_result_store_bytes gauge")
+    lines.append(f"stock_result_store_bytes {store['bytes']}")
+    for counter in ("hits", "misses", "loads", "evictions"):
+        name = f"stock_result_store_{counter}_total"
+        lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name} {store[counter]}")
+    for counter in ("started", "cancelled"):
+        name = f"stock_analysis_runs_{counter}_total"
+        lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name} {getattr(analysis_runs, counter)}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,233 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+from app.analytics.pipeline import (
+    PREFETCH_HORIZON,
+    analysis_key,
+    run_analysis,
+    widest_horizon,
+)
+from app.data.result_cache import RESULT_CACHE_TTL_SECONDS, analysis_cache
+from app.workers import run_in_pool
+
+WATCHLISTS_PATH = os.environ.get("WATCHLISTS_PATH", "watchlists.json")
+PREWARM_TIMES = os.environ.get("PREWARM_TIMES", "07:30,16:30")
+PREWARM_INTERVAL_SECONDS = float(os.environ.get("PREWARM_INTERVAL_SECONDS", "0"))
+PREWARM_JITTER_SECONDS = float(os.environ.get("PREWARM_JITTER_SECONDS", "120"))
+PREWARM_CONCURRENCY = int(os.environ.get("PREWARM_CONCURRENCY", "2"))
+PREWARM_POINT_BUDGETS = [
+    int(b) for b in os.environ.get("PREWARM_POINT_BUDGETS", "800,1024").split(",")
+]
+PREWARM_RESULT_TTL_SECONDS = float(
+    os.environ.get("PREWARM_RESULT_TTL_SECONDS", str(24 * 3600))
+)
+MARKET_HOURS = os.environ.get("MARKET_HOURS", "09:30-16:00")
+
+
+def parse_times(spec: str) -> list[tuple[int, int]]:
+    """Parse a comma-separated list of local ``HH:MM`` times."""
+    times = []
+    for part in spec.split(","):
+        if part.strip():
+            hour, minute = part.strip().split(":")
+            times.append((int(hour), int(minute)))
+    return times
+
+
+def seconds_until_next_run(
+    now: datetime,
+    times: list[tuple[int, int]],
+    interval: float = 0.0,
+) -> float:
+    """Delay before the next scheduled refresh.
+
+    A positive ``interval`` wins; otherwise the next of the daily local
+    ``times`` is used, e.g. shortly after the close and before the open.
+    """
+    if interval > 0:
+        return interval
+    if not times:
+        return float("inf")
+    upcoming = []
+    for hour, minute in times:
+        run_at = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if run_at <= now:
+            run_at += timedelta(days=1)
+        upcoming.append(run_at)
+    return (min(upcoming) - now).total_seconds()
+
+
+def prewarm_ttl(
+    now: datetime,
+    times: list[tuple[int, int]],
+    interval: float = 0.0,
+    market_hours: str = MARKET_HOURS,
+) -> float:
+    """How long a result warmed at ``now`` may be served.
+
+    Never past the next scheduled refresh. A pre-open warm expires at the
+    open, and one made during trading hours keeps the usual result-cache
+    TTL, so sessions pick up today's bar like any other request would.
+    """
+    ttl = min(PREWARM_RESULT_TTL_SECONDS, seconds_until_next_run(now, times, interval))
+    if now.weekday() >= 5:
+        return ttl
+    (open_h, open_m), (close_h, close_m) = parse_times(market_hours.replace("-", ","))
+    market_open = now.replace(hour=open_h, minute=open_m, second=0, microsecond=0)
+    market_close = now.replace(hour=close_h, minute=close_m, second=0, microsecond=0)
+    if now < market_open:
+        return min(ttl, (market_open - now).total_seconds())
+    if now < market_close:
+        return min(ttl, RESULT_CACHE_TTL_SECONDS)
+    return ttl
+
+
+class PrewarmScheduler:
+    """Refresh named watchlists in the background so their first request of
+    the day is a result-cache hit.
+
+    Each refresh tops up the price cache and computes the analysis for
+    every horizon and point budget under the same key ``fetch_data`` looks
+    up, pinned so interactive traffic does not evict it first. Watchlists start after a random jitter and at most ``concurrency``
+    refresh at once, so the provider never sees one synchronized burst.
+    """
+
+    def __init__(
+        self,
+        times: list[tuple[int, int]] | None = None,
+        interval: float = PREWARM_INTERVAL_SECONDS,
+        jitter: float = PREWARM_JITTER_SECONDS,
+        concurrency: int = PREWARM_CONCURRENCY,
+        point_budgets: list[int] | None = None,
+    ):
+        self.times = parse_times(PREWARM_TIMES) if times is None else times
+        self.interval = interval
+        self.jitter = jitter
+        self.concurrency = concurrency
+        self.point_budgets = point_budgets or PREWARM_POINT_BUDGETS
+        self.watchlists: dict[str, dict] = {}
+        self.status: dict[str, dict] = {}
+        self.next_run: datetime | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+    def register(self, name: str, tickers: list[str], horizons: list[str]) -> None:
+        """Add or replace a watchlist."""
+        self.watchlists[name] = {
+            "tickers": sorted({t.strip().upper() for t in tickers if t.strip()}),
+            "horizons": list(horizons) or ["1Y"],
+        }
+        self.status.setdefault(name, {"state": "pending"})
+
+    def load(self, path: str = WATCHLISTS_PATH) -> None:
+        """Register every watchlist in a JSON file of the form
+        ``{"name": {"tickers": [...], "horizons": [...]}}``, if it exists."""
+        if not os.path.exists(path):
+            return
+        with open(path) as f:
+            for name, spec in json.load(f).items():
+                self.register(name, spec["tickers"], spec.get("horizons", ["1Y"]))
+        warm = self.warm_set_size()
+        if warm > analysis_cache.max_pinned:
+            logging.warning(
+                f"Pre-warming {warm} results but RESULT_CACHE_MAX_PINNED is "
+                f"{analysis_cache.max_pinned}; some will be evicted before use."
+            )
+
+    def warm_set_size(self) -> int:
+        """Number of results one refresh of every watchlist caches."""
+        horizons = sum(len(w["horizons"]) for w in self.watchlists.values())
+        return horizons * len(self.point_budgets)
+
+    async def refresh(self, name: str) -> None:
+        """Refresh one watchlist now, recording the outcome in ``status``."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        watchlist = self.watchlists[name]
+        status = self.status.setdefault(name, {})
+        async with self._semaphore:
+            status.update(state="running", started=datetime.now().isoformat())
+            started = time.perf_counter()
+            try:
+                end_date = datetime.now()
+                as_of = end_date.date().isoformat()
+                tickers = watchlist["tickers"]
+                for horizon in watchlist["horizons"]:
+                    fetch_horizon = widest_horizon(horizon, PREFETCH_HORIZON)
+                    for budget in self.point_budgets:
+                        result = await run_in_pool(
+                            run_analysis,
+                            tickers,
+                            horizon,
+                            budget,
+                            end_date,
+                            fetch_horizon,
+                        )
+                        analysis_cache.put(
+                            analysis_key(tickers, horizon, as_of, budget),
+                            result,
+                            prewarm_ttl(datetime.now(), self.times, self.interval),
+                            pinned=True,
+                        )
+            except Exception as e:
+                logging.exception(f"Error pre-warming watchlist {name}: {e}")
+                status.update(state="failed", error=str(e))
+            else:
+                status.update(
+                    state="ok", error="", refreshed=datetime.now().isoformat()
+                )
+            finally:
+                status["duration_s"] = round(time.perf_counter() - started, 2)
+
+    async def _refresh_with_jitter(self, name: str) -> None:
+        await asyncio.sleep(random.uniform(0, self.jitter))
+        await self.refresh(name)
+
+    async def refresh_all(self) -> None:
+        await asyncio.gather(
+            *(self._refresh_with_jitter(name) for name in list(self.watchlists))
+        )
+
+    async def run(self) -> None:
+        """Warm every watchlist at startup, then on the configured schedule."""
+        while True:
+            if self.watchlists:
+                await self.refresh_all()
+            delay = seconds_until_next_run(datetime.now(), self.times, self.interval)
+            if delay == float("inf"):
+                return
+            self.next_run = datetime.now() + timedelta(seconds=delay)
+            await asyncio.sleep(delay)
+
+    def status_rows(self) -> list[dict[str, str]]:
+        """One display row per watchlist for the status page."""
+        next_run = self.next_run.strftime("%Y-%m-%d %H:%M") if self.next_run else ""
+        rows = []
+        for name, watchlist in self.watchlists.items():
+            status = self.status.get(name, {})
+            rows.append(
+                {
+                    "name": name,
+                    "tickers": str(len(watchlist["tickers"])),
+                    "horizons": ", ".join(watchlist["horizons"]),
+                    "state": status.get("state", "pending"),
+                    "refreshed": status.get("refreshed", "")[:16].replace("T", " "),
+                    "duration": str(status.get("duration_s", "")),
+                    "error": status.get("error", ""),
+                    "next_run": next_run,
+                }
+            )
+        return rows
+
+
+prewarm_scheduler = PrewarmScheduler()
+
+
+async def run_prewarm_scheduler():
+    """Lifespan task that loads ``WATCHLISTS_PATH`` and keeps it warm."""
+    prewarm_scheduler.load()
+    await prewarm_scheduler.run()
@@ -1,9 +1,65 @@
 import reflex as rx
-import yfinance as yf
 import pandas as pd
 import asyncio
-from datetime import datetime, timedelta
+import json
+import time
+from contextlib import aclosing
+from datetime import datetime
 from typing import Optional
+from urllib.parse import urlencode
+from reflex.config import get_config
+from app.analytics.downsample import DEFAULT_POINT_BUDGET, point_budget_for_width
+from app.analytics.live import (
+    LIVE_PUSH_INTERVAL,
+    LiveBook,
+    chart_bar,
+    overlay,
+    panel_bars,
+)
+from app.analytics.pipeline import (
+    PREFETCH_HORIZON,
+    analysis_key,
+    analyze_window,
+    covers_horizon,
+    horizon_window,
+    result_key,
+    run_analysis,
+    widest_horizon,
+)
+from app.analytics.records import epoch_days
+from app.analytics.views import (
+    chart_series,
+    correlation_view,
+    panel_summaries,
+    panel_views,
+    risk_highlights,
+    risk_rows,
+    table_orders,
+    table_page,
+)
+from app.data.fetcher import (
+    FETCH_MODE,
+    FETCH_TIMEOUT_SECONDS,
+    fetch_ticker_closes,
+    read_closes,
+    stream_closes,
+)
+from app.data.quotes import coalesce_quotes, get_quote_stream
+from app.data.result_cache import analysis_cache
+from app.data.result_store import result_store
+from app.metrics import record_stage, stage
+from app.workers import analysis_runs, run_in_pool
+
+STREAM_PUSH_INTERVAL = 0.25
+PANEL_WINDOW = 6
+
+
+async def publish_analysis(result: dict, horizon: str) -> str:
+    """Put an analysis in the shared result store and return its key,
+    hashing its close matrix off the event loop."""
+    return await asyncio.to_thread(
+        lambda: result_store.put(result_key(result, horizon), result)
+    )
 
 
 class StockState(rx.State):
@@ -20,18 +76,10 @@ class StockState(rx.State):
         "META",
     ]
     time_horizon: str = "1Y"
-    stock_data: list[dict[str, str | float | None]] = []
-    normalized_data: list[dict[str, str | float | None]] = []
-    relative_strength_panels: list[
-        dict[str, str | float | list[dict[str, str | float | None]]]
-    ] = []
     loading: bool = False
     error_message: str = ""
+    failed_tickers: list[dict[str, str]] = []
     horizon_options: list[str] = ["1M", "3M", "6M", "1Y", "5Y", "10Y", "20Y"]
-    best_ticker: str = ""
-    best_change: float = 0.0
-    worst_ticker: str = ""
-    worst_change: float = 0.0
     palette: list[str] = [
         "#8b5cf6",
         "#10b981",
@@ -49,51 +97,165 @@ class StockState(rx.State):
     table_page: int = 1
     table_items_per_page: int = 15
     is_fullscreen: bool = False
+    chart_point_budget: int = DEFAULT_POINT_BUDGET
+    risk_sort_column: str = "sharpe"
+    risk_sort_asc: bool = False
+    panel_start: int = 0
+    export_format: str = "csv"
+    export_normalized: bool = False
+    export_diff: bool = False
+    live: bool = False
+    live_status: str = ""
+    _analysis_key: str = ""
+    _partial_analysis: Optional[dict] = None
+    _live_bar: Optional[dict] = None
+    _live_id: int = 0
+    _loaded_horizon: str = ""
+    _loaded_as_of: str = ""
+    _run_generation: int = 0
+
+    @property
+    def _analysis(self) -> Optional[dict]:
+        """The loaded analysis, resolved from the shared result store, or the
+        partial one this session is streaming in."""
+        if self._partial_analysis is not None:
+            return self._partial_analysis
+        return result_store.get(self._analysis_key) if self._analysis_key else None
+
+    def _missing(self) -> bool:
+        """Whether the loaded analysis is gone from the result store: evicted,
+        or published by another worker or before a restart without a shared
+        ``RESULT_STORE_PATH``."""
+        return bool(self._analysis_key) and self._analysis is None
+
+    def _reload(self):
+        """Drop a missing analysis and fetch it again. Call inside
+        ``async with self`` in background handlers."""
+        self._analysis_key = ""
+        self.loading = False
+        return StockState.fetch_data
+
+    def _view(self, name: tuple, compute):
+        """A view of the loaded analysis shared by every session showing it."""
+        return result_store.view(self._analysis_key, name, compute)
+
+    def __getstate__(self):
+        """Pickle without cached computed vars: they are views of the shared
+        result store and are rebuilt from ``_analysis_key`` when next read."""
+        state = super().__getstate__()
+        return {k: v for k, v in state.items() if not k.startswith("__cached_")}
 
     @rx.var
     def table_columns(self) -> list[str]:
         """Get column names from stock data."""
-        if not self.stock_data:
+        if self._analysis is None:
             return []
-        keys = list(self.stock_data[0].keys())
-        if "Date" in keys:
-            keys.remove("Date")
-        return ["Date"] + sorted(keys)
+        return ["Date"] + sorted(self._analysis["tickers"])
+
+    @rx.var
+    def paginated_table_data(
+        self,
+    ) -> dict[str, list[int] | dict[str, list[float | None]]]:
+        """Return the current page using the precomputed sort order."""
+        analysis = self._analysis
+        if analysis is None:
+            return {"t": [], "s": {}}
+        column = self.table_sort_column
+        orders = self._view(
+            ("table_orders", column), lambda: table_orders(analysis, column)
+        )
+        page = (self.table_sort_asc, self.table_page, self.table_items_per_page)
+        return self._view(
+            ("table", column, *page), lambda: table_page(analysis, orders, *page)
+        )
+
+    @rx.var
+    def table_total_pages(self) -> int:
+        """Calculate total pages."""
+        import math
+
+        if self._analysis is None:
+            return 0
+        return math.ceil(len(self._analysis["daily_dates"]) / self.table_items_per_page)
+
+    @rx.var
+    def normalized_data(
+        self,
+    ) -> dict[str, list[int] | dict[str, list[float | None]]]:
+        """Downsampled normalized series for the performance chart."""
+        analysis = self._analysis
+        if analysis is None:
+            return {"t": [], "s": {}}
+        with stage("records_chart", self._loaded_horizon, len(analysis["tickers"])):
+            return self._view(("chart",), lambda: chart_series(analysis))
 
     @rx.var
-    def sorted_table_data(self) -> list[dict]:
-        """Return sorted stock data."""
-        if not self.stock_data:
+    def panel_dates(self) -> list[int]:
+        """Shared date axis, as epoch days, that panel points index into."""
+        analysis = self._analysis
+        if analysis is None:
             return []
-        data = list(self.stock_data)
-        col = self.table_sort_column
-        asc = self.table_sort_asc
+        return self._view(("panel_dates",), lambda: epoch_days(analysis["dates"]))
 
-        @rx.event
-        def sort_key(item):
-            val = item.get(col)
-            if val is None:
-                return "" if isinstance(data[0].get(col, ""), str) else float("-inf")
-            return val
+    @rx.var
+    def live_chart_bar(self) -> dict[str, int | bool | dict[str, float | None]]:
+        """Today's normalized values while live, merged into the chart rows."""
+        return chart_bar(self._live_bar, self._run_generation)
 
-        data.sort(key=sort_key, reverse=not asc)
-        return data
+    @rx.var
+    def live_panel_bars(
+        self,
+    ) -> dict[str, dict[str, int | float | str | bool | dict[str, float | None]]]:
+        """Today's point of every visible panel while live."""
+        return panel_bars(
+            self._live_bar,
+            self._run_generation,
+            self.selected_tickers,
+            self.panel_start,
+            PANEL_WINDOW,
+        )
 
     @rx.var
-    def paginated_table_data(self) -> list[dict]:
-        """Return paginated slice of sorted data."""
-        start = (self.table_page - 1) * self.table_items_per_page
-        end = start + self.table_items_per_page
-        return self.sorted_table_data[start:end]
+    def panel_summaries(self) -> list[dict[str, str | float | bool]]:
+        """Current differential of every panel, shown for the whole list."""
+        if self._analysis is None:
+            return []
+        summaries = panel_summaries(
+            overlay(self._analysis, self._live_bar, self._run_generation),
+            self.selected_tickers,
+            self.palette,
+        )
+        visible = range(self.panel_start, self.panel_start + PANEL_WINDOW)
+        return [
+            {**summary, "visible": i in visible} for i, summary in enumerate(summaries)
+        ]
 
     @rx.var
-    def table_total_pages(self) -> int:
-        """Calculate total pages."""
-        import math
+    def relative_strength_panels(
+        self,
+    ) -> list[dict[str, str | float | dict[str, list]]]:
+        """Full panels for the visible window only."""
+        analysis = self._analysis
+        if analysis is None:
+            return []
+        tickers, palette = list(self.selected_tickers), list(self.palette)
+        start = self.panel_start
+        with stage("records_panels", self._loaded_horizon, len(analysis["tickers"])):
+            return self._view(
+                ("panels", tuple(tickers), tuple(palette), start),
+                lambda: panel_views(analysis, tickers, palette, start, PANEL_WINDOW),
+            )
 
-        if not self.stock_data:
-            return 0
-        return math.ceil(len(self.stock_data) / self.table_items_per_page)
+    @rx.var
+    def panel_count(self) -> int:
+        return len(self._analysis["current_diff"]) if self._analysis else 0
+
+    @rx.var
+    def panel_range_label(self) -> str:
+        if not self.panel_count:
+            return ""
+        end = min(self.panel_start + PANEL_WINDOW, self.panel_count)
+        return f"{self.panel_start + 1}–{end} of {self.panel_count}"
 
     @rx.var
     def ticker_metadata(self) -> list[dict[str, str]]:
@@ -103,6 +265,38 @@ class StockState(rx.State):
             for i, ticker in enumerate(self.selected_tickers)
         ]
 
+    @rx.var
+    def best_ticker(self) -> str:
+        if self._analysis is None:
+            return ""
+        return overlay(self._analysis, self._live_bar, self._run_generation)[
+            "best_ticker"
+        ]
+
+    @rx.var
+    def best_change(self) -> float:
+        if self._analysis is None:
+            return 0.0
+        return overlay(self._analysis, self._live_bar, self._run_generation)[
+            "best_change"
+        ]
+
+    @rx.var
+    def worst_ticker(self) -> str:
+        if self._analysis is None:
+            return ""
+        return overlay(self._analysis, self._live_bar, self._run_generation)[
+            "worst_ticker"
+        ]
+
+    @rx.var
+    def worst_change(self) -> float:
+        if self._analysis is None:
+            return 0.0
+        return overlay(self._analysis, self._live_bar, self._run_generation)[
+            "worst_change"
+        ]
+
     @rx.var
     def best_change_formatted(self) -> str:
         return f"{self.best_change:+.2f}%"
@@ -111,14 +305,77 @@ class StockState(rx.State):
     def worst_change_formatted(self) -> str:
         return f"{self.worst_change:+.2f}%"
 
+    @rx.var
+    def risk_table_data(self) -> list[dict[str, str]]:
+        """Risk ranking of every ticker, sorted by the selected metric."""
+        analysis = self._analysis
+        if analysis is None:
+            return []
+        order = (self.risk_sort_column, self.risk_sort_asc)
+        return self._view(("risk", *order), lambda: risk_rows(analysis, *order))
+
+    @rx.var
+    def risk_cards(self) -> list[dict[str, str]]:
+        """Risk leaders shown next to the best/worst performer cards."""
+        analysis = self._analysis
+        if analysis is None:
+            return []
+        return self._view(("risk_cards",), lambda: risk_highlights(analysis))
+
+    @rx.var
+    def correlation_heatmap(self) -> dict[str, str | list[str]]:
+        """Peer correlation heatmap in hierarchical clustering order."""
+        analysis = self._analysis
+        if analysis is None:
+            return {"image": "", "tickers": [], "caption": ""}
+        return self._view(("correlation",), lambda: correlation_view(analysis))
+
     @rx.var
     def has_data(self) -> bool:
-        return len(self.normalized_data) > 0
+        return self._analysis is not None
 
     @rx.event
     def set_ticker_input(self, value: str):
         self.ticker_input = value
 
+    def _begin_run(self) -> int:
+        """Start an analysis run, superseding the session's in-flight one.
+
+        Call inside ``async with self``. The previous run's task is cancelled
+        if it lives in this worker; the returned generation lets every later
+        write of this run detect that it was superseded anywhere.
+        """
+        self._run_generation += 1
+        analysis_runs.supersede(self.router.session.client_token)
+        return self._run_generation
+
+    def _ensure_current(self, generation: int) -> None:
+        """Abandon a superseded run before it writes anything back."""
+        if self._run_generation != generation:
+            raise asyncio.CancelledError
+
+    def _can_update_incrementally(self) -> bool:
+        """Whether the loaded close matrix is complete and still matches the
+        horizon and day. A partial one still streaming in lacks the tickers
+        being downloaded, so changes to it restart the fetch instead."""
+        return (
+            self._partial_analysis is None
+            and self._analysis is not None
+            and self._loaded_horizon == self.time_horizon
+            and self._loaded_as_of == datetime.now().date().isoformat()
+        )
+
+    def _can_reslice(self, horizon: str) -> bool:
+        """Whether the loaded close matrix already spans this horizon for
+        exactly the selected tickers."""
+        analysis = self._analysis
+        return (
+            analysis is not None
+            and self._loaded_as_of == datetime.now().date().isoformat()
+            and set(analysis["closes"].columns) == set(self.selected_tickers)
+            and covers_horizon(analysis["closes_horizon"], horizon)
+        )
+
     @rx.event
     def add_ticker(self):
         """Add a ticker to the selected list."""
@@ -128,7 +385,9 @@ class StockState(rx.State):
         if ticker and ticker not in self.selected_tickers:
             self.selected_tickers.append(ticker)
             self.ticker_input = ""
-            if self.has_data:
+            if self._analysis_key or self.loading:
+                if self._can_update_incrementally():
+                    return StockState.splice_ticker(ticker)
                 return StockState.fetch_data
         elif ticker in self.selected_tickers:
             self.error_message = f"Ticker {ticker} is already selected."
@@ -138,136 +397,406 @@ class StockState(rx.State):
         """Remove a ticker from the selected list."""
         if ticker in self.selected_tickers:
             self.selected_tickers.remove(ticker)
-            if self.has_data:
+            if self._analysis_key or self.loading:
+                if self._can_update_incrementally() and self.selected_tickers:
+                    return StockState.drop_ticker(ticker)
                 return StockState.fetch_data
 
     @rx.event
     def set_time_horizon(self, horizon: str):
-        """Set the analysis time horizon."""
+        """Set the analysis time horizon, re-slicing loaded data if possible."""
         self.time_horizon = horizon
+        if self._can_reslice(horizon):
+            return StockState.reslice_horizon
+        if self._missing():
+            return self._reload()
+
+    @rx.event
+    def restore_analysis(self):
+        """Fetch the session's analysis again when the store no longer has it,
+        so a reloaded page is not left blank."""
+        if self._missing() and not self.loading:
+            return self._reload()
+
+    @rx.event
+    def set_chart_width(self, width: int):
+        """Size the chart point budget to the rendered chart width."""
+        self.chart_point_budget = point_budget_for_width(width)
+
+    async def _stream_analysis(
+        self,
+        tickers: list[str],
+        horizon: str,
+        fetch_horizon: str,
+        point_budget: int,
+        generation: int,
+    ) -> dict:
+        """Fetch tickers concurrently and push partial results as they land.
+
+        Runs as the single-flight computation shared by every session asking
+        for the same analysis, so only this session's partial results are
+        pushed, and only while it is still the current run. Partial results
+        stay in the session rather than the shared store. Tickers that could
+        not be fetched are returned in ``failed_tickers``.
+        """
+        start_date, end_date = horizon_window(fetch_horizon)
+        closes: list[str] = []
+        failures: list[dict[str, str]] = []
+        result = None
+        last_push = 0.0
+        started = time.perf_counter()
+        async with aclosing(stream_closes(tickers, start_date, end_date)) as fetched:
+            async for ticker, reason in fetched:
+                if reason:
+                    failures.append({"ticker": ticker, "reason": reason})
+                else:
+                    closes.append(ticker)
+                finished = len(closes) + len(failures) == len(tickers)
+                if finished:
+                    record_stage(
+                        "download",
+                        time.perf_counter() - started,
+                        horizon,
+                        len(tickers),
+                        failed=len(failures),
+                    )
+                if not finished and time.monotonic() - last_push < STREAM_PUSH_INTERVAL:
+                    continue
+                if closes:
+                    frame = await read_closes(
+                        [t for t in tickers if t in closes], start_date, end_date
+                    )
+                    try:
+                        result = await run_in_pool(
+                            analyze_window,
+                            frame,
+                            fetch_horizon,
+                            horizon,
+                            point_budget,
+                            end_date,
+                        )
+                    except ValueError:
+                        result = None
+                async with self:
+                    if self._run_generation == generation:
+                        self.failed_tickers = list(failures)
+                        if result is not None:
+                            self._partial_analysis = result
+                last_push = time.monotonic()
+        if result is None:
+            raise ValueError(
+                "No data returned for " + ", ".join(f["ticker"] for f in failures)
+            )
+        result["failed_tickers"] = failures
+        return result
 
     @rx.event(background=True)
     async def fetch_data(self):
         """Fetch stock data from yfinance based on current configuration."""
         async with self:
+            generation = self._begin_run()
             if not self.selected_tickers:
                 self.error_message = "Please select at least one ticker."
+                self.loading = False
                 return
             self.loading = True
             self.error_message = ""
-            self.stock_data = []
-            self.normalized_data = []
+            reslice = self._can_reslice(self.time_horizon)
+            if not reslice:
+                self.failed_tickers = []
+                self._analysis_key = ""
+                self._partial_analysis = None
+            tickers_to_fetch = list(self.selected_tickers)
+            horizon = self.time_horizon
+            point_budget = self.chart_point_budget
+        if reslice:
+            return await self._reslice()
+        started = time.perf_counter()
         try:
+            fetch_horizon = widest_horizon(horizon, PREFETCH_HORIZON)
             end_date = datetime.now()
-            start_date = end_date
-            days_map = {
-                "1M": 30,
-                "3M": 90,
-                "6M": 180,
-                "1Y": 365,
-                "5Y": 365 * 5,
-                "10Y": 365 * 10,
-                "20Y": 365 * 20,
-            }
-            async with self:
-                horizon_days = days_map.get(self.time_horizon, 365)
-            start_date = end_date - timedelta(days=horizon_days)
-            async with self:
-                tickers_to_fetch = self.selected_tickers
-            df = await asyncio.to_thread(
-                yf.download,
-                tickers=tickers_to_fetch,
-                start=start_date,
-                end=end_date,
-                auto_adjust=True,
-                progress=False,
+            sorted_tickers = sorted(tickers_to_fetch)
+            cache_key = analysis_key(
+                sorted_tickers, horizon, end_date.date().isoformat(), point_budget
             )
-            if df.empty:
-                raise ValueError("No data returned from provider.")
-            close_data = df["Close"] if "Close" in df else df
-            if isinstance(close_data, pd.Series):
-                close_data = close_data.to_frame(name=tickers_to_fetch[0])
-            close_data = close_data.ffill().dropna()
-            if close_data.empty:
-                raise ValueError("No valid price data found after processing.")
-            raw_df = close_data.reset_index()
-            raw_df["Date"] = raw_df["Date"].dt.strftime("%Y-%m-%d")
-            raw_records = raw_df.to_dict("records")
-            normalized_df = close_data / close_data.iloc[0]
-            normalized_df = normalized_df.reset_index()
-            normalized_df["Date"] = normalized_df["Date"].dt.strftime("%Y-%m-%d")
-            norm_records = normalized_df.to_dict("records")
-            b_ticker, b_change, w_ticker, w_change = ("", 0.0, "", 0.0)
-            if not close_data.empty:
-                start_vals = close_data.iloc[0]
-                end_vals = close_data.iloc[-1]
-                pct_changes = (end_vals / start_vals - 1.0) * 100
-                b_ticker = pct_changes.idxmax()
-                b_change = float(pct_changes.max())
-                w_ticker = pct_changes.idxmin()
-                w_change = float(pct_changes.min())
-            panels = []
-            if len(tickers_to_fetch) > 1 and (not close_data.empty):
-                norm_numeric = close_data / close_data.iloc[0]
-                for i, ticker in enumerate(tickers_to_fetch):
-                    peers = [t for t in tickers_to_fetch if t != ticker]
-                    if not peers:
-                        continue
-                    peer_avg_series = norm_numeric[peers].mean(axis=1)
-                    stock_series = norm_numeric[ticker]
-                    diff_series = stock_series - peer_avg_series
-                    mx = float(diff_series.max())
-                    mn = float(diff_series.min())
-                    if pd.isna(mx) or pd.isna(mn) or mx == mn:
-                        offset = 0.5
-                    elif mx <= 0:
-                        offset = 0.0
-                    elif mn >= 0:
-                        offset = 1.0
-                    else:
-                        offset = mx / (mx - mn)
-                    panel_data_points = []
-                    dates_str = diff_series.index.strftime("%Y-%m-%d")
-                    for dt, st_val, pr_val, df_val in zip(
-                        dates_str, stock_series, peer_avg_series, diff_series
-                    ):
-                        panel_data_points.append(
-                            {
-                                "Date": dt,
-                                "Stock": float(st_val) if not pd.isna(st_val) else None,
-                                "Peer": float(pr_val) if not pd.isna(pr_val) else None,
-                                "Diff": float(df_val) if not pd.isna(df_val) else None,
-                            }
-                        )
-                    current_diff = float(diff_series.iloc[-1])
-                    panels.append(
-                        {
-                            "ticker": ticker,
-                            "color": self.palette[i % len(self.palette)],
-                            "current_diff": current_diff,
-                            "current_diff_fmt": f"{current_diff:+.2%}",
-                            "gradient_offset": offset,
-                            "data": panel_data_points,
-                        }
+            computed = []
+
+            async def compute() -> dict:
+                computed.append(True)
+                if FETCH_MODE == "stream":
+                    return await self._stream_analysis(
+                        sorted_tickers, horizon, fetch_horizon, point_budget, generation
                     )
+                return await run_in_pool(
+                    run_analysis,
+                    sorted_tickers,
+                    horizon,
+                    point_budget,
+                    end_date,
+                    fetch_horizon,
+                )
+
+            # Results missing a ticker are shared with the sessions waiting
+            # on them but not cached, so the next request retries it.
+            result = await analysis_cache.get_or_compute(
+                cache_key, compute, keep=lambda r: not r.get("failed_tickers")
+            )
+            cached = not computed
+            key = await publish_analysis(result, horizon)
             async with self:
-                self.stock_data = raw_records
-                self.normalized_data = norm_records
-                self.relative_strength_panels = panels
-                self.best_ticker = str(b_ticker)
-                self.best_change = b_change
-                self.worst_ticker = str(w_ticker)
-                self.worst_change = w_change
+                self._ensure_current(generation)
+                self.failed_tickers = list(result.get("failed_tickers", []))
+                self._analysis_key = key
+                self._partial_analysis = None
+                self._loaded_horizon = horizon
+                self._loaded_as_of = end_date.date().isoformat()
                 self.loading = False
                 self.table_page = 1
+                self.panel_start = 0
+            record_stage(
+                "fetch_data",
+                time.perf_counter() - started,
+                horizon,
+                len(sorted_tickers),
+                rows=len(result["dates"]),
+                cached=cached,
+            )
         except Exception as e:
             import logging
 
             logging.exception(f"Error fetching stock data: {e}")
             async with self:
+                self._ensure_current(generation)
                 self.error_message = f"Failed to fetch data: {str(e)}"
+                self._partial_analysis = None
+                self.loading = False
+
+    async def _reanalyze(
+        self,
+        raw_closes: pd.DataFrame,
+        closes_horizon: str,
+        horizon: str,
+        generation: int,
+    ):
+        """Re-run the analysis for a horizon from an in-memory close matrix
+        spanning ``closes_horizon``."""
+        async with self:
+            self._ensure_current(generation)
+            tickers = [t for t in self.selected_tickers if t in raw_closes.columns]
+            as_of = self._loaded_as_of
+            point_budget = self.chart_point_budget
+            complete = not self.failed_tickers
+        sorted_tickers = sorted(tickers)
+        result = await run_in_pool(
+            analyze_window,
+            raw_closes[sorted_tickers],
+            closes_horizon,
+            horizon,
+            point_budget,
+        )
+        if complete:
+            analysis_cache.put(
+                analysis_key(sorted_tickers, horizon, as_of, point_budget), result
+            )
+        key = await publish_analysis(result, horizon)
+        async with self:
+            self._ensure_current(generation)
+            self._analysis_key = key
+            self._partial_analysis = None
+            self._loaded_horizon = horizon
+            self.loading = False
+            last = max(0, (len(result["current_diff"]) - 1) // PANEL_WINDOW)
+            self.panel_start = min(self.panel_start, last * PANEL_WINDOW)
+
+    async def _reslice(self):
+        """Re-base the loaded close matrix to the selected horizon."""
+        async with self:
+            generation = self._begin_run()
+            analysis = self._analysis
+            if analysis is None:
+                return self._reload()
+            self.loading = True
+            self.error_message = ""
+            raw_closes = analysis["closes"]
+            closes_horizon = analysis["closes_horizon"]
+            horizon = self.time_horizon
+        try:
+            await self._reanalyze(raw_closes, closes_horizon, horizon, generation)
+        except Exception as e:
+            import logging
+
+            logging.exception(f"Error switching horizon to {horizon}: {e}")
+            async with self:
+                self._ensure_current(generation)
+                self.error_message = f"Failed to switch horizon: {str(e)}"
+                self.loading = False
+
+    @rx.event(background=True)
+    async def reslice_horizon(self):
+        """Switch horizons from memory without calling the provider."""
+        return await self._reslice()
+
+    @rx.event(background=True)
+    async def splice_ticker(self, ticker: str):
+        """Fetch only newly added tickers and splice them into the close matrix.
+
+        Besides ``ticker`` this picks up any other selected ticker missing
+        from the matrix, such as one whose own splice was superseded.
+        """
+        async with self:
+            generation = self._begin_run()
+            analysis = self._analysis
+            if analysis is None:
+                return self._reload()
+            self.loading = True
+            self.error_message = ""
+            raw_closes = analysis["closes"]
+            horizon = self._loaded_horizon
+            closes_horizon = analysis["closes_horizon"]
+            failed = {f["ticker"] for f in self.failed_tickers}
+            missing = [
+                t
+                for t in self.selected_tickers
+                if t not in raw_closes.columns and t not in failed
+            ]
+        start_date, end_date = horizon_window(closes_horizon)
+        fetched = await asyncio.gather(
+            *(
+                fetch_ticker_closes(t, start_date, end_date, FETCH_TIMEOUT_SECONDS)
+                for t in missing
+            ),
+            return_exceptions=True,
+        )
+        failures = []
+        for missing_ticker, series in zip(missing, fetched):
+            if isinstance(series, Exception):
+                reason = (
+                    f"timed out after {FETCH_TIMEOUT_SECONDS:g}s"
+                    if isinstance(series, asyncio.TimeoutError)
+                    else str(series) or type(series).__name__
+                )
+                failures.append({"ticker": missing_ticker, "reason": reason})
+            else:
+                raw_closes = raw_closes.join(series.rename(missing_ticker), how="outer")
+        async with self:
+            self._ensure_current(generation)
+            self.failed_tickers = [*self.failed_tickers, *failures]
+            if len(failures) == len(missing) and missing:
+                self.loading = False
+                return
+        try:
+            await self._reanalyze(raw_closes, closes_horizon, horizon, generation)
+        except Exception as e:
+            import logging
+
+            logging.exception(f"Error adding ticker {ticker}: {e}")
+            async with self:
+                self._ensure_current(generation)
+                self.error_message = f"Failed to add {ticker}: {str(e)}"
+                self.loading = False
+
+    @rx.event(background=True)
+    async def drop_ticker(self, ticker: str):
+        """Drop a removed ticker's column and recompute from memory."""
+        async with self:
+            generation = self._begin_run()
+            self.failed_tickers = [
+                f for f in self.failed_tickers if f["ticker"] != ticker
+            ]
+            analysis = self._analysis
+            if analysis is None:
+                return self._reload()
+            self.loading = True
+            self.error_message = ""
+            raw_closes = analysis["closes"].drop(columns=[ticker], errors="ignore")
+            closes_horizon = analysis["closes_horizon"]
+            horizon = self._loaded_horizon
+        try:
+            await self._reanalyze(raw_closes, closes_horizon, horizon, generation)
+        except Exception as e:
+            import logging
+
+            logging.exception(f"Error removing ticker {ticker}: {e}")
+            async with self:
+                self._ensure_current(generation)
+                self.error_message = f"Failed to remove {ticker}: {str(e)}"
                 self.loading = False
 
+    @rx.event
+    def toggle_live(self):
+        """Start or stop following intraday quotes on the last bar."""
+        self.live = not self.live
+        if not self.live:
+            self.live_status = ""
+            return
+        self._live_id += 1
+        self.live_status = "Connecting…"
+        return StockState.run_live(self._live_id)
+
+    @rx.event(background=True)
+    async def run_live(self, live_id: int):
+        """Move the last bar with live quotes until live mode is switched off.
+
+        Quotes are coalesced per ticker and applied once per
+        ``LIVE_PUSH_INTERVAL``, so each push is O(N) however fast the stream
+        ticks and only today's bar goes to the client. A new analysis run
+        restarts the book on its result; stopping keeps the live bar.
+        """
+        stream = get_quote_stream()
+        try:
+            while True:
+                async with self:
+                    if not self.live or self._live_id != live_id:
+                        return
+                    analysis, generation = self._analysis, self._run_generation
+                    horizon = self._loaded_horizon
+                    ready = analysis is not None and not self.loading
+                    self._live_bar = None
+                if not ready:
+                    await asyncio.sleep(LIVE_PUSH_INTERVAL)
+                    continue
+                book = await asyncio.to_thread(LiveBook, analysis)
+                reference = dict(zip(book.tickers, book.close[-1].tolist()))
+                quotes = stream.subscribe(list(book.tickers), reference)
+                stopped = restart = False
+                async with aclosing(
+                    coalesce_quotes(quotes, LIVE_PUSH_INTERVAL)
+                ) as batches:
+                    async for batch in batches:
+                        with stage("live_update", "", len(book.tickers)) as fields:
+                            book.apply(batch)
+                            fields["quotes"] = len(batch)
+                        async with self:
+                            stopped = not self.live or self._live_id != live_id
+                            restart = self._run_generation != generation
+                            if stopped or restart:
+                                break
+                            self._live_bar = {**book.bar(), "generation": generation}
+                            self.live_status = datetime.now().strftime(
+                                "Live · %H:%M:%S"
+                            )
+                if restart:
+                    continue
+                result = await asyncio.to_thread(book.analysis)
+                key = await publish_analysis(result, horizon)
+                async with self:
+                    if self._run_generation == generation:
+                        self._analysis_key = key
+                    self._live_bar = None
+                    if not stopped and self._live_id == live_id:
+                        self.live = False
+                        self.live_status = "Quote stream ended"
+                return
+        except Exception as e:
+            import logging
+
+            logging.exception(f"Error following live quotes: {e}")
+            async with self:
+                if self._live_id == live_id:
+                    self._live_bar = None
+                    self.live = False
+                    self.live_status = f"Live quotes failed: {str(e)}"
+
     @rx.event
     def sort_table(self, col: str):
         if self.table_sort_column == col:
@@ -275,22 +804,72 @@ class StockState(rx.State):
         else:
             self.table_sort_column = col
             self.table_sort_asc = True
+        if self._missing():
+            return self._reload()
+
+    @rx.event
+    def sort_risk_table(self, col: str):
+        if self.risk_sort_column == col:
+            self.risk_sort_asc = not self.risk_sort_asc
+        else:
+            self.risk_sort_column = col
+            self.risk_sort_asc = col in ("volatility", "ticker")
+        if self._missing():
+            return self._reload()
 
     @rx.event
     def set_table_page(self, page: int):
+        if self._missing():
+            return self._reload()
         if 1 <= page <= self.table_total_pages:
             self.table_page = page
 
+    @rx.event
+    def shift_panels(self, step: int):
+        """Move the visible panel window by ``step`` windows."""
+        if self._missing():
+            return self._reload()
+        last = max(0, (self.panel_count - 1) // PANEL_WINDOW)
+        self.panel_start = min(
+            max(0, self.panel_start + step * PANEL_WINDOW), last * PANEL_WINDOW
+        )
+
+    @rx.event
+    def focus_panel(self, ticker: str):
+        """Bring a ticker's panel into the visible window."""
+        tickers = [s["ticker"] for s in self.panel_summaries]
+        if ticker in tickers:
+            self.panel_start = tickers.index(ticker) // PANEL_WINDOW * PANEL_WINDOW
+
     @rx.event
     def toggle_fullscreen(self):
         self.is_fullscreen = not self.is_fullscreen
 
     @rx.event
-    def download_csv(self):
-        if not self.stock_data:
+    def set_export_format(self, fmt: str):
+        self.export_format = fmt
+
+    @rx.event
+    def toggle_export_normalized(self):
+        self.export_normalized = not self.export_normalized
+
+    @rx.event
+    def toggle_export_diff(self):
+        self.export_diff = not self.export_diff
+
+    @rx.event
+    def download_export(self):
+        """Start a streamed download of the loaded price matrix."""
+        if self._missing():
+            return self._reload()
+        if not self._analysis_key:
             return
-        df = pd.DataFrame(self.stock_data)
-        cols = self.table_columns
-        cols = [c for c in cols if c in df.columns]
-        csv_string = df[cols].to_csv(index=False)
-        return rx.download(data=csv_string, filename="stock_peer_analysis.csv")
\ No newline at end of file
+        query = urlencode(
+            {
+                "format": self.export_format,
+                "normalized": int(self.export_normalized),
+                "diff": int(self.export_diff),
+            }
+        )
+        url = get_config().api_url.rstrip("/") + f"/export/{self._analysis_key}?{query}"
+        return rx.call_script(f"window.location.assign({json.dumps(url)})")
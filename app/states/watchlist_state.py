@@ -0,0 +1,26 @@
+import reflex as rx
+from app.prewarm import prewarm_scheduler
+
+
+class WatchlistState(rx.State):
+    """Status of the background pre-warming scheduler."""
+
+    rows: list[dict[str, str]] = []
+
+    @rx.event
+    def load_status(self):
+        self.rows = prewarm_scheduler.status_rows()
+
+    @rx.event(background=True)
+    async def refresh_watchlist(self, name: str):
+        """Refresh one watchlist now instead of waiting for the schedule."""
+        if name not in prewarm_scheduler.watchlists:
+            return
+        async with self:
+            self.rows = [
+                {**row, "state": "running"} if row["name"] == name else row
+                for row in self.rows
+            ]
+        await prewarm_scheduler.refresh(name)
+        async with self:
+            self.rows = prewarm_scheduler.status_rows()
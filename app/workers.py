@@ -0,0 +1,143 @@
+import asyncio
+import functools
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable
+
+ANALYTICS_POOL = os.environ.get("ANALYTICS_POOL", "thread")
+ANALYTICS_WORKERS = int(
+    os.environ.get("ANALYTICS_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+BATCH_WORKERS = int(os.environ.get("BATCH_WORKERS", "1"))
+LOOP_LAG_INTERVAL = float(os.environ.get("LOOP_LAG_INTERVAL", "0.1"))
+LOOP_LAG_WARN_SECONDS = float(os.environ.get("LOOP_LAG_WARN_SECONDS", "0.25"))
+
+_executor: Executor | None = None
+_batch_executor: Executor | None = None
+
+
+def get_executor() -> Executor:
+    """Return the shared analytics pool, creating it on first use.
+
+    ``ANALYTICS_POOL=process`` moves the pandas/NumPy work into separate
+    processes, which avoids GIL contention for very large universes at the
+    cost of pickling inputs and results.
+    """
+    global _executor
+    if _executor is None:
+        if ANALYTICS_POOL == "process":
+            _executor = ProcessPoolExecutor(max_workers=ANALYTICS_WORKERS)
+        else:
+            _executor = ThreadPoolExecutor(
+                max_workers=ANALYTICS_WORKERS, thread_name_prefix="analytics"
+            )
+    return _executor
+
+
+def get_batch_executor() -> Executor:
+    """Return the pool batch jobs run on, creating it on first use.
+
+    Batches are kept off the analytics pool so a job of thousands of peer
+    groups cannot queue ahead of interactive sessions; ``BATCH_WORKERS``
+    bounds the cores batches may take. ``ANALYTICS_POOL`` selects threads
+    or processes as for the analytics pool.
+    """
+    global _batch_executor
+    if _batch_executor is None:
+        if ANALYTICS_POOL == "process":
+            _batch_executor = ProcessPoolExecutor(max_workers=BATCH_WORKERS)
+        else:
+            _batch_executor = ThreadPoolExecutor(
+                max_workers=BATCH_WORKERS, thread_name_prefix="batch"
+            )
+    return _batch_executor
+
+
+async def run_in_pool(fn: Callable[..., Any], *args: Any) -> Any:
+    """Run a CPU-bound function in the analytics pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(fn, *args))
+
+
+class LoopLagMonitor:
+    """Measure how late the event loop wakes up from a fixed-interval sleep.
+
+    Any delay beyond the interval is time the loop spent blocked on other
+    work, which is what every other connected session waits on.
+    """
+
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL, window: int = 600):
+        self.interval = interval
+        self.samples: deque[float] = deque(maxlen=window)
+        self.max_lag = 0.0
+
+    def record(self, lag: float) -> None:
+        self.samples.append(lag)
+        self.max_lag = max(self.max_lag, lag)
+        if lag > LOOP_LAG_WARN_SECONDS:
+            logging.warning(
+                "Event loop lag", extra={"loop_lag_ms": round(lag * 1000, 1)}
+            )
+
+    async def run(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, time.perf_counter() - started - self.interval))
+
+    def stats(self) -> dict[str, float]:
+        """Mean, p99 and max lag in milliseconds over the recent window."""
+        if not self.samples:
+            return {"samples": 0, "mean_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        ordered = sorted(self.samples)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        return {
+            "samples": len(ordered),
+            "mean_ms": sum(ordered) / len(ordered) * 1000,
+            "p99_ms": p99 * 1000,
+            "max_ms": self.max_lag * 1000,
+        }
+
+
+loop_lag = LoopLagMonitor()
+
+
+async def monitor_loop_lag():
+    """Lifespan task that samples event loop lag for the whole process."""
+    await loop_lag.run()
+
+
+class RunRegistry:
+    """The latest analysis task of each session.
+
+    Starting a run cancels the one it supersedes: its pending provider
+    call is abandoned and pool work that has not started is dropped, since
+    cancelling an awaited executor future cancels the pool job too.
+    """
+
+    def __init__(self):
+        self._tasks: dict[str, asyncio.Task] = {}
+        self.started = 0
+        self.cancelled = 0
+
+    def supersede(self, key: str) -> None:
+        """Make the current task the session's run, cancelling the previous."""
+        task = asyncio.current_task()
+        previous = self._tasks.get(key)
+        if previous is not None and previous is not task and not previous.done():
+            previous.cancel()
+            self.cancelled += 1
+        if previous is not task:
+            self.started += 1
+        self._tasks[key] = task
+        task.add_done_callback(lambda done: self._finish(key, done))
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+
+
+analysis_runs = RunRegistry()
@@ -0,0 +1,175 @@
+"""Stage benchmarks for the fetch_data pipeline on synthetic prices.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_pipeline --output bench_report.json
+
+Every case times each pipeline stage on the deterministic offline provider,
+measures peak traced memory and the serialized size of the session state
+and of the frontend payload, and writes one JSON report that can be diffed
+between releases.
+"""
+
+import argparse
+import json
+import pickle
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from app.analytics import pipeline
+from app.analytics.downsample import DEFAULT_POINT_BUDGET
+from app.analytics.records import epoch_days
+from app.analytics.risk import risk_summary
+from app.analytics.views import (
+    chart_series,
+    panel_summaries,
+    panel_views,
+    table_orders,
+    table_page,
+)
+from app.data.providers import SyntheticProvider
+
+TICKER_COUNTS = (5, 50, 500)
+HORIZONS = tuple(pipeline.HORIZON_DAYS)
+AS_OF = datetime(2025, 1, 2, 16, 0)
+PALETTE = ["#8b5cf6", "#10b981", "#f59e0b", "#3b82f6", "#ef4444"]
+
+
+def frontend_payload(analysis: dict, tickers: list[str]) -> dict:
+    """Everything the components read for one analysis."""
+    return {
+        "normalized_data": chart_series(analysis),
+        "panel_summaries": panel_summaries(analysis, tickers, PALETTE),
+        "relative_strength_panels": panel_views(analysis, tickers, PALETTE, 0, 6),
+        "panel_dates": epoch_days(analysis["dates"]),
+        "paginated_table_data": table_page(
+            analysis, table_orders(analysis, "Date"), False, 1, 15
+        ),
+    }
+
+
+def run_stages(
+    provider: SyntheticProvider, tickers: list[str], horizon: str, budget: int
+) -> tuple[dict[str, float], dict, dict]:
+    """Run the pipeline once, returning per-stage seconds and the outputs."""
+    stages: dict[str, float] = {}
+
+    def timed(name, fn, *args):
+        started = time.perf_counter()
+        result = fn(*args)
+        stages[name] = time.perf_counter() - started
+        return result
+
+    start_date, end_date = pipeline.horizon_window(horizon, AS_OF)
+    raw = timed("download", provider.download, tickers, start_date, end_date)
+    close = timed("cleaning", pipeline.clean_closes, raw)
+    norm = timed("normalization", pipeline.normalize, close)
+    timed("best_worst", pipeline.best_worst, close)
+    timed("panel_build", pipeline.build_panels, norm.to_numpy(dtype=float))
+    timed(
+        "risk",
+        risk_summary,
+        close.to_numpy(dtype=float),
+        close.index.values.astype("datetime64[D]"),
+    )
+    analysis = timed(
+        "analyze_total",
+        pipeline.analyze_closes,
+        raw,
+        budget,
+        horizon,
+        pipeline.resolution_for(horizon),
+    )
+    payload = timed("record_conversion", frontend_payload, analysis, tickers)
+    return stages, analysis, payload
+
+
+def bench_case(
+    provider: SyntheticProvider,
+    n_tickers: int,
+    horizon: str,
+    repeat: int,
+    budget: int,
+) -> dict:
+    tickers = [f"SYN{i:04d}" for i in range(n_tickers)]
+    samples: dict[str, list[float]] = {}
+    for _ in range(repeat):
+        stages, analysis, payload = run_stages(provider, tickers, horizon, budget)
+        for name, seconds in stages.items():
+            samples.setdefault(name, []).append(seconds)
+    tracemalloc.start()
+    run_stages(provider, tickers, horizon, budget)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "tickers": n_tickers,
+        "horizon": horizon,
+        "resolution": analysis["resolution"],
+        "rows": int(len(analysis["dates"])),
+        "stages": {
+            name: {
+                "min_s": round(min(values), 6),
+                "median_s": round(statistics.median(values), 6),
+            }
+            for name, values in samples.items()
+        },
+        "peak_memory_bytes": peak,
+        "backend_state_bytes": len(pickle.dumps(analysis)),
+        "frontend_payload_bytes": len(json.dumps(payload, separators=(",", ":"))),
+    }
+
+
+def main(argv: list[str] | None = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickers", type=int, nargs="+", default=TICKER_COUNTS)
+    parser.add_argument("--horizons", nargs="+", default=HORIZONS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--budget", type=int, default=DEFAULT_POINT_BUDGET)
+    parser.add_argument("--output", help="write the JSON report here")
+    args = parser.parse_args(argv)
+
+    provider = SyntheticProvider()
+    results = []
+    for n_tickers in args.tickers:
+        for horizon in args.horizons:
+            result = bench_case(provider, n_tickers, horizon, args.repeat, args.budget)
+            results.append(result)
+            print(
+                f"{n_tickers:>4} tickers {horizon:>3}: "
+                f"{result['stages']['analyze_total']['median_s'] * 1000:8.1f} ms "
+                f"analyze, "
+                f"{result['stages']['record_conversion']['median_s'] * 1000:8.1f} ms "
+                f"records, {result['frontend_payload_bytes'] / 1024:8.0f} KiB payload",
+                file=sys.stderr,
+            )
+    report = {
+        "meta": {
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "as_of": AS_OF.isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "repeat": args.repeat,
+            "point_budget": args.budget,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return report
+
+
+if __name__ == "__main__":
+    main()
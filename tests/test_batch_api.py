@@ -0,0 +1,48 @@
+import threading
+
+import pytest
+from starlette.testclient import TestClient
+
+from app import api
+from app.analytics import batch
+from app.data.price_cache import MmapPriceCache
+from app.data.providers import SyntheticProvider
+
+BODY = {"groups": {"a": ["AAA", "BBB"], "b": ["BBB", "CCC"]}, "as_of": "2025-01-02"}
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    cache = MmapPriceCache(path=str(tmp_path), provider=SyntheticProvider())
+    monkeypatch.setattr(batch, "price_cache", cache)
+    return TestClient(api.backend_api())
+
+
+def test_batch_is_disabled_without_a_token(client, monkeypatch):
+    monkeypatch.setattr(api, "BATCH_API_TOKEN", "")
+    assert client.post(api.BATCH_PATH, json=BODY).status_code == 404
+
+
+def test_batch_requires_the_token(client, monkeypatch):
+    monkeypatch.setattr(api, "BATCH_API_TOKEN", "secret")
+    headers = {"Authorization": "Bearer wrong"}
+    assert client.post(api.BATCH_PATH, json=BODY).status_code == 401
+    assert client.post(api.BATCH_PATH, json=BODY, headers=headers).status_code == 401
+
+
+def test_batch_runs_on_its_own_pool(client, monkeypatch):
+    monkeypatch.setattr(api, "BATCH_API_TOKEN", "secret")
+    threads = set()
+    summarize = batch.summarize_group
+
+    def recording(name, closes):
+        threads.add(threading.current_thread().name)
+        return summarize(name, closes)
+
+    monkeypatch.setattr(batch, "summarize_group", recording)
+    response = client.post(
+        api.BATCH_PATH, json=BODY, headers={"Authorization": "Bearer secret"}
+    )
+    assert response.status_code == 200
+    assert [g["name"] for g in response.json()["groups"]] == ["a", "b"]
+    assert threads and all(name.startswith("batch") for name in threads)
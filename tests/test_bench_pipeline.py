@@ -0,0 +1,7 @@
+from benchmarks.bench_pipeline import main
+
+
+def test_benchmark_smoke():
+    report = main(["--tickers", "5", "--horizons", "1M", "--repeat", "1"])
+    (case,) = report["results"]
+    assert case["frontend_payload_bytes"] > 0
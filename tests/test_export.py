@@ -0,0 +1,53 @@
+import io
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from app.analytics.export import ExportColumns, iter_arrow, iter_csv
+
+
+def analysis(rows: int, tickers: int = 4) -> dict:
+    rng = np.random.default_rng(5)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (rows, tickers)), axis=0))
+    dates = np.datetime64("1990-01-01") + np.arange(rows)
+    names = [f"T{j}" for j in range(tickers)]
+    return {"tickers": names, "daily_close": close, "daily_dates": dates}
+
+
+def expected(a: dict) -> pd.DataFrame:
+    close = a["daily_close"]
+    norm = close / close[0]
+    peers = (norm.sum(axis=1, keepdims=True) - norm) / (norm.shape[1] - 1)
+    frame = pd.DataFrame(
+        np.hstack([close, norm, norm - peers]),
+        columns=[
+            *a["tickers"],
+            *(f"{t} Normalized" for t in a["tickers"]),
+            *(f"{t} vs Peers" for t in a["tickers"]),
+        ],
+    )
+    frame.insert(0, "Date", np.datetime_as_string(a["daily_dates"]))
+    return frame
+
+
+def test_chunked_csv_and_arrow_match_the_full_matrices():
+    a = analysis(1000)
+    columns = ExportColumns(a, normalized=True, diff=True)
+    csv = pd.read_csv(io.BytesIO(b"".join(iter_csv(a, columns, chunk_rows=128))))
+    pd.testing.assert_frame_equal(csv, expected(a), check_exact=False, rtol=1e-12)
+    table = pa.ipc.open_stream(b"".join(iter_arrow(a, columns, chunk_rows=128)))
+    frame = table.read_pandas()
+    frame["Date"] = np.datetime_as_string(frame["Date"].to_numpy("datetime64[D]"))
+    pd.testing.assert_frame_equal(frame, expected(a))
+
+
+def test_export_memory_does_not_grow_with_the_history():
+    a = analysis(200_000, 20)
+    tracemalloc.start()
+    for _ in iter_arrow(a, ExportColumns(a, normalized=True, diff=True)):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert peak < a["daily_close"].nbytes / 4
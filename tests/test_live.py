@@ -0,0 +1,53 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.analytics.live import LiveBook
+from app.analytics.pipeline import analyze_closes
+
+FRIDAY = pd.Timestamp("2024-06-07")
+
+
+def analysis(resolution: str = "D") -> dict:
+    index = pd.bdate_range(end=FRIDAY, periods=600)
+    rng = np.random.default_rng(3)
+    values = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (len(index), 4)), axis=0))
+    closes = pd.DataFrame(values, index=index, columns=["A", "B", "C", "D"])
+    result = analyze_closes(closes, 400, "", resolution)
+    result["closes"] = closes
+    return result
+
+
+def stamp(day: str) -> float:
+    return datetime.fromisoformat(f"{day}T15:00:00").timestamp()
+
+
+@pytest.mark.parametrize("resolution", ["D", "W", "M"])
+def test_book_without_quotes_keeps_the_analysis(resolution):
+    base = analysis(resolution)
+    live = LiveBook(base).analysis()
+    for key in ("dates", "close", "norm", "diff", "daily_dates", "daily_close"):
+        np.testing.assert_array_equal(live[key], base[key])
+    pd.testing.assert_frame_equal(live["closes"], base["closes"])
+
+
+def test_weekend_quotes_update_the_last_bar():
+    base = analysis()
+    book = LiveBook(base)
+    book.apply({"A": (123.0, stamp("2024-06-08"))})
+    assert not book.appended
+    assert book.dates[-1] == np.datetime64("2024-06-07")
+    assert len(book.dates) == len(base["dates"])
+    assert book.close[-1, 0] == 123.0
+
+
+def test_next_trading_day_quote_starts_a_bar():
+    base = analysis()
+    book = LiveBook(base)
+    book.apply({"A": (123.0, stamp("2024-06-10"))})
+    assert book.appended
+    assert book.dates[-1] == np.datetime64("2024-06-10")
+    assert len(book.dates) == len(base["dates"]) + 1
+    np.testing.assert_array_equal(book.close[-1, 1:], base["close"][-1, 1:])
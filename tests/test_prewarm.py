@@ -0,0 +1,46 @@
+import json
+from datetime import datetime
+from unittest.mock import patch
+
+from app.data.result_cache import RESULT_CACHE_TTL_SECONDS, ResultCache, analysis_cache
+from app.prewarm import PrewarmScheduler, prewarm_ttl
+
+TIMES = [(7, 30), (16, 30)]
+
+
+def test_pre_open_warm_expires_at_the_open():
+    # Thursday 07:30, two hours before a 09:30 open.
+    assert prewarm_ttl(datetime(2025, 1, 2, 7, 30), TIMES) == 2 * 3600
+
+
+def test_intraday_warm_keeps_the_result_cache_ttl():
+    ttl = prewarm_ttl(datetime(2025, 1, 2, 11, 0), TIMES)
+    assert ttl == min(RESULT_CACHE_TTL_SECONDS, 5.5 * 3600)
+
+
+def test_after_close_warm_lasts_until_the_next_refresh():
+    assert prewarm_ttl(datetime(2025, 1, 2, 16, 30), TIMES) == 15 * 3600
+
+
+def test_weekend_warm_lasts_until_the_next_refresh():
+    assert prewarm_ttl(datetime(2025, 1, 4, 7, 30), TIMES) == 9 * 3600
+
+
+def test_pinned_results_survive_ordinary_traffic():
+    cache = ResultCache(max_entries=2, max_pinned=2)
+    cache.put("warm", "result", pinned=True)
+    for n in range(10):
+        cache.put(n, n)
+    assert cache.get("warm") == "result"
+    assert cache.stats()["entries"] == 2
+
+
+def test_oversized_warm_set_is_logged(tmp_path, caplog):
+    path = tmp_path / "watchlists.json"
+    lists = {f"w{n}": {"tickers": ["A"], "horizons": ["1Y", "5Y"]} for n in range(3)}
+    path.write_text(json.dumps(lists))
+    scheduler = PrewarmScheduler(point_budgets=[800, 1024])
+    with patch.object(analysis_cache, "max_pinned", 11):
+        scheduler.load(str(path))
+    assert scheduler.warm_set_size() == 12
+    assert "RESULT_CACHE_MAX_PINNED" in caplog.text
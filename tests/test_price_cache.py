@@ -0,0 +1,48 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app.data.price_cache import MmapPriceCache, PriceCache
+from app.data.providers import SyntheticProvider
+
+
+class MovingProvider(SyntheticProvider):
+    """Synthetic prices whose every download is ``shift`` higher, like an
+    intraday bar that keeps moving, recording each requested window."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+        self.shift = 0.0
+
+    def download(self, tickers, start, end):
+        self.calls.append((tuple(tickers), start, end))
+        return super().download(tickers, start, end) + self.shift
+
+
+@pytest.fixture(params=["sqlite", "mmap"])
+def cache(request, tmp_path):
+    provider = MovingProvider()
+    if request.param == "sqlite":
+        return PriceCache(path=str(tmp_path / "prices.sqlite3"), provider=provider)
+    return MmapPriceCache(path=str(tmp_path / "store"), provider=provider)
+
+
+def test_unsettled_bars_are_downloaded_again(cache):
+    end = date.today() + timedelta(days=7)
+    first = cache.get_closes(["AAA"], end - timedelta(days=60), end)
+    cache.provider.shift = 1.0
+    second = cache.get_closes(["AAA"], end - timedelta(days=60), end)
+    assert len(cache.provider.calls) == 2
+    assert cache.provider.calls[1][1] == first.index[-1].date()
+    assert second["AAA"].iloc[-1] == first["AAA"].iloc[-1] + 1.0
+    assert second["AAA"].iloc[0] == first["AAA"].iloc[0]
+
+
+def test_settled_windows_are_served_from_the_cache(cache):
+    end = date.today() - timedelta(days=30)
+    first = cache.get_closes(["AAA"], end - timedelta(days=60), end)
+    cache.provider.shift = 1.0
+    second = cache.get_closes(["AAA"], end - timedelta(days=60), end)
+    assert len(cache.provider.calls) == 1
+    assert second.equals(first)
@@ -0,0 +1,122 @@
+import threading
+
+import numpy as np
+import pytest
+
+from app.data.price_store import MmapPriceStore, period_rows
+
+FIRST = 19000
+DAYS = np.arange(FIRST, FIRST + 900)
+WEEKDAYS = DAYS[(DAYS + 3) % 7 < 5]
+
+
+def closes(days: np.ndarray) -> np.ndarray:
+    return 100 + np.sin(days / 17.0) * 10 + (days - FIRST) * 0.01
+
+
+def write(store: MmapPriceStore, days: np.ndarray, values: np.ndarray | None = None):
+    values = closes(days) if values is None else values
+    with store._write_lock():
+        store.append("T", days, values, int(days.min()), int(days.max()))
+
+
+def assert_same_store(left: MmapPriceStore, right: MmapPriceStore):
+    first, values = left.series("T")
+    other_first, other_values = right.series("T")
+    assert first == other_first
+    np.testing.assert_array_equal(values, other_values)
+    for resolution in ("W", "M"):
+        first, rows = left.aggregate("T", resolution)
+        other_first, other_rows = right.aggregate("T", resolution)
+        assert first == other_first
+        np.testing.assert_array_equal(rows, other_rows)
+
+
+@pytest.fixture
+def fresh(tmp_path):
+    store = MmapPriceStore(str(tmp_path / "fresh"))
+    write(store, WEEKDAYS)
+    return store
+
+
+def test_incremental_appends_match_a_fresh_build(tmp_path, fresh):
+    store = MmapPriceStore(str(tmp_path / "incremental"))
+    for chunk in np.array_split(WEEKDAYS, 37):
+        write(store, chunk)
+    assert_same_store(store, fresh)
+
+
+def test_head_backfill_matches_a_fresh_build(tmp_path, fresh):
+    store = MmapPriceStore(str(tmp_path / "backfill"))
+    write(store, WEEKDAYS[400:])
+    write(store, WEEKDAYS[:400])
+    assert_same_store(store, fresh)
+    assert tuple(store.header("T")[2:]) == (WEEKDAYS[0], WEEKDAYS[-1])
+
+
+def test_revised_bar_rewrites_the_day_and_its_aggregates(tmp_path, fresh):
+    store = MmapPriceStore(str(tmp_path / "revised"))
+    write(store, WEEKDAYS)
+    day = WEEKDAYS[500]
+    write(store, np.array([day]), np.array([1.0]))
+    first, values = store.series("T")
+    assert values[day - first] == 1.0
+    expected = closes(WEEKDAYS)
+    expected[500] = 1.0
+    rebuilt = MmapPriceStore(str(tmp_path / "rebuilt"))
+    write(rebuilt, WEEKDAYS, expected)
+    assert_same_store(store, rebuilt)
+
+
+def test_resampled_matches_daily_period_rows(fresh):
+    for resolution in ("W", "M"):
+        for start, stop in [(FIRST, FIRST + 900), (FIRST + 5, FIRST + 400)]:
+            days, matrix = fresh.resampled(["T"], start, stop, resolution)
+            daily_days, (column,) = fresh.columns(["T"], start, stop)
+            traded = ~np.isnan(column)
+            daily_days = daily_days[traded].astype(np.int64)
+            rows = period_rows(daily_days.astype("datetime64[D]"), resolution)
+            np.testing.assert_array_equal(days, daily_days[rows])
+            np.testing.assert_array_equal(matrix[:, 0], column[traded][rows])
+
+
+def test_reads_during_appends_only_see_committed_bars(tmp_path):
+    store = MmapPriceStore(str(tmp_path / "concurrent"))
+    write(store, WEEKDAYS[:10])
+    done = threading.Event()
+    errors = []
+
+    def append():
+        try:
+            for chunk in np.array_split(WEEKDAYS[10:], 60):
+                write(store, chunk)
+        finally:
+            done.set()
+
+    writer = threading.Thread(target=append)
+    writer.start()
+    reader = MmapPriceStore(store.path)
+    while not done.is_set():
+        first, values = reader.series("T")
+        days = np.arange(first, first + len(values))
+        traded = ~np.isnan(values)
+        if not np.array_equal(values[traded], closes(days[traded])):
+            errors.append(len(values))
+        if not traded[-1]:
+            errors.append(("uncommitted tail", len(values)))
+    writer.join()
+    assert not errors
+    assert_same_store(reader, store)
+
+
+def test_evict_drops_least_recently_read_series_with_aggregates(tmp_path):
+    store = MmapPriceStore(str(tmp_path / "evict"))
+    for ticker in ("A", "B"):
+        with store._write_lock():
+            store.append(ticker, WEEKDAYS, closes(WEEKDAYS), FIRST, FIRST + 900)
+        store.aggregate(ticker, "W")
+    store.touch(["A"])
+    store.evict(max_age_days=30, max_rows=len(DAYS) + 10)
+    assert store.series("B") is None
+    assert store.aggregate("B", "W") is None
+    assert store.series("A") is not None
@@ -0,0 +1,20 @@
+import pandas as pd
+
+from app.data.providers import SyntheticProvider
+
+
+def test_synthetic_overlapping_windows_match():
+    provider = SyntheticProvider()
+    wide = provider.download(["AAPL", "MSFT"], "2020-01-01", "2024-01-01")
+    head = provider.download(["AAPL", "MSFT"], "2019-06-01", "2021-01-01")
+    tail = provider.download(["AAPL", "MSFT"], "2023-06-01", "2024-06-01")
+    for part in (head, tail):
+        common = wide.index.intersection(part.index)
+        assert len(common) > 100
+        pd.testing.assert_frame_equal(wide.loc[common], part.loc[common])
+
+
+def test_synthetic_invalid_tickers_return_nothing():
+    provider = SyntheticProvider()
+    frame = provider.download(["INVALID1", "AAPL"], "2023-01-01", "2023-02-01")
+    assert list(frame.columns) == ["AAPL"]
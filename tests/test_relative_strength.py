@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.analytics.relative_strength import relative_strength
+
+
+def baseline(norm: pd.DataFrame) -> dict[str, dict]:
+    """The per-ticker loop the vectorized engine replaced."""
+    results = {}
+    for ticker in norm.columns:
+        peers = [t for t in norm.columns if t != ticker]
+        peer_avg = norm[peers].mean(axis=1)
+        diff = norm[ticker] - peer_avg
+        mx, mn = float(diff.max()), float(diff.min())
+        if pd.isna(mx) or pd.isna(mn) or mx == mn:
+            offset = 0.5
+        elif mx <= 0:
+            offset = 0.0
+        elif mn >= 0:
+            offset = 1.0
+        else:
+            offset = mx / (mx - mn)
+        results[ticker] = {"peer_avg": peer_avg, "diff": diff, "offset": offset}
+    return results
+
+
+def random_walk(rows: int, tickers: int) -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (rows, tickers)), axis=0))
+    return pd.DataFrame(close / close[0], columns=[f"T{j}" for j in range(tickers)])
+
+
+def leader(rows: int, tickers: int) -> pd.DataFrame:
+    """Ticker 0 rises while its peers stay flat: its differential is never
+    negative and every peer's is never positive."""
+    norm = np.ones((rows, tickers))
+    norm[:, 0] += np.linspace(0, 0.5, rows)
+    return pd.DataFrame(norm, columns=[f"T{j}" for j in range(tickers)])
+
+
+def flat(rows: int, tickers: int) -> pd.DataFrame:
+    return pd.DataFrame(
+        np.ones((rows, tickers)), columns=[f"T{j}" for j in range(tickers)]
+    )
+
+
+@pytest.mark.parametrize("tickers", [2, 3, 25])
+@pytest.mark.parametrize("frame", [random_walk, leader, flat])
+def test_matches_the_per_ticker_loop(frame, tickers):
+    norm = frame(300, tickers)
+    strength = relative_strength(norm.to_numpy())
+    expected = baseline(norm)
+    for j, ticker in enumerate(norm.columns):
+        np.testing.assert_allclose(
+            strength["peer_avg"][:, j], expected[ticker]["peer_avg"], rtol=1e-12
+        )
+        np.testing.assert_allclose(
+            strength["diff"][:, j], expected[ticker]["diff"], rtol=1e-12, atol=1e-15
+        )
+        assert strength["offsets"][j] == pytest.approx(expected[ticker]["offset"])
+        assert strength["current_diff"][j] == pytest.approx(
+            expected[ticker]["diff"].iloc[-1], abs=1e-15
+        )
+
+
+def test_edge_case_offsets():
+    assert relative_strength(leader(50, 4).to_numpy())["offsets"].tolist() == [
+        1.0,
+        0.0,
+        0.0,
+        0.0,
+    ]
+    assert relative_strength(flat(50, 4).to_numpy())["offsets"].tolist() == [0.5] * 4
@@ -0,0 +1,41 @@
+import numpy as np
+
+from app.data.result_store import ResultStore, nbytes
+
+
+def result(rows: int) -> dict:
+    close = np.ones((rows, 4))
+    return {"close": close, "daily_close": close, "norm": np.ones((rows, 4))}
+
+
+def test_nbytes_counts_shared_arrays_once():
+    assert nbytes(result(100)) == 2 * 100 * 4 * 8
+
+
+def test_memory_is_bounded_by_bytes_least_recently_used_first():
+    store = ResultStore(path="", max_memory_bytes=3 * nbytes(result(100)))
+    for key in "abc":
+        store.put(key, result(100))
+    store.get("a")
+    store.view("b", ("chart",), lambda: "view")
+    store.put("d", result(100))
+    assert store.get("b") is None
+    assert all(store.get(key) is not None for key in "acd")
+    assert store.stats()["bytes"] == 3 * nbytes(result(100))
+    assert store.view("b", ("chart",), lambda: "rebuilt") == "rebuilt"
+
+
+def test_newest_entry_is_kept_even_over_the_memory_bound():
+    store = ResultStore(path="", max_memory_bytes=1)
+    store.put("a", result(10))
+    store.put("b", result(10))
+    assert store.get("a") is None
+    assert store.get("b") is not None
+
+
+def test_other_processes_resolve_keys_through_the_store_path(tmp_path):
+    ResultStore(path=str(tmp_path)).put("abcd", result(10))
+    other = ResultStore(path=str(tmp_path))
+    np.testing.assert_array_equal(other.get("abcd")["close"], result(10)["close"])
+    assert other.get("ef01") is None
+    assert other.stats()["loads"] == 1